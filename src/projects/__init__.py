@@ -1,3 +1,7 @@
 """Namespace package for prototype projects."""
 
+from ._lazy import attach
+
 __all__ = ["chess", "reactive_store", "linear_algebra"]
+
+__getattr__, __dir__ = attach(__name__, submodules=__all__)
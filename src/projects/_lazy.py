@@ -0,0 +1,45 @@
+"""Helpers for PEP 562 lazy attribute loading in package ``__init__`` modules."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+
+# ``typing`` is comparatively expensive to import and only needed for hints.
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def attach(
+    package: str,
+    *,
+    submodules: Iterable[str] = (),
+    attributes: Dict[str, str] | None = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return ``__getattr__`` and ``__dir__`` functions for ``package``.
+
+    ``submodules`` lists child modules that are imported on first access.
+    ``attributes`` maps exported names to the relative module defining them.
+    Resolved values are cached in the package namespace so the lookup only
+    runs once per name.
+    """
+    lazy_submodules = set(submodules)
+    lazy_attributes = dict(attributes or {})
+
+    def __getattr__(name: str) -> Any:
+        if name in lazy_submodules:
+            value: Any = importlib.import_module(f"{package}.{name}")
+        elif name in lazy_attributes:
+            module = importlib.import_module(lazy_attributes[name], package)
+            value = getattr(module, name)
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        names = set(vars(sys.modules[package]))
+        return sorted(names | lazy_submodules | set(lazy_attributes))
+
+    return __getattr__, __dir__
@@ -1,49 +1,70 @@
-"""Chess project package initialization."""
+"""Chess project package initialization.
 
-from .core.backend.chessboard import Chessboard
-from .core.backend.pieces import (
-    ChessPiece,
-    Knight,
-    Pawn,
-    Bishop,
-    Rook,
-    Queen,
-    King,
-    PieceType,
-    PieceMove,
-    PieceColor,
-)
-from .core.backend.match import Match
-from .core.match_facade import MatchFacade
-from .utils.config import CONFIG, Config, configure
-from .utils.logger import logger
-from .frontend.unicode_board import (
-    draw_board,
-    draw_board_inverted,
-    draw_empty_board,
-    save_board,
-)
+Exports are resolved lazily on first access so importing the package, or
+running its CLI, only loads the modules that are actually used.
+"""
 
-__all__ = [
-    "Chessboard",
-    "ChessPiece",
-    "PieceMove",
-    "PieceColor",
-    "Knight",
-    "Pawn",
-    "Bishop",
-    "Rook",
-    "Queen",
-    "King",
-    "PieceType",
-    "Match",
-    "MatchFacade",
-    "CONFIG",
-    "Config",
-    "configure",
-    "logger",
-    "draw_empty_board",
-    "draw_board",
-    "draw_board_inverted",
-    "save_board",
-]
+from .._lazy import attach
+
+_BACKEND_PIECES = ".core.backend.pieces"
+_UNICODE_BOARD = ".frontend.unicode_board"
+
+_EXPORTS = {
+    "Chessboard": ".core.backend.chessboard",
+    "ChessPiece": _BACKEND_PIECES,
+    "PieceMove": _BACKEND_PIECES,
+    "PieceColor": _BACKEND_PIECES,
+    "Knight": _BACKEND_PIECES,
+    "Pawn": _BACKEND_PIECES,
+    "Bishop": _BACKEND_PIECES,
+    "Rook": _BACKEND_PIECES,
+    "Queen": _BACKEND_PIECES,
+    "King": _BACKEND_PIECES,
+    "PieceType": _BACKEND_PIECES,
+    "Match": ".core.backend.match",
+    "MatchFacade": ".core.match_facade",
+    "Searcher": ".core.backend.search",
+    "BatchBoard": ".core.backend.batch",
+    "solve_mate": ".core.backend.mate_solver",
+    "CONFIG": ".utils.config",
+    "Config": ".utils.config",
+    "configure": ".utils.config",
+    "logger": ".utils.log",
+    "draw_empty_board": _UNICODE_BOARD,
+    "draw_board": _UNICODE_BOARD,
+    "draw_board_inverted": _UNICODE_BOARD,
+    "save_board": _UNICODE_BOARD,
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = attach(__name__, attributes=_EXPORTS)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from .core.backend.chessboard import Chessboard
+    from .core.backend.pieces import (
+        ChessPiece,
+        Knight,
+        Pawn,
+        Bishop,
+        Rook,
+        Queen,
+        King,
+        PieceType,
+        PieceMove,
+        PieceColor,
+    )
+    from .core.backend.match import Match
+    from .core.match_facade import MatchFacade
+    from .core.backend.search import Searcher
+    from .core.backend.batch import BatchBoard
+    from .core.backend.mate_solver import solve_mate
+    from .utils.config import CONFIG, Config, configure
+    from .utils.log import logger
+    from .frontend.unicode_board import (
+        draw_board,
+        draw_board_inverted,
+        draw_empty_board,
+        save_board,
+    )
@@ -1,11 +1,18 @@
 import argparse
 import logging
 
-from . import Chessboard, Config, configure, logger
+from .utils.config import Config, configure
+from .utils.log import logger
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Chess project entry point")
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=["uci"],
+        help="Run as a UCI engine over stdin/stdout",
+    )
     parser.add_argument("--board-width", type=int, default=Config().board_width)
     parser.add_argument("--board-height", type=int, default=Config().board_height)
     parser.add_argument("--log-level", default=logging.getLevelName(Config().log_level))
@@ -20,11 +27,19 @@ def main() -> None:
         )
     )
 
+    if args.mode == "uci":
+        from .frontend.uci import run_uci
+
+        run_uci()
+        return
+
     logger.info(
         "Configured board width %s height %s",
         args.board_width,
         args.board_height,
     )
+    from .core.backend.chessboard import Chessboard
+
     board = Chessboard()
     logger.info(
         "Created board with width %s and height %s",
@@ -0,0 +1,401 @@
+"""Performance benchmarks for the chess core with JSON regression baselines.
+
+Raw timings say as much about the machine as about the code, so baselines
+store each benchmark's time divided by the time of a fixed pure-Python
+calibration loop timed alongside it. Those ratios hold steady on a loaded
+machine and carry over between machines far better than seconds, though a
+different CPU or Python version still shifts them, so each machine should
+record its own baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.backend.chessboard import Chessboard
+from ..core.backend.match import Match
+from ..core.backend.moves import _square_under_attack, generate_moves
+from ..core.backend.pieces import PieceColor, PieceType
+from ..frontend.unicode_board import draw_board
+
+__all__ = [
+    "BENCHMARKS",
+    "DEFAULT_BASELINE",
+    "DEFAULT_THRESHOLD",
+    "UNIT",
+    "compare_results",
+    "load_results",
+    "main",
+    "run_benchmarks",
+    "save_results",
+    "score_benchmarks",
+]
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# Baseline values are benchmark time over calibration loop time.
+UNIT = "calibration_loops"
+
+Benchmark = Callable[[], object]
+
+_OPENING_MOVES: List[Tuple[Tuple[int, int], Tuple[int, int]]] = [
+    ((6, 3), (5, 3)),
+    ((1, 4), (2, 4)),
+    ((5, 3), (4, 3)),
+    ((2, 4), (3, 4)),
+    ((4, 3), (3, 4)),
+    ((0, 6), (2, 5)),
+    ((7, 1), (5, 2)),
+    ((2, 5), (3, 3)),
+    ((7, 6), (5, 5)),
+    ((1, 0), (2, 0)),
+]
+
+
+def _midgame_board() -> Chessboard:
+    """Return a board with a central piece of each type among blockers."""
+    board = Chessboard()
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    board.place_piece(0, 4, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(4, 3, PieceType.QUEEN, PieceColor.WHITE)
+    board.place_piece(4, 4, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(5, 2, PieceType.BISHOP, PieceColor.WHITE)
+    board.place_piece(5, 5, PieceType.KNIGHT, PieceColor.WHITE)
+    board.place_piece(6, 1, PieceType.PAWN, PieceColor.WHITE)
+    board.place_piece(1, 3, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(2, 5, PieceType.KNIGHT, PieceColor.BLACK)
+    board.place_piece(1, 6, PieceType.BISHOP, PieceColor.BLACK)
+    board.place_piece(0, 0, PieceType.ROOK, PieceColor.BLACK)
+    board.place_piece(5, 1, PieceType.PAWN, PieceColor.BLACK)
+    return board
+
+
+_MIDGAME_SQUARES = {
+    PieceType.PAWN: (6, 1),
+    PieceType.KNIGHT: (5, 5),
+    PieceType.BISHOP: (5, 2),
+    PieceType.ROOK: (4, 4),
+    PieceType.QUEEN: (4, 3),
+    PieceType.KING: (7, 4),
+}
+
+
+def _back_rank_mate() -> Match:
+    board = Chessboard()
+    board.place_piece(0, 6, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(1, 5, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 6, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 7, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(0, 0, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    return Match(board, num_players=2)
+
+
+def _queen_mate() -> Match:
+    board = Chessboard()
+    board.place_piece(0, 0, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(2, 2, PieceType.KING, PieceColor.WHITE)
+    board.place_piece(1, 1, PieceType.QUEEN, PieceColor.WHITE)
+    return Match(board, num_players=2)
+
+
+def _escapable_check() -> Match:
+    board = Chessboard()
+    board.reset_board()
+    board.remove_piece(1, 5)
+    board.place_piece(3, 7, PieceType.QUEEN, PieceColor.WHITE)
+    board.remove_piece(7, 3)
+    return Match(board, num_players=2)
+
+
+def _make_generate_moves(piece: PieceType) -> Benchmark:
+    board = _midgame_board()
+    row, col = _MIDGAME_SQUARES[piece]
+    color = PieceColor.WHITE
+
+    def bench() -> object:
+        return generate_moves(piece, board, color, row, col)
+
+    return bench
+
+
+def _make_square_under_attack() -> Benchmark:
+    board = Chessboard()
+    board.reset_board()
+
+    def bench() -> object:
+        return _square_under_attack(board, PieceColor.WHITE, 4, 4)
+
+    return bench
+
+
+def _make_is_checkmate(factory: Callable[[], Match]) -> Benchmark:
+    match = factory()
+
+    def bench() -> object:
+        return match._is_checkmate(PieceColor.BLACK)
+
+    return bench
+
+
+def _make_clone() -> Benchmark:
+    board = Chessboard()
+    board.reset_board()
+    return board.clone
+
+
+def _make_attempt_moves() -> Benchmark:
+    def bench() -> object:
+        board = Chessboard()
+        board.reset_board()
+        match = Match(board, num_players=2)
+        for start, end in _OPENING_MOVES:
+            if not match.attempt_move(start, end):
+                raise RuntimeError(f"Benchmark move {start}->{end} was rejected")
+        return match
+
+    return bench
+
+
+def _make_replay(validate: bool) -> Benchmark:
+    def bench() -> object:
+        board = Chessboard()
+        board.reset_board()
+        match = Match(board, num_players=2)
+        match.replay(_OPENING_MOVES, validate=validate)
+        return match
+
+    return bench
+
+
+def _make_draw_board(**kwargs: bool) -> Benchmark:
+    board = Chessboard()
+    board.reset_board()
+
+    def bench() -> object:
+        return draw_board(board, **kwargs)
+
+    return bench
+
+
+BENCHMARKS: Dict[str, Callable[[], Benchmark]] = {
+    **{
+        f"generate_moves.{piece.value}": (lambda p=piece: _make_generate_moves(p))
+        for piece in PieceType
+    },
+    "square_under_attack": _make_square_under_attack,
+    "is_checkmate.back_rank": lambda: _make_is_checkmate(_back_rank_mate),
+    "is_checkmate.queen": lambda: _make_is_checkmate(_queen_mate),
+    "is_checkmate.escapable": lambda: _make_is_checkmate(_escapable_check),
+    "clone": _make_clone,
+    "attempt_move.sequence": _make_attempt_moves,
+    "replay.validate": lambda: _make_replay(True),
+    "replay.trusted": lambda: _make_replay(False),
+    "draw_board": _make_draw_board,
+    "draw_board.coords_inverted": lambda: _make_draw_board(
+        with_coords=True, invert=True
+    ),
+}
+
+
+_CALIBRATION_GRID = [[(row * 8 + col) % 7 for col in range(8)] for row in range(8)]
+
+
+def _calibration_loop() -> int:
+    """Index, branch and call the way move generation does, on plain lists."""
+    total = 0
+    for row in range(8):
+        for col in range(8):
+            for d_row, d_col in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                r, c = row + d_row, col + d_col
+                if 0 <= r < 8 and 0 <= c < 8 and _CALIBRATION_GRID[r][c]:
+                    total += len((r, c))
+    return total
+
+
+def _timer(bench: Benchmark, min_time: float) -> Tuple[timeit.Timer, int]:
+    """Return a timer for ``bench`` and a call count lasting ``min_time``."""
+    timer = timeit.Timer(bench)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return timer, number
+
+
+def _measure(bench: Benchmark, repeat: int, min_time: float) -> float:
+    """Return the best observed seconds per call of ``bench``."""
+    timer, number = _timer(bench, min_time)
+    return min(timer.timeit(number) for _ in range(repeat)) / number
+
+
+def _score(bench: Benchmark, repeat: int, min_time: float) -> Tuple[float, float]:
+    """Return the best seconds per call of ``bench`` and its calibrated score.
+
+    Each sample times the calibration loop right before ``bench`` so both see
+    the same machine load; the score is the median of those paired ratios.
+    """
+    timer, number = _timer(bench, min_time)
+    calibration, calibration_number = _timer(_calibration_loop, min_time)
+    best = float("inf")
+    ratios = []
+    for _ in range(repeat):
+        loop = calibration.timeit(calibration_number) / calibration_number
+        seconds = timer.timeit(number) / number
+        best = min(best, seconds)
+        ratios.append(seconds / loop)
+    return best, statistics.median(ratios)
+
+
+def _select(names: Optional[Iterable[str]], repeat: int) -> List[str]:
+    selected = list(BENCHMARKS) if names is None else list(names)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1")
+    return selected
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    *,
+    repeat: int = 5,
+    min_time: float = 0.05,
+) -> Dict[str, float]:
+    """Run the selected benchmarks and return seconds per call by name."""
+    return {
+        name: _measure(BENCHMARKS[name](), repeat, min_time)
+        for name in _select(names, repeat)
+    }
+
+
+def score_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    *,
+    repeat: int = 7,
+    min_time: float = 0.02,
+) -> Dict[str, Tuple[float, float]]:
+    """Return ``(seconds per call, calibration loops per call)`` by name."""
+    return {
+        name: _score(BENCHMARKS[name](), repeat, min_time)
+        for name in _select(names, repeat)
+    }
+
+
+def compare_results(
+    baseline: Dict[str, float],
+    current: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Dict[str, float]:
+    """Return the slowdown ratio of every metric regressing past ``threshold``.
+
+    Metrics missing from ``baseline`` are ignored so new benchmarks can be
+    added without invalidating an existing baseline.
+    """
+    regressions: Dict[str, float] = {}
+    for name, seconds in current.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        ratio = seconds / reference
+        if ratio > 1.0 + threshold:
+            regressions[name] = ratio
+    return regressions
+
+
+def load_results(path: str | Path) -> Dict[str, float]:
+    """Read calibrated results previously written by :func:`save_results`."""
+    data = json.loads(Path(path).read_text())
+    unit = data.get("unit", "seconds")
+    if unit != UNIT:
+        raise ValueError(
+            f"{path} holds {unit} rather than {UNIT}; regenerate it with --update"
+        )
+    return {name: float(value) for name, value in data["results"].items()}
+
+
+def save_results(results: Dict[str, float], path: str | Path) -> None:
+    """Write calibrated ``results`` to ``path`` as a JSON baseline."""
+    payload = {"unit": UNIT, "results": results}
+    Path(path).write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Chess core benchmarks")
+    parser.add_argument("names", nargs="*", help="Subset of benchmarks to run")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=2,
+        help="Times to re-measure a suspected regression before reporting it",
+    )
+    parser.add_argument(
+        "--update", action="store_true", help="Overwrite the baseline with this run"
+    )
+    parser.add_argument("--list", action="store_true", help="List benchmark names")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    measured = score_benchmarks(args.names or None, repeat=args.repeat)
+    baseline = {} if args.update else _load_if_exists(args.baseline)
+    regressions = compare_results(
+        baseline, {name: score for name, (_, score) in measured.items()}, args.threshold
+    )
+    for _ in range(args.confirm):
+        if not regressions:
+            break
+        # One slow sample should not fail the run: keep the better of the two
+        # measurements and report only metrics that stay slow.
+        for name, (seconds, score) in score_benchmarks(
+            regressions, repeat=args.repeat
+        ).items():
+            if score < measured[name][1]:
+                measured[name] = (seconds, score)
+        suspects = {name: measured[name][1] for name in regressions}
+        regressions = compare_results(baseline, suspects, args.threshold)
+    results = {name: seconds for name, (seconds, _) in measured.items()}
+    scores = {name: score for name, (_, score) in measured.items()}
+
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        line = f"{name:<{width}}  {seconds * 1e6:12.2f} us"
+        reference = baseline.get(name)
+        if reference:
+            line += f"  ({scores[name] / reference:5.2f}x baseline)"
+        if name in regressions:
+            line += "  REGRESSION"
+        print(line)
+
+    if args.update or not baseline:
+        try:
+            previous = _load_if_exists(args.baseline)
+        except ValueError:
+            # A baseline in another unit is replaced as a whole.
+            previous = {}
+        merged = {**previous, **scores}
+        save_results(merged, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) regressed by more than "
+            f"{args.threshold:.0%}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def _load_if_exists(path: Path) -> Dict[str, float]:
+    return load_results(path) if path.exists() else {}
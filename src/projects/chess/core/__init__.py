@@ -1,19 +1,27 @@
 """Core backend exports."""
 
-from .backend.chessboard import Chessboard, Piece
-from .backend.match import Match
-from .match_facade import MatchFacade
-from .backend.pieces import ChessPiece, Knight, PieceMove, PieceColor
-from .utils import index_to_letters
+from ..._lazy import attach
 
-__all__ = [
-    "Chessboard",
-    "Piece",
-    "ChessPiece",
-    "PieceMove",
-    "PieceColor",
-    "Knight",
-    "Match",
-    "MatchFacade",
-    "index_to_letters",
-]
+_EXPORTS = {
+    "Chessboard": ".backend.chessboard",
+    "Piece": ".backend.chessboard",
+    "ChessPiece": ".backend.pieces",
+    "PieceMove": ".backend.pieces",
+    "PieceColor": ".backend.pieces",
+    "Knight": ".backend.pieces",
+    "Match": ".backend.match",
+    "MatchFacade": ".match_facade",
+    "index_to_letters": ".utils",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = attach(__name__, attributes=_EXPORTS)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from .backend.chessboard import Chessboard, Piece
+    from .backend.match import Match
+    from .match_facade import MatchFacade
+    from .backend.pieces import ChessPiece, Knight, PieceMove, PieceColor
+    from .utils import index_to_letters
@@ -0,0 +1,117 @@
+"""Per-color attack maps that are updated incrementally after each move."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .chessboard import Chessboard
+from .moves import attacked_squares
+from .pieces import PieceColor, PieceType
+
+Square = Tuple[int, int]
+
+_SLIDERS = {PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN}
+
+
+class AttackMaps:
+    """Count, for every color, how many of its pieces attack each square.
+
+    After the pieces on some squares change, :meth:`update` recomputes only
+    the pieces standing on those squares and the sliders whose lines pass
+    through them, so check tests stay cheap however many players share the
+    board. Attacks follow ``_square_under_attack``, so :meth:`in_check` agrees
+    with ``Match``'s original board scan.
+    """
+
+    def __init__(self, board: Chessboard) -> None:
+        self.board = board
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompute every attack from scratch."""
+        h = self.board.BOARD_HEIGHT
+        w = self.board.BOARD_WIDTH
+        self._counts: Dict[PieceColor, List[List[int]]] = {
+            color: [[0] * w for _ in range(h)] for color in PieceColor
+        }
+        self._origins: List[List[Set[Square]]] = [
+            [set() for _ in range(w)] for _ in range(h)
+        ]
+        self._pieces: Dict[Square, Tuple[PieceType, PieceColor]] = {}
+        self._targets: Dict[Square, List[Square]] = {}
+        self._kings: Dict[PieceColor, Square] = {}
+        for r in range(h):
+            for c in range(w):
+                self._insert((r, c))
+        self._version = self.board.version
+
+    @property
+    def is_stale(self) -> bool:
+        """Return ``True`` if the board changed without an :meth:`update`."""
+        return self._version != self.board.version
+
+    def update(self, squares: Iterable[Square]) -> None:
+        """Refresh the maps after the pieces on ``squares`` changed."""
+        changed = set(squares)
+        affected = set(changed)
+        for r, c in changed:
+            for origin in self._origins[r][c]:
+                if self._pieces[origin][0] in _SLIDERS:
+                    affected.add(origin)
+        for origin in affected:
+            self._discard(origin)
+        for origin in affected:
+            self._insert(origin)
+        self._version = self.board.version
+
+    def attackers(self, color: PieceColor, row: int, col: int) -> int:
+        """Return how many ``color`` pieces attack ``row`` and ``col``."""
+        return self._counts[color][row][col]
+
+    def is_attacked(self, color: PieceColor, row: int, col: int) -> bool:
+        """Return ``True`` if any piece not of ``color`` attacks the square."""
+        return any(
+            counts[row][col] for other, counts in self._counts.items() if other != color
+        )
+
+    def king(self, color: PieceColor) -> Optional[Square]:
+        """Return the square of ``color``'s king, if it is on the board."""
+        return self._kings.get(color)
+
+    def in_check(self, color: PieceColor) -> bool:
+        """Return ``True`` if ``color``'s king is attacked."""
+        king = self._kings.get(color)
+        return king is not None and self.is_attacked(color, *king)
+
+    def pieces(self, color: PieceColor) -> Iterator[Tuple[Square, PieceType]]:
+        """Yield the square and type of every ``color`` piece."""
+        for square, (piece_type, piece_color) in list(self._pieces.items()):
+            if piece_color == color:
+                yield square, piece_type
+
+    def _discard(self, origin: Square) -> None:
+        piece = self._pieces.pop(origin, None)
+        if piece is None:
+            return
+        piece_type, color = piece
+        counts = self._counts[color]
+        for r, c in self._targets.pop(origin):
+            counts[r][c] -= 1
+            self._origins[r][c].discard(origin)
+        if piece_type == PieceType.KING and self._kings.get(color) == origin:
+            del self._kings[color]
+
+    def _insert(self, origin: Square) -> None:
+        piece = self.board.get_piece(*origin)
+        if piece is None:
+            return
+        piece_type, color = piece
+        targets = attacked_squares(self.board, piece_type, color, *origin)
+        self._pieces[origin] = piece
+        self._targets[origin] = targets
+        counts = self._counts[color]
+        for r, c in targets:
+            counts[r][c] += 1
+            self._origins[r][c].add(origin)
+        if piece_type == PieceType.KING:
+            self._kings.setdefault(color, origin)
@@ -0,0 +1,377 @@
+"""Vectorized move generation over many boards stored in one NumPy array."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .chessboard import Chessboard, Piece
+from .moves import PAWN_DIRECTIONS, pawn_capture_deltas
+from .pieces import PieceColor, PieceType
+
+EMPTY = 0
+
+# Piece codes are ``color_index * COLOR_STRIDE + type_index`` with type indices
+# starting at one so that ``EMPTY`` stays zero.
+COLOR_STRIDE = 8
+PIECE_TYPES: Tuple[PieceType, ...] = tuple(PieceType)
+PIECE_COLORS: Tuple[PieceColor, ...] = tuple(PieceColor)
+
+_TYPE_INDEX = {piece: index + 1 for index, piece in enumerate(PIECE_TYPES)}
+_COLOR_INDEX = {color: index for index, color in enumerate(PIECE_COLORS)}
+
+# Code written to the padding column that stands in for off-board squares.
+_OFF_BOARD = -1
+
+_KNIGHT_OFFSETS = (
+    (2, 1),
+    (1, 2),
+    (-1, 2),
+    (-2, 1),
+    (-2, -1),
+    (-1, -2),
+    (1, -2),
+    (2, -1),
+)
+_KING_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+_ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+ColorSpec = Union[PieceColor, ArrayLike]
+
+
+def piece_code(piece: PieceType, color: PieceColor) -> int:
+    """Return the integer code used for ``piece`` of ``color``."""
+    return _COLOR_INDEX[color] * COLOR_STRIDE + _TYPE_INDEX[piece]
+
+
+@dataclass(frozen=True)
+class BatchMoves:
+    """Flat arrays describing moves across a batch of boards.
+
+    ``start`` and ``end`` are flattened square indices (``row * width + col``).
+    """
+
+    board: NDArray[np.intp]
+    start: NDArray[np.intp]
+    end: NDArray[np.intp]
+
+    def __len__(self) -> int:
+        return int(self.board.shape[0])
+
+
+@dataclass(frozen=True)
+class _Tables:
+    """Precomputed offset and ray targets for one board size."""
+
+    knight: NDArray[np.intp]
+    king: NDArray[np.intp]
+    rook_rays: NDArray[np.intp]
+    bishop_rays: NDArray[np.intp]
+    pawn_forward: Dict[int, NDArray[np.intp]]
+    pawn_captures: Dict[int, NDArray[np.intp]]
+
+
+@lru_cache(maxsize=None)
+def _tables(height: int, width: int) -> _Tables:
+    """Build target tables where ``height * width`` marks an off-board square."""
+    size = height * width
+    rows, cols = np.divmod(np.arange(size), width)
+
+    def offsets(deltas: Sequence[Tuple[int, int]]) -> NDArray[np.intp]:
+        d_row = np.array([d[0] for d in deltas])
+        d_col = np.array([d[1] for d in deltas])
+        new_rows = rows[:, None] + d_row[None, :]
+        new_cols = cols[:, None] + d_col[None, :]
+        valid = (0 <= new_rows) & (new_rows < height)
+        valid &= (0 <= new_cols) & (new_cols < width)
+        return np.where(valid, new_rows * width + new_cols, size).astype(np.intp)
+
+    def rays(directions: Sequence[Tuple[int, int]]) -> NDArray[np.intp]:
+        steps = np.arange(1, max(height, width))
+        result = []
+        for d_row, d_col in directions:
+            new_rows = rows[:, None] + d_row * steps[None, :]
+            new_cols = cols[:, None] + d_col * steps[None, :]
+            valid = (0 <= new_rows) & (new_rows < height)
+            valid &= (0 <= new_cols) & (new_cols < width)
+            result.append(np.where(valid, new_rows * width + new_cols, size))
+        # Shape (squares, directions, steps).
+        return np.stack(result, axis=1).astype(np.intp)
+
+    pawn_forward = {}
+    pawn_captures = {}
+    for color in PIECE_COLORS:
+        code = _COLOR_INDEX[color]
+        pawn_forward[code] = offsets((PAWN_DIRECTIONS[color],))
+        pawn_captures[code] = offsets(pawn_capture_deltas(color))
+
+    return _Tables(
+        knight=offsets(_KNIGHT_OFFSETS),
+        king=offsets(_KING_OFFSETS),
+        rook_rays=rays(_ROOK_DIRECTIONS),
+        bishop_rays=rays(_BISHOP_DIRECTIONS),
+        pawn_forward=pawn_forward,
+        pawn_captures=pawn_captures,
+    )
+
+
+class BatchBoard:
+    """Container holding ``N`` boards as an ``(N, H, W)`` array of piece codes.
+
+    Move generation follows the rules in :mod:`.moves` (single-step pawns and
+    no king captures) but is pseudo-legal: moves that leave the mover's own
+    king attacked are not filtered out.
+    """
+
+    def __init__(self, squares: ArrayLike) -> None:
+        array = np.asarray(squares, dtype=np.int8)
+        if array.ndim != 3:
+            raise ValueError("squares must have shape (N, H, W)")
+        self.squares: NDArray[np.int8] = array
+
+    # ------------------------------------------------------------------
+    # Construction and conversion
+    @classmethod
+    def empty(cls, count: int, height: int = 8, width: int = 8) -> "BatchBoard":
+        """Return ``count`` empty boards of the given size."""
+        return cls(np.zeros((count, height, width), dtype=np.int8))
+
+    @classmethod
+    def from_boards(cls, boards: Iterable[Chessboard]) -> "BatchBoard":
+        """Encode ``boards``, which must all share the same dimensions."""
+        encoded: List[List[List[int]]] = []
+        shape = None
+        for board in boards:
+            if shape is None:
+                shape = (board.BOARD_HEIGHT, board.BOARD_WIDTH)
+            elif shape != (board.BOARD_HEIGHT, board.BOARD_WIDTH):
+                raise ValueError("All boards must share the same dimensions")
+            encoded.append(
+                [
+                    [
+                        EMPTY if piece is None else piece_code(piece.piece, piece.color)
+                        for piece in row
+                    ]
+                    for row in board._board
+                ]
+            )
+        if shape is None:
+            raise ValueError("At least one board is required")
+        return cls(np.array(encoded, dtype=np.int8))
+
+    def to_board(self, index: int) -> Chessboard:
+        """Decode the board at ``index`` into a ``Chessboard``."""
+        board = Chessboard()
+        board.BOARD_HEIGHT = self.height
+        board.BOARD_WIDTH = self.width
+        board._board = [[None] * self.width for _ in range(self.height)]
+        rows, cols = np.nonzero(self.squares[index])
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            color_index, type_index = divmod(
+                int(self.squares[index, row, col]), COLOR_STRIDE
+            )
+            board._board[row][col] = Piece(
+                PIECE_TYPES[type_index - 1], PIECE_COLORS[color_index]
+            )
+        return board
+
+    def to_boards(self) -> List[Chessboard]:
+        """Decode every board in the batch."""
+        return [self.to_board(index) for index in range(len(self))]
+
+    # ------------------------------------------------------------------
+    # Properties
+    def __len__(self) -> int:
+        return int(self.squares.shape[0])
+
+    @property
+    def height(self) -> int:
+        return int(self.squares.shape[1])
+
+    @property
+    def width(self) -> int:
+        return int(self.squares.shape[2])
+
+    # ------------------------------------------------------------------
+    # Vectorized move and attack generation
+    def generate_moves(self, color: ColorSpec) -> BatchMoves:
+        """Return pseudo-legal moves for ``color`` on every board.
+
+        ``color`` is either one ``PieceColor`` shared by all boards or an
+        array of per-board color indices into ``PieceColor``.
+        """
+        flat, colors = self._prepare(color)
+        tables = _tables(self.height, self.width)
+        owner = self._owner(flat)
+        piece_type = np.where(flat > 0, flat % COLOR_STRIDE, 0)
+        enemy = (flat > 0) & (owner != colors[:, None])
+        capturable = enemy & (piece_type != _TYPE_INDEX[PieceType.KING])
+        empty = flat == EMPTY
+        mine = (flat > 0) & (owner == colors[:, None])
+
+        parts: List[Tuple[NDArray[np.intp], ...]] = []
+        for type_, table in (
+            (PieceType.KNIGHT, tables.knight),
+            (PieceType.KING, tables.king),
+        ):
+            boards, starts = np.nonzero(mine & (piece_type == _TYPE_INDEX[type_]))
+            targets = table[starts]
+            allowed = (
+                empty[boards[:, None], targets] | capturable[boards[:, None], targets]
+            )
+            parts.append(_expand(boards, starts, targets, allowed))
+
+        for type_, ray_sets in (
+            (PieceType.ROOK, (tables.rook_rays,)),
+            (PieceType.BISHOP, (tables.bishop_rays,)),
+            (PieceType.QUEEN, (tables.rook_rays, tables.bishop_rays)),
+        ):
+            boards, starts = np.nonzero(mine & (piece_type == _TYPE_INDEX[type_]))
+            for rays in ray_sets:
+                parts.append(
+                    _slide(
+                        boards, starts, rays[starts], empty, capturable, attacks=False
+                    )
+                )
+
+        pawn = mine & (piece_type == _TYPE_INDEX[PieceType.PAWN])
+        for code in np.unique(colors).tolist():
+            boards, starts = np.nonzero(pawn & (colors[:, None] == code))
+            forward = tables.pawn_forward[code][starts]
+            parts.append(
+                _expand(boards, starts, forward, empty[boards[:, None], forward])
+            )
+            diagonal = tables.pawn_captures[code][starts]
+            parts.append(
+                _expand(boards, starts, diagonal, capturable[boards[:, None], diagonal])
+            )
+        return _collect(parts)
+
+    def attack_maps(self, color: ColorSpec) -> NDArray[np.bool_]:
+        """Return an ``(N, H, W)`` mask of squares attacked by ``color``.
+
+        Sliding pieces attack up to and including their first blocker and
+        pawns attack both forward diagonals whether or not they are occupied.
+        """
+        flat, colors = self._prepare(color)
+        tables = _tables(self.height, self.width)
+        owner = self._owner(flat)
+        piece_type = np.where(flat > 0, flat % COLOR_STRIDE, 0)
+        empty = flat == EMPTY
+        mine = (flat > 0) & (owner == colors[:, None])
+        everything = np.ones_like(empty)
+        on_board = self.height * self.width
+
+        parts: List[Tuple[NDArray[np.intp], ...]] = []
+        for type_, table in (
+            (PieceType.KNIGHT, tables.knight),
+            (PieceType.KING, tables.king),
+        ):
+            boards, starts = np.nonzero(mine & (piece_type == _TYPE_INDEX[type_]))
+            targets = table[starts]
+            parts.append(_expand(boards, starts, targets, targets < on_board))
+
+        for type_, ray_sets in (
+            (PieceType.ROOK, (tables.rook_rays,)),
+            (PieceType.BISHOP, (tables.bishop_rays,)),
+            (PieceType.QUEEN, (tables.rook_rays, tables.bishop_rays)),
+        ):
+            boards, starts = np.nonzero(mine & (piece_type == _TYPE_INDEX[type_]))
+            for rays in ray_sets:
+                parts.append(
+                    _slide(
+                        boards, starts, rays[starts], empty, everything, attacks=True
+                    )
+                )
+
+        pawn = mine & (piece_type == _TYPE_INDEX[PieceType.PAWN])
+        for code in np.unique(colors).tolist():
+            boards, starts = np.nonzero(pawn & (colors[:, None] == code))
+            diagonal = tables.pawn_captures[code][starts]
+            parts.append(_expand(boards, starts, diagonal, diagonal < on_board))
+
+        moves = _collect(parts)
+        attacked = np.zeros(flat.shape[0] * self.height * self.width, dtype=bool)
+        attacked[moves.board * self.height * self.width + moves.end] = True
+        return attacked.reshape(self.squares.shape)
+
+    def apply_moves(self, moves: BatchMoves) -> None:
+        """Play ``moves`` in place; each board should appear at most once."""
+        flat = self.squares.reshape(len(self), -1)
+        flat[moves.board, moves.end] = flat[moves.board, moves.start]
+        flat[moves.board, moves.start] = EMPTY
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    def _prepare(self, color: ColorSpec) -> Tuple[NDArray[np.int16], NDArray[np.intp]]:
+        """Return boards padded with an off-board column and per-board colors."""
+        count = len(self)
+        if isinstance(color, PieceColor):
+            colors = np.full(count, _COLOR_INDEX[color], dtype=np.intp)
+        else:
+            colors = np.asarray(color, dtype=np.intp).reshape(-1)
+            if colors.shape != (count,):
+                raise ValueError("color must be a PieceColor or one index per board")
+        flat = np.full((count, self.height * self.width + 1), _OFF_BOARD, np.int16)
+        flat[:, :-1] = self.squares.reshape(count, -1)
+        return flat, colors
+
+    @staticmethod
+    def _owner(flat: NDArray[np.int16]) -> NDArray[np.int16]:
+        return np.where(flat > 0, flat // COLOR_STRIDE, -1)
+
+
+def _expand(
+    boards: NDArray[np.intp],
+    starts: NDArray[np.intp],
+    targets: NDArray[np.intp],
+    allowed: NDArray[np.bool_],
+) -> Tuple[NDArray[np.intp], ...]:
+    """Flatten ``(piece, target)`` candidates into move arrays."""
+    piece_index, target_index = np.nonzero(allowed)
+    return (
+        boards[piece_index],
+        starts[piece_index],
+        targets[piece_index, target_index],
+    )
+
+
+def _slide(
+    boards: NDArray[np.intp],
+    starts: NDArray[np.intp],
+    rays: NDArray[np.intp],
+    empty: NDArray[np.bool_],
+    capturable: NDArray[np.bool_],
+    *,
+    attacks: bool,
+) -> Tuple[NDArray[np.intp], ...]:
+    """Return slider moves along ``rays`` of shape ``(pieces, dirs, steps)``."""
+    board_index = boards[:, None, None]
+    open_square = empty[board_index, rays]
+    # A square is reachable while every earlier square on the ray is empty.
+    blocked_before = np.cumsum(~open_square, axis=-1) - ~open_square > 0
+    reachable = ~blocked_before & (rays < empty.shape[1] - 1)
+    allowed = reachable & (open_square | capturable[board_index, rays])
+    piece_index, direction, step = np.nonzero(allowed)
+    return (
+        boards[piece_index],
+        starts[piece_index],
+        rays[piece_index, direction, step],
+    )
+
+
+def _collect(parts: List[Tuple[NDArray[np.intp], ...]]) -> BatchMoves:
+    """Concatenate move parts and sort them by board, start and end."""
+    if parts:
+        boards = np.concatenate([part[0] for part in parts]).astype(np.intp)
+        starts = np.concatenate([part[1] for part in parts]).astype(np.intp)
+        ends = np.concatenate([part[2] for part in parts]).astype(np.intp)
+    else:
+        boards = starts = ends = np.zeros(0, dtype=np.intp)
+    order = np.lexsort((ends, starts, boards))
+    return BatchMoves(board=boards[order], start=starts[order], end=ends[order])
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, Tuple
 
 from ...utils.config import CONFIG
-from ...utils.logger import logger
+from ...utils.log import logger
 from .pieces import PieceColor, PieceType
 
 
@@ -29,6 +29,9 @@ class Chessboard:
         self._board: list[list[Optional[Piece]]] = [
             [None for _ in range(self.BOARD_WIDTH)] for _ in range(self.BOARD_HEIGHT)
         ]
+        # Incremented on every change so cached analyses can tell when the
+        # board was edited behind their back.
+        self.version = 0
 
     def clone(self) -> "Chessboard":
         """Return a deep copy of this ``Chessboard``."""
@@ -51,11 +54,13 @@ class Chessboard:
         """Place a piece at the given position."""
         self._validate_position(row, col)
         self._board[row][col] = Piece(piece, color)
+        self.version += 1
 
     def remove_piece(self, row: int, col: int) -> None:
         """Remove any piece from the given position."""
         self._validate_position(row, col)
         self._board[row][col] = None
+        self.version += 1
 
     def get_piece(self, row: int, col: int) -> Optional[Tuple[PieceType, PieceColor]]:
         """Return the piece and color at the given position, or ``None`` if empty."""
@@ -70,17 +75,24 @@ class Chessboard:
         self._validate_position(row, col)
         return self._board[row][col] is None
 
-    def reset_board(self) -> None:
-        """Clear the board and place all standard pieces."""
+    def reset_board(self, num_players: int = 2) -> None:
+        """Clear the board and place all standard pieces.
+
+        Two players use the standard layout. With three or four players the
+        WHITE and BLACK armies are centred on the bottom and top edges, and
+        RED and BLUE are placed on the left and right edges, which needs a
+        board of at least 12x12.
+        """
+        if not 2 <= num_players <= 4:
+            raise ValueError("num_players must be between 2 and 4")
+        if num_players > 2 and min(self.BOARD_WIDTH, self.BOARD_HEIGHT) < 12:
+            raise ValueError(
+                f"A {num_players}-player setup needs at least a 12x12 board"
+            )
         self._board = [
             [None for _ in range(self.BOARD_WIDTH)] for _ in range(self.BOARD_HEIGHT)
         ]
-
-        for col in range(self.BOARD_WIDTH):
-            self.place_piece(1, col, PieceType.PAWN, PieceColor.BLACK)
-            self.place_piece(
-                self.BOARD_HEIGHT - 2, col, PieceType.PAWN, PieceColor.WHITE
-            )
+        self.version += 1
 
         pieces = [
             PieceType.ROOK,
@@ -92,8 +104,36 @@ class Chessboard:
             PieceType.KNIGHT,
             PieceType.ROOK,
         ]
-        for col, piece in enumerate(pieces):
-            if col >= self.BOARD_WIDTH:
-                break
+        if num_players == 2:
+            for col in range(self.BOARD_WIDTH):
+                self.place_piece(1, col, PieceType.PAWN, PieceColor.BLACK)
+                self.place_piece(
+                    self.BOARD_HEIGHT - 2, col, PieceType.PAWN, PieceColor.WHITE
+                )
+            for col, piece in enumerate(pieces):
+                if col >= self.BOARD_WIDTH:
+                    break
+                self.place_piece(0, col, piece, PieceColor.BLACK)
+                self.place_piece(self.BOARD_HEIGHT - 1, col, piece, PieceColor.WHITE)
+            return
+
+        first_col = (self.BOARD_WIDTH - len(pieces)) // 2
+        for offset, piece in enumerate(pieces):
+            col = first_col + offset
             self.place_piece(0, col, piece, PieceColor.BLACK)
+            self.place_piece(1, col, PieceType.PAWN, PieceColor.BLACK)
             self.place_piece(self.BOARD_HEIGHT - 1, col, piece, PieceColor.WHITE)
+            self.place_piece(
+                self.BOARD_HEIGHT - 2, col, PieceType.PAWN, PieceColor.WHITE
+            )
+
+        first_row = (self.BOARD_HEIGHT - len(pieces)) // 2
+        edges = [
+            (PieceColor.RED, 0, 1),
+            (PieceColor.BLUE, self.BOARD_WIDTH - 1, self.BOARD_WIDTH - 2),
+        ]
+        for color, back, front in edges[: num_players - 2]:
+            for offset, piece in enumerate(pieces):
+                row = first_row + offset
+                self.place_piece(row, back, piece, color)
+                self.place_piece(row, front, PieceType.PAWN, color)
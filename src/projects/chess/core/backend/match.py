@@ -1,24 +1,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
+from .attacks import AttackMaps
 from .chessboard import Chessboard, Piece
-from .pieces import (
-    Bishop,
-    Knight,
-    Pawn,
-    Queen,
-    Rook,
-    King,
-    PieceType,
-    PieceColor,
-)
+from .pieces import PieceColor, PieceMove, PieceType
+
+_SavedSquares = List[Tuple[Tuple[int, int], Optional[Tuple[PieceType, PieceColor]]]]
 
 
 @dataclass
 class Match:
-    """Track the state of a chess match."""
+    """Track the state of a chess match.
+
+    Players who are checkmated in games with more than two players are added
+    to ``eliminated`` and skipped in the turn order. The match completes once
+    a single player remains, with ``current_turn`` left on the player who
+    delivered the final mate.
+    """
 
     board: Chessboard
     num_players: int
@@ -26,6 +26,10 @@ class Match:
     move_number: int = 1
     captured: List[List[Piece]] = field(default_factory=list)
     is_completed: bool = False
+    eliminated: Set[int] = field(default_factory=set)
+    _attacks: Optional[AttackMaps] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     _color_order = [
         PieceColor.WHITE,
@@ -41,63 +45,71 @@ class Match:
         """Return the color associated with ``index``."""
         return self._color_order[index % len(self._color_order)]
 
+    def _attack_maps(self) -> AttackMaps:
+        """Return attack maps for ``board``, rebuilding them after outside edits."""
+        if self._attacks is None or self._attacks.board is not self.board:
+            self._attacks = AttackMaps(self.board)
+        elif self._attacks.is_stale:
+            self._attacks.rebuild()
+        return self._attacks
+
     def _find_king(self, color: PieceColor) -> Optional[Tuple[int, int]]:
-        for r in range(self.board.BOARD_HEIGHT):
-            for c in range(self.board.BOARD_WIDTH):
-                if self.board.get_piece(r, c) == (PieceType.KING, color):
-                    return r, c
-        return None
+        return self._attack_maps().king(color)
 
     def _is_in_check(self, color: PieceColor) -> bool:
-        from .moves import _square_under_attack
-
-        pos = self._find_king(color)
-        if pos is None:
-            return False
-        return _square_under_attack(self.board, color, pos[0], pos[1])
+        return self._attack_maps().in_check(color)
 
     def _has_escape_moves(self, color: PieceColor) -> bool:
         from .moves import generate_moves
 
-        if self._find_king(color) is None:
+        attacks = self._attack_maps()
+        if attacks.king(color) is None:
             return False
 
-        for r in range(self.board.BOARD_HEIGHT):
-            for c in range(self.board.BOARD_WIDTH):
-                piece = self.board.get_piece(r, c)
-                if piece is None:
-                    continue
-                piece_type, p_color = piece
-                if p_color != color:
-                    continue
-                moves = generate_moves(piece_type, self.board, p_color, r, c)
-                for m in moves:
-                    board_copy = self.board.clone()
-                    for cap in m.captures:
-                        board_copy.remove_piece(*cap)
-                    board_copy.remove_piece(r, c)
-                    board_copy.place_piece(m.end[0], m.end[1], piece_type, p_color)
-                    new_pos = (
-                        m.end
-                        if piece_type == PieceType.KING
-                        else self._find_king(color)
-                    )
-                    if new_pos is None:
-                        continue
-                    from .moves import _square_under_attack
-
-                    if not _square_under_attack(
-                        board_copy, color, new_pos[0], new_pos[1]
-                    ):
-                        return True
+        for (r, c), piece_type in attacks.pieces(color):
+            for m in generate_moves(piece_type, self.board, color, r, c):
+                saved = self._apply(m, piece_type, color)
+                attacks.update(square for square, _ in saved)
+                safe = not attacks.in_check(color)
+                self._restore(saved)
+                attacks.update(square for square, _ in saved)
+                if safe:
+                    return True
         return False
 
     def _is_checkmate(self, color: PieceColor) -> bool:
         return self._is_in_check(color) and not self._has_escape_moves(color)
 
+    def _apply(
+        self, move: PieceMove, piece_type: PieceType, color: PieceColor
+    ) -> _SavedSquares:
+        """Play ``move`` on the board and return what is needed to undo it."""
+        squares = [move.start, move.end, *move.captures]
+        saved = [(square, self.board.get_piece(*square)) for square in squares]
+        for capture in move.captures:
+            self.board.remove_piece(*capture)
+        self.board.remove_piece(*move.start)
+        self.board.place_piece(move.end[0], move.end[1], piece_type, color)
+        return saved
+
+    def _restore(self, saved: _SavedSquares) -> None:
+        for (row, col), piece in reversed(saved):
+            if piece is None:
+                self.board.remove_piece(row, col)
+            else:
+                self.board.place_piece(row, col, piece[0], piece[1])
+
+    @property
+    def active_players(self) -> List[int]:
+        """Return the indices of players who have not been eliminated."""
+        return [i for i in range(self.num_players) if i not in self.eliminated]
+
     def next_turn(self) -> None:
-        """Advance the match to the next player's turn."""
-        self.current_turn = (self.current_turn + 1) % self.num_players
+        """Advance the match to the next player who is still in the game."""
+        for _ in range(self.num_players):
+            self.current_turn = (self.current_turn + 1) % self.num_players
+            if self.current_turn not in self.eliminated:
+                break
         self.move_number += 1
 
     def capture_piece(self, player_index: int, piece: Piece) -> None:
@@ -110,45 +122,126 @@ class Match:
         """Attempt to move a piece and update match state."""
         if self.is_completed:
             return False
-        piece_info = self.board.get_piece(*start)
-        if piece_info is None:
+        move = self._legal_move(start, end)
+        if move is None:
             return False
+        self._play(move)
+        self._finish_turn()
+        return True
 
-        piece_type, color = piece_info
-        piece_map = {
-            PieceType.PAWN: Pawn,
-            PieceType.KNIGHT: Knight,
-            PieceType.BISHOP: Bishop,
-            PieceType.ROOK: Rook,
-            PieceType.QUEEN: Queen,
-            PieceType.KING: King,
-        }
-        piece_cls = piece_map.get(piece_type)
-        if piece_cls is None:
-            return False
+    def replay(
+        self,
+        moves: Iterable[Tuple[Tuple[int, int], Tuple[int, int]]],
+        *,
+        validate: bool = True,
+    ) -> int:
+        """Play ``(start, end)`` moves in order and return how many were applied.
+
+        With ``validate=True`` every move is checked exactly as
+        :meth:`attempt_move` would, using the incrementally maintained attack
+        maps, and a ``ValueError`` naming the ply is raised at the first
+        illegal move or once the match is already over. With
+        ``validate=False`` the moves are trusted: pieces are moved and
+        captures recorded without legality or mate checks, and checkmate is
+        only tested after the final move. Trusted replays assume no player was
+        eliminated before the last move.
+        """
+        if not validate:
+            return self._replay_trusted(list(moves))
+        count = 0
+        for ply, (start, end) in enumerate(moves):
+            if self.is_completed:
+                raise ValueError(f"Match already completed before ply {ply}")
+            move = self._legal_move(start, end)
+            if move is None:
+                raise ValueError(f"Illegal move {start}->{end} at ply {ply}")
+            self._play(move)
+            self._finish_turn()
+            count += 1
+        return count
+
+    def _replay_trusted(
+        self, moves: List[Tuple[Tuple[int, int], Tuple[int, int]]]
+    ) -> int:
+        if moves and self.is_completed:
+            raise ValueError("Match already completed before ply 0")
+        board = self.board
+        for ply, (start, end) in enumerate(moves):
+            piece = board.get_piece(*start)
+            if piece is None:
+                raise ValueError(f"No piece at {start} for ply {ply}")
+            captured = board.get_piece(*end)
+            if captured is not None:
+                self.capture_piece(self.current_turn, Piece(*captured))
+            board.remove_piece(*start)
+            board.place_piece(end[0], end[1], piece[0], piece[1])
+            if ply < len(moves) - 1:
+                self.next_turn()
+        if moves:
+            self._finish_turn()
+        return len(moves)
+
+    def _legal_move(
+        self, start: Tuple[int, int], end: Tuple[int, int]
+    ) -> Optional[PieceMove]:
+        """Return the move from ``start`` to ``end`` if the piece there allows it."""
+        from .moves import generate_moves
 
-        piece_obj = piece_cls(color, self.board)
-        moves = piece_obj.possible_moves(*start)
-        move = next((m for m in moves if m.end == end), None)
+        piece_info = self.board.get_piece(*start)
+        if piece_info is None:
+            return None
+        piece_type, color = piece_info
+        move = next(
+            (
+                m
+                for m in generate_moves(piece_type, self.board, color, *start)
+                if m.end == end
+            ),
+            None,
+        )
         if move is None:
-            return False
-
+            return None
         for capture in move.captures:
             captured = self.board.get_piece(*capture)
             if captured is not None and captured[0] == PieceType.KING:
-                return False
+                return None
+        return move
 
+    def _play(self, move: PieceMove) -> None:
+        """Record captures, move the piece and update the attack maps."""
+        attacks = self._attack_maps()
         for capture in move.captures:
             captured = self.board.get_piece(*capture)
             if captured is not None:
                 self.capture_piece(self.current_turn, Piece(*captured))
-                self.board.remove_piece(*capture)
-
-        self.board.remove_piece(*start)
-        self.board.place_piece(end[0], end[1], piece_type, color)
-        opponent_index = (self.current_turn + 1) % self.num_players
-        if self._is_checkmate(self._player_color(opponent_index)):
+        piece_type, color = self.board.get_piece(*move.start)  # type: ignore[misc]
+        saved = self._apply(move, piece_type, color)
+        attacks.update(square for square, _ in saved)
+
+    def _finish_turn(self) -> None:
+        """Eliminate mated opponents, then end the match or pass the turn.
+
+        While the match goes on, the pieces of newly eliminated players are
+        removed from the board so they no longer block or attack squares.
+        """
+        mated = []
+        for offset in range(1, self.num_players):
+            opponent_index = (self.current_turn + offset) % self.num_players
+            if opponent_index in self.eliminated:
+                continue
+            if self._is_checkmate(self._player_color(opponent_index)):
+                mated.append(opponent_index)
+        self.eliminated.update(mated)
+        if len(self.active_players) <= 1:
             self.is_completed = True
-        else:
-            self.next_turn()
-        return True
+            return
+        for index in mated:
+            self._remove_pieces(self._player_color(index))
+        self.next_turn()
+
+    def _remove_pieces(self, color: PieceColor) -> None:
+        attacks = self._attack_maps()
+        squares = [square for square, _ in attacks.pieces(color)]
+        for square in squares:
+            self.board.remove_piece(*square)
+        attacks.update(squares)
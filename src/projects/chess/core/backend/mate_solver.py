@@ -0,0 +1,220 @@
+"""Proof-number search for "mate in N" puzzles."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .chessboard import Chessboard
+from .moves import _square_under_attack
+from .pieces import PieceColor, PieceMove
+from .search import find_king, legal_moves, make_move, unmake_move
+
+INFINITY = 10**9
+
+# How many expansions run between checks of the time limit.
+_TIME_CHECK_INTERVAL = 64
+
+
+@dataclass
+class MateResult:
+    """Outcome of a mate search.
+
+    ``proven`` is ``True`` when a forced mate was found, ``False`` when none
+    exists within the move limit, and ``None`` when the node or time limit
+    ran out first.
+    """
+
+    proven: Optional[bool]
+    mate_in: Optional[int] = None
+    line: List[PieceMove] = field(default_factory=list)
+    nodes: int = 0
+    elapsed: float = 0.0
+
+
+class _Node:
+    """Proof-number tree node; ``is_or`` nodes have the attacker to move."""
+
+    __slots__ = ("move", "parent", "children", "is_or", "plies_left", "pn", "dn")
+
+    def __init__(
+        self,
+        move: Optional[PieceMove],
+        parent: Optional["_Node"],
+        is_or: bool,
+        plies_left: int,
+    ) -> None:
+        self.move = move
+        self.parent = parent
+        self.children: Optional[List[_Node]] = None
+        self.is_or = is_or
+        self.plies_left = plies_left
+        self.pn = 1
+        self.dn = 1
+
+
+class _LimitReached(Exception):
+    pass
+
+
+def _default_defender(attacker: PieceColor) -> PieceColor:
+    return PieceColor.BLACK if attacker == PieceColor.WHITE else PieceColor.WHITE
+
+
+def solve_mate(
+    board: Chessboard,
+    attacker: PieceColor,
+    moves: int,
+    *,
+    defender: Optional[PieceColor] = None,
+    max_nodes: int = 100_000,
+    time_limit: Optional[float] = None,
+) -> MateResult:
+    """Prove or refute that ``attacker`` to move mates within ``moves`` moves.
+
+    Mate follows ``Match._is_checkmate``: the defender is in check and has
+    no move that leaves its king safe. Shorter mates are tried first, so a
+    proven result reports the fastest mate and its full forcing line. The
+    ``board`` is restored before returning.
+    """
+    if moves < 1:
+        raise ValueError("moves must be >= 1")
+    solver = _ProofNumberSearch(
+        board,
+        attacker,
+        defender or _default_defender(attacker),
+        max_nodes=max_nodes,
+        deadline=None if time_limit is None else time.monotonic() + time_limit,
+    )
+    start = time.monotonic()
+    result = MateResult(proven=False)
+    for depth in range(1, moves + 1):
+        try:
+            root = solver.run(2 * depth - 1)
+        except _LimitReached:
+            result = MateResult(proven=None)
+            break
+        if root.pn == 0:
+            result = MateResult(True, depth, solver.proof_line(root))
+            break
+    result.nodes = solver.nodes
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+class _ProofNumberSearch:
+    def __init__(
+        self,
+        board: Chessboard,
+        attacker: PieceColor,
+        defender: PieceColor,
+        *,
+        max_nodes: int,
+        deadline: Optional[float],
+    ) -> None:
+        self.board = board
+        self.attacker = attacker
+        self.defender = defender
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.nodes = 0
+
+    def run(self, plies: int) -> _Node:
+        """Search until the root is solved; raise ``_LimitReached`` otherwise."""
+        root = _Node(None, None, True, plies)
+        while root.pn != 0 and root.dn != 0:
+            path: List[list] = []
+            node = root
+            try:
+                while node.children is not None:
+                    node = self._select_child(node)
+                    path.append(make_move(self.board, node.move))  # type: ignore
+                self._expand(node)
+                self._update(node)
+            finally:
+                for undo in reversed(path):
+                    unmake_move(self.board, undo)
+        return root
+
+    def proof_line(self, root: _Node) -> List[PieceMove]:
+        """Return the forcing line below a proven ``root``."""
+        line: List[PieceMove] = []
+        node = root
+        while node.children:
+            if node.is_or:
+                node = min(
+                    (child for child in node.children if child.pn == 0),
+                    key=self._proof_length,
+                )
+            else:
+                node = max(node.children, key=self._proof_length)
+            line.append(node.move)  # type: ignore[arg-type]
+        return line
+
+    def _proof_length(self, node: _Node) -> int:
+        if not node.children:
+            return 0
+        if node.is_or:
+            proven = [child for child in node.children if child.pn == 0]
+            return 1 + min(self._proof_length(child) for child in proven)
+        return 1 + max(self._proof_length(child) for child in node.children)
+
+    def _select_child(self, node: _Node) -> _Node:
+        children = node.children or []
+        if node.is_or:
+            return min(children, key=lambda child: child.pn)
+        return min(children, key=lambda child: child.dn)
+
+    def _expand(self, node: _Node) -> None:
+        if self.nodes >= self.max_nodes:
+            raise _LimitReached
+        self.nodes += 1
+        if (
+            self.deadline is not None
+            and self.nodes % _TIME_CHECK_INTERVAL == 0
+            and time.monotonic() > self.deadline
+        ):
+            raise _LimitReached
+
+        node.children = []
+        if node.is_or:
+            if node.plies_left <= 0:
+                node.pn, node.dn = INFINITY, 0
+                return
+            moves = legal_moves(self.board, self.attacker)
+        else:
+            moves = legal_moves(self.board, self.defender)
+            if not moves:
+                king = find_king(self.board, self.defender)
+                in_check = king is not None and _square_under_attack(
+                    self.board, self.defender, *king
+                )
+                node.pn, node.dn = (0, INFINITY) if in_check else (INFINITY, 0)
+                return
+            if node.plies_left <= 0:
+                node.pn, node.dn = INFINITY, 0
+                return
+        if not moves:
+            node.pn, node.dn = INFINITY, 0
+            return
+        node.children = [
+            _Node(move, node, not node.is_or, node.plies_left - 1) for move in moves
+        ]
+        self._recompute(node)
+
+    def _update(self, node: Optional[_Node]) -> None:
+        node = node.parent if node is not None else None
+        while node is not None:
+            self._recompute(node)
+            node = node.parent
+
+    @staticmethod
+    def _recompute(node: _Node) -> None:
+        children = node.children or []
+        if node.is_or:
+            node.pn = min(child.pn for child in children)
+            node.dn = min(sum(child.dn for child in children), INFINITY)
+        else:
+            node.pn = min(sum(child.pn for child in children), INFINITY)
+            node.dn = min(child.dn for child in children)
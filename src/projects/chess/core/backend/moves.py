@@ -3,12 +3,47 @@ from __future__ import annotations
 from typing import List, Tuple, TYPE_CHECKING
 
 from .pieces import PieceMove, PieceColor, PieceType
-from ...utils.logger import logger
+from ...utils.log import logger
 
 if TYPE_CHECKING:  # pragma: no cover - only for type hints
     from .chessboard import Chessboard
 
 
+# Forward step of each color's pawns as ``(row, col)`` deltas. RED and BLUE
+# start on the side files in four-player games and advance across the board.
+PAWN_DIRECTIONS = {
+    PieceColor.WHITE: (-1, 0),
+    PieceColor.BLACK: (1, 0),
+    PieceColor.RED: (0, 1),
+    PieceColor.BLUE: (0, -1),
+}
+
+_KNIGHT_DELTAS = (
+    (2, 1),
+    (1, 2),
+    (-1, 2),
+    (-2, 1),
+    (-2, -1),
+    (-1, -2),
+    (1, -2),
+    (2, -1),
+)
+_KING_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+_ROOK_DELTAS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_BISHOP_DELTAS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+_SLIDER_DELTAS = {
+    PieceType.BISHOP: _BISHOP_DELTAS,
+    PieceType.ROOK: _ROOK_DELTAS,
+    PieceType.QUEEN: _ROOK_DELTAS + _BISHOP_DELTAS,
+}
+
+
+def pawn_capture_deltas(color: PieceColor) -> Tuple[Tuple[int, int], ...]:
+    """Return the two diagonal capture steps of ``color``'s pawns."""
+    d_row, d_col = PAWN_DIRECTIONS[color]
+    return (d_row - d_col, d_col - d_row), (d_row + d_col, d_col + d_row)
+
+
 def _is_valid(board: "Chessboard", row: int, col: int) -> bool:
     """Return ``True`` if the position is on ``board``."""
     return 0 <= row < board.BOARD_HEIGHT and 0 <= col < board.BOARD_WIDTH
@@ -59,6 +94,38 @@ def _square_under_attack(
     return False
 
 
+def attacked_squares(
+    board: "Chessboard", piece: PieceType, color: PieceColor, row: int, col: int
+) -> List[Tuple[int, int]]:
+    """Return the squares a ``piece`` at ``row`` and ``col`` attacks.
+
+    This matches ``_square_under_attack``: sliding pieces attack up to and
+    including the first occupied square, whoever owns it, and kings attack
+    every neighbouring square.
+    """
+    if piece in _SLIDER_DELTAS:
+        squares: List[Tuple[int, int]] = []
+        for d_row, d_col in _SLIDER_DELTAS[piece]:
+            r, c = row + d_row, col + d_col
+            while _is_valid(board, r, c):
+                squares.append((r, c))
+                if board.get_piece(r, c) is not None:
+                    break
+                r, c = r + d_row, c + d_col
+        return squares
+    if piece == PieceType.PAWN:
+        deltas: Tuple[Tuple[int, int], ...] = pawn_capture_deltas(color)
+    elif piece == PieceType.KNIGHT:
+        deltas = _KNIGHT_DELTAS
+    else:
+        deltas = _KING_DELTAS
+    return [
+        (row + d_row, col + d_col)
+        for d_row, d_col in deltas
+        if _is_valid(board, row + d_row, col + d_col)
+    ]
+
+
 def generate_knight_moves(
     board: "Chessboard", color: PieceColor, row: int, col: int
 ) -> List[PieceMove]:
@@ -112,12 +179,13 @@ def generate_pawn_moves(
     board: "Chessboard", color: PieceColor, row: int, col: int
 ) -> List[PieceMove]:
     """Return all legal pawn moves from ``row`` and ``col``."""
-    direction = -1 if color == PieceColor.WHITE else 1
-    target_row = row + direction
-    candidate_moves = [(0, False), (-1, True), (1, True)]
+    forward = PAWN_DIRECTIONS[color]
+    candidate_moves = [(forward, False)]
+    candidate_moves += [(delta, True) for delta in pawn_capture_deltas(color)]
     moves: List[PieceMove] = []
 
-    for delta_col, is_capture in candidate_moves:
+    for (delta_row, delta_col), is_capture in candidate_moves:
+        target_row = row + delta_row
         new_col = col + delta_col
         if not _is_valid(board, target_row, new_col):
             continue
@@ -19,7 +19,6 @@ from typing import TYPE_CHECKING
 
 from ...utils.config import CONFIG
 
-
 if TYPE_CHECKING:  # pragma: no cover - only for type hints
     from .chessboard import Chessboard
 
@@ -0,0 +1,262 @@
+"""Iterative deepening alpha-beta search over ``Match`` positions."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from .chessboard import Chessboard
+from .match import Match
+from .moves import _square_under_attack, generate_moves
+from .pieces import PieceColor, PieceMove, PieceType
+
+MATE_SCORE = 100_000
+
+PIECE_VALUES = {
+    PieceType.PAWN: 100,
+    PieceType.KNIGHT: 320,
+    PieceType.BISHOP: 330,
+    PieceType.ROOK: 500,
+    PieceType.QUEEN: 900,
+    PieceType.KING: 0,
+}
+
+
+class SearchAborted(Exception):
+    """Raised internally when a search is stopped before finishing a depth."""
+
+
+@dataclass
+class PrincipalVariation:
+    """Best line found for one root move."""
+
+    score: int
+    moves: List[PieceMove] = field(default_factory=list)
+
+    @property
+    def is_mate(self) -> bool:
+        """Return ``True`` if ``score`` encodes a forced mate."""
+        return abs(self.score) >= MATE_SCORE - 1000
+
+    @property
+    def mate_in(self) -> Optional[int]:
+        """Return moves until mate (negative if being mated) or ``None``."""
+        if not self.is_mate:
+            return None
+        plies = MATE_SCORE - abs(self.score)
+        moves = (plies + 1) // 2
+        return moves if self.score > 0 else -moves
+
+
+@dataclass
+class SearchResult:
+    """Lines produced by one completed iteration of the search."""
+
+    depth: int
+    lines: List[PrincipalVariation]
+    nodes: int
+    elapsed: float
+
+    @property
+    def best(self) -> Optional[PrincipalVariation]:
+        """Return the highest scoring line, if any legal move exists."""
+        return self.lines[0] if self.lines else None
+
+
+def find_king(board: Chessboard, color: PieceColor) -> Optional[Tuple[int, int]]:
+    """Return the position of ``color``'s king on ``board`` if present."""
+    for r in range(board.BOARD_HEIGHT):
+        for c in range(board.BOARD_WIDTH):
+            if board.get_piece(r, c) == (PieceType.KING, color):
+                return r, c
+    return None
+
+
+def make_move(
+    board: Chessboard, move: PieceMove
+) -> List[Tuple[Tuple[int, int], Optional[Tuple[PieceType, PieceColor]]]]:
+    """Apply ``move`` to ``board`` and return the data needed to undo it."""
+    undo = [(move.start, board.get_piece(*move.start))]
+    for capture in move.captures:
+        undo.append((capture, board.get_piece(*capture)))
+        board.remove_piece(*capture)
+    undo.append((move.end, board.get_piece(*move.end)))
+    piece_type, color = undo[0][1]  # type: ignore[misc]
+    board.remove_piece(*move.start)
+    board.place_piece(move.end[0], move.end[1], piece_type, color)
+    return undo
+
+
+def unmake_move(
+    board: Chessboard,
+    undo: List[Tuple[Tuple[int, int], Optional[Tuple[PieceType, PieceColor]]]],
+) -> None:
+    """Restore ``board`` using the ``undo`` record from :func:`make_move`."""
+    for (row, col), piece in reversed(undo):
+        if piece is None:
+            board.remove_piece(row, col)
+        else:
+            board.place_piece(row, col, piece[0], piece[1])
+
+
+def legal_moves(board: Chessboard, color: PieceColor) -> List[PieceMove]:
+    """Return every move for ``color`` that does not leave its king attacked."""
+    moves: List[PieceMove] = []
+    king = find_king(board, color)
+    for r in range(board.BOARD_HEIGHT):
+        for c in range(board.BOARD_WIDTH):
+            piece = board.get_piece(r, c)
+            if piece is None or piece[1] != color:
+                continue
+            for move in generate_moves(piece[0], board, color, r, c):
+                if king is None:
+                    moves.append(move)
+                    continue
+                target = move.end if piece[0] == PieceType.KING else king
+                undo = make_move(board, move)
+                safe = not _square_under_attack(board, color, *target)
+                unmake_move(board, undo)
+                if safe:
+                    moves.append(move)
+    return moves
+
+
+def evaluate(board: Chessboard, color: PieceColor) -> int:
+    """Return the material balance from ``color``'s point of view."""
+    score = 0
+    for r in range(board.BOARD_HEIGHT):
+        for c in range(board.BOARD_WIDTH):
+            piece = board.get_piece(r, c)
+            if piece is None:
+                continue
+            value = PIECE_VALUES[piece[0]]
+            score += value if piece[1] == color else -value
+    return score
+
+
+class Searcher:
+    """Search the position of a two-player ``Match`` for the best moves.
+
+    The searcher works on a private copy of the board, so the match can keep
+    changing while a search runs on another thread.
+    """
+
+    def __init__(self, match: Match) -> None:
+        if match.num_players != 2:
+            raise ValueError("Search only supports two-player matches")
+        self.board = match.board.clone()
+        self.color = match._player_color(match.current_turn)
+        self.opponent = match._player_color(
+            (match.current_turn + 1) % match.num_players
+        )
+        self.nodes = 0
+        self._stop: Optional[threading.Event] = None
+
+    def iterate(
+        self,
+        max_depth: Optional[int] = None,
+        *,
+        multipv: int = 1,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[SearchResult]:
+        """Yield a ``SearchResult`` after each completed depth.
+
+        Iteration ends after ``max_depth`` plies, when a forced mate is found
+        for the top line, or as soon as ``stop`` is set. The depth being
+        searched when ``stop`` is set is discarded.
+        """
+        if multipv < 1:
+            raise ValueError("multipv must be >= 1")
+        self._stop = stop
+        self.nodes = 0
+        start = time.monotonic()
+        root_moves = legal_moves(self.board, self.color)
+        if not root_moves:
+            return
+        depth = 0
+        while max_depth is None or depth < max_depth:
+            depth += 1
+            try:
+                lines = self._search_root(root_moves, depth, multipv)
+            except SearchAborted:
+                return
+            yield SearchResult(
+                depth=depth,
+                lines=lines[:multipv],
+                nodes=self.nodes,
+                elapsed=time.monotonic() - start,
+            )
+            # Re-search the strongest moves first on the next iteration.
+            root_moves = [line.moves[0] for line in lines]
+            if lines[0].is_mate or (stop is not None and stop.is_set()):
+                return
+
+    def _search_root(
+        self, root_moves: List[PieceMove], depth: int, multipv: int
+    ) -> List[PrincipalVariation]:
+        lines: List[PrincipalVariation] = []
+        for move in root_moves:
+            floor = (
+                sorted(line.score for line in lines)[-multipv]
+                if len(lines) >= multipv
+                else -MATE_SCORE - 1
+            )
+            undo = make_move(self.board, move)
+            try:
+                score, pv = self._negamax(
+                    self.opponent, self.color, depth - 1, -MATE_SCORE - 1, -floor, 1
+                )
+            finally:
+                unmake_move(self.board, undo)
+            lines.append(PrincipalVariation(-score, [move, *pv]))
+        lines.sort(key=lambda line: line.score, reverse=True)
+        return lines
+
+    def _negamax(
+        self,
+        color: PieceColor,
+        opponent: PieceColor,
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+    ) -> Tuple[int, List[PieceMove]]:
+        self.nodes += 1
+        if self._stop is not None and self._stop.is_set():
+            raise SearchAborted
+        moves = legal_moves(self.board, color)
+        if not moves:
+            king = find_king(self.board, color)
+            if king is not None and _square_under_attack(self.board, color, *king):
+                return -MATE_SCORE + ply, []
+            return 0, []
+        if depth <= 0:
+            return evaluate(self.board, color), []
+
+        moves.sort(key=self._capture_value, reverse=True)
+        best_pv: List[PieceMove] = []
+        for move in moves:
+            undo = make_move(self.board, move)
+            try:
+                score, pv = self._negamax(
+                    opponent, color, depth - 1, -beta, -alpha, ply + 1
+                )
+            finally:
+                unmake_move(self.board, undo)
+            score = -score
+            if score > alpha:
+                alpha = score
+                best_pv = [move, *pv]
+                if alpha >= beta:
+                    break
+        return alpha, best_pv
+
+    def _capture_value(self, move: PieceMove) -> int:
+        value = 0
+        for capture in move.captures:
+            piece = self.board.get_piece(*capture)
+            if piece is not None:
+                value += PIECE_VALUES[piece[0]]
+        return value
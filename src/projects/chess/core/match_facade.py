@@ -2,10 +2,13 @@ from __future__ import annotations
 
 """High level API for interacting with a chess match."""
 
-from typing import List, Tuple
+import asyncio
+import threading
+from typing import AsyncIterator, List, Optional, Tuple
 
 from .backend.chessboard import Chessboard
 from .backend.match import Match
+from .backend.search import SearchResult, Searcher
 from .backend.pieces import (
     Bishop,
     King,
@@ -17,6 +20,8 @@ from .backend.pieces import (
     PieceMove,
 )
 
+_ANALYSIS_DONE = object()
+
 
 class MatchFacade:
     """Simple facade exposing high level game operations."""
@@ -28,7 +33,7 @@ class MatchFacade:
     def reset_game(self) -> None:
         """Reset the board and match to the starting position."""
         self.board = Chessboard()
-        self.board.reset_board()
+        self.board.reset_board(self._num_players)
         self.match = Match(self.board, num_players=self._num_players)
 
     def move_piece(self, start: Tuple[int, int], end: Tuple[int, int]) -> bool:
@@ -61,3 +66,45 @@ class MatchFacade:
     def get_move_number(self) -> int:
         """Return the overall move number in the match."""
         return self.match.move_number
+
+    async def analyze(
+        self, *, multipv: int = 1, max_depth: Optional[int] = None
+    ) -> AsyncIterator[SearchResult]:
+        """Stream principal variations for the top ``multipv`` moves.
+
+        The search runs on a background thread and a ``SearchResult`` is
+        yielded as soon as each depth completes, so early shallow results
+        arrive quickly while deeper ones follow. Closing or cancelling the
+        iterator stops the search.
+        """
+        loop = asyncio.get_running_loop()
+        results: "asyncio.Queue[object]" = asyncio.Queue()
+        stop = threading.Event()
+        searcher = Searcher(self.match)
+
+        def publish(item: object) -> None:
+            try:
+                loop.call_soon_threadsafe(results.put_nowait, item)
+            except RuntimeError:  # pragma: no cover - loop already closed
+                stop.set()
+
+        def run() -> None:
+            try:
+                for result in searcher.iterate(max_depth, multipv=multipv, stop=stop):
+                    publish(result)
+            except Exception as exc:  # pragma: no cover - surfaced to consumer
+                publish(exc)
+            finally:
+                publish(_ANALYSIS_DONE)
+
+        threading.Thread(target=run, name="MatchFacadeAnalysis", daemon=True).start()
+        try:
+            while True:
+                item = await results.get()
+                if item is _ANALYSIS_DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item  # type: ignore[misc]
+        finally:
+            stop.set()
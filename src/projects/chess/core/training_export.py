@@ -0,0 +1,338 @@
+"""Export replayed games as memory-mapped NumPy training tensors."""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from ..utils.config import Config, configure
+from .backend.chessboard import Chessboard
+from .backend.match import Match
+from .backend.moves import generate_moves
+from .backend.pieces import PieceColor, PieceType
+from .utils import parse_move
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+_META_FILE = "meta.json"
+_RESULT_TOKENS = {"1-0": 1, "0-1": -1, "1/2-1/2": 0, "*": None}
+_PIECE_TYPES = tuple(PieceType)
+
+
+@dataclass
+class GameRecord:
+    """Moves of one game from the standard starting position.
+
+    ``result`` is ``1`` for a white win, ``-1`` for a black win, ``0`` for a
+    draw, or ``None`` when unknown. A game that ends in checkmate overrides
+    ``result`` with the actual winner.
+    """
+
+    moves: List[Move] = field(default_factory=list)
+    result: Optional[int] = None
+
+
+def read_uci_games(
+    path: str | Path, height: Optional[int] = None
+) -> Iterator[GameRecord]:
+    """Yield games from a text file with one game of UCI moves per line.
+
+    A trailing ``1-0``, ``0-1``, ``1/2-1/2`` or ``*`` token records the result.
+    Blank lines and lines starting with ``#`` are skipped.
+    """
+    rows = height or _board_size()[0]
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            tokens = line.split()
+            if not tokens or tokens[0].startswith("#"):
+                continue
+            result = None
+            if tokens[-1] in _RESULT_TOKENS:
+                result = _RESULT_TOKENS[tokens.pop()]
+            yield GameRecord([parse_move(rows, token) for token in tokens], result)
+
+
+class TrainingDataset:
+    """Preallocated on-disk arrays holding one row per replayed position.
+
+    The dataset directory contains ``.npy`` files that can be opened with
+    ``np.load(..., mmap_mode="r")``:
+
+    - ``planes``: ``uint8`` of shape ``(capacity, planes, H, W)`` with one
+      plane per ``(color, piece type)`` pair.
+    - ``side_to_move``: ``uint8`` index into ``colors``.
+    - ``legal_moves``: from/to mask of the moves ``Match`` accepts for the
+      side to move, bit-packed along the destination axis with
+      ``np.packbits`` into ``uint8`` of shape
+      ``(capacity, H * W, ceil(H * W / 8))``. These are the pseudo-legal
+      moves from ``generate_moves``: ``Match`` accepts them all, including
+      moves that leave the mover in check. Use :meth:`legal_moves` to unpack
+      one row.
+    - ``outcome``: ``int8`` game result from white's point of view.
+
+    Only the first ``count`` rows are valid. Appending continues from
+    ``count``, so later runs extend the same files.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / _META_FILE).read_text())
+        self.capacity: int = meta["capacity"]
+        self.count: int = meta["count"]
+        self.height: int = meta["height"]
+        self.width: int = meta["width"]
+        self.colors: Tuple[PieceColor, ...] = tuple(
+            PieceColor(value) for value in meta["colors"]
+        )
+
+    @classmethod
+    def create(
+        cls,
+        directory: str | Path,
+        capacity: int,
+        *,
+        height: Optional[int] = None,
+        width: Optional[int] = None,
+        colors: Sequence[PieceColor] = (PieceColor.WHITE, PieceColor.BLACK),
+    ) -> "TrainingDataset":
+        """Allocate an empty dataset able to hold ``capacity`` positions."""
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        default_h, default_w = _board_size()
+        h = height or default_h
+        w = width or default_w
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        shapes = _shapes(capacity, h, w, len(colors))
+        for name, (dtype, shape) in shapes.items():
+            open_memmap(target / f"{name}.npy", mode="w+", dtype=dtype, shape=shape)
+        _write_meta(
+            target,
+            {
+                "capacity": capacity,
+                "count": 0,
+                "height": h,
+                "width": w,
+                "colors": [color.value for color in colors],
+            },
+        )
+        return cls(target)
+
+    def arrays(self, mode: str = "r") -> Dict[str, np.memmap]:
+        """Return every array memory-mapped with ``mode``."""
+        return {
+            name: np.load(self.directory / f"{name}.npy", mmap_mode=mode)
+            for name in _shapes(1, 1, 1, 1)
+        }
+
+    def legal_moves(self, row: int) -> np.ndarray:
+        """Return the unpacked ``(H * W, H * W)`` legal-move mask of ``row``."""
+        squares = self.height * self.width
+        packed = self.arrays()["legal_moves"][row]
+        return np.unpackbits(packed, axis=-1, count=squares)
+
+    def append_games(
+        self,
+        games: Iterable[GameRecord],
+        *,
+        processes: int = 0,
+        chunk_size: int = 64,
+    ) -> int:
+        """Replay ``games`` into the dataset and return the positions written.
+
+        Every game contributes ``len(moves) + 1`` positions. With
+        ``processes`` above zero, chunks of games are replayed by a process
+        pool and each worker writes its own disjoint slice of the memmaps.
+        Only a bounded number of chunks is in flight at a time, so memory use
+        stays flat however many games are streamed. ``count`` is only
+        advanced once every chunk has been written.
+        """
+        if _board_size() != (self.height, self.width):
+            raise ValueError(
+                f"Dataset boards are {self.height}x{self.width} but new boards "
+                "are {}x{}".format(*_board_size())
+            )
+        offset = self.count
+        if processes > 0:
+            written = self._append_parallel(games, offset, processes, chunk_size)
+        else:
+            written = 0
+            for chunk, size in _chunks(games, chunk_size):
+                self._reserve(offset + written, size)
+                _write_chunk(self._job(), offset + written, chunk)
+                written += size
+        self.count = offset + written
+        meta = json.loads((self.directory / _META_FILE).read_text())
+        meta["count"] = self.count
+        _write_meta(self.directory, meta)
+        return written
+
+    def _append_parallel(
+        self,
+        games: Iterable[GameRecord],
+        offset: int,
+        processes: int,
+        chunk_size: int,
+    ) -> int:
+        written = 0
+        pending: Deque[Future] = deque()
+        # Workers get the parent's configuration so boards have matching sizes
+        # even when processes are spawned rather than forked.
+        config = Config(board_width=self.width, board_height=self.height)
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=configure, initargs=(config,)
+        ) as pool:
+            for chunk, size in _chunks(games, chunk_size):
+                self._reserve(offset + written, size)
+                pending.append(
+                    pool.submit(_write_chunk, self._job(), offset + written, chunk)
+                )
+                written += size
+                if len(pending) >= processes * 2:
+                    pending.popleft().result()
+            while pending:
+                pending.popleft().result()
+        return written
+
+    def _reserve(self, start: int, size: int) -> None:
+        if start + size > self.capacity:
+            raise ValueError(
+                f"Dataset capacity {self.capacity} exceeded "
+                f"({start + size} positions needed)"
+            )
+
+    def _job(self) -> "_ExportJob":
+        return _ExportJob(
+            directory=str(self.directory),
+            colors=tuple(color.value for color in self.colors),
+        )
+
+
+@dataclass(frozen=True)
+class _ExportJob:
+    """Picklable description of a dataset for worker processes."""
+
+    directory: str
+    colors: Tuple[str, ...]
+
+
+def _board_size() -> Tuple[int, int]:
+    """Return the ``(height, width)`` that new ``Chessboard`` objects use."""
+    board = Chessboard()
+    return board.BOARD_HEIGHT, board.BOARD_WIDTH
+
+
+def _shapes(
+    capacity: int, height: int, width: int, num_colors: int
+) -> Dict[str, Tuple[type, Tuple[int, ...]]]:
+    squares = height * width
+    return {
+        "planes": (
+            np.uint8,
+            (capacity, num_colors * len(_PIECE_TYPES), height, width),
+        ),
+        "side_to_move": (np.uint8, (capacity,)),
+        "legal_moves": (np.uint8, (capacity, squares, (squares + 7) // 8)),
+        "outcome": (np.int8, (capacity,)),
+    }
+
+
+def _write_meta(directory: Path, meta: Dict[str, object]) -> None:
+    tmp = directory / f"{_META_FILE}.tmp"
+    tmp.write_text(json.dumps(meta, indent=2) + "\n")
+    tmp.replace(directory / _META_FILE)
+
+
+def _chunks(
+    games: Iterable[GameRecord], chunk_size: int
+) -> Iterator[Tuple[List[GameRecord], int]]:
+    """Group ``games`` into lists with their total position counts."""
+    chunk: List[GameRecord] = []
+    size = 0
+    for game in games:
+        chunk.append(game)
+        size += len(game.moves) + 1
+        if len(chunk) >= chunk_size:
+            yield chunk, size
+            chunk, size = [], 0
+    if chunk:
+        yield chunk, size
+
+
+def _write_chunk(job: _ExportJob, start: int, games: List[GameRecord]) -> int:
+    """Replay ``games`` into rows beginning at ``start``; runs in workers."""
+    directory = Path(job.directory)
+    planes = np.load(directory / "planes.npy", mmap_mode="r+")
+    side = np.load(directory / "side_to_move.npy", mmap_mode="r+")
+    legal = np.load(directory / "legal_moves.npy", mmap_mode="r+")
+    outcome = np.load(directory / "outcome.npy", mmap_mode="r+")
+    colors = [PieceColor(value) for value in job.colors]
+    color_index = {color: index for index, color in enumerate(colors)}
+    type_index = {piece: index for index, piece in enumerate(_PIECE_TYPES)}
+
+    row = start
+    for game_number, game in enumerate(games):
+        board = Chessboard()
+        board.reset_board()
+        match = Match(board, num_players=len(colors))
+        first = row
+        for ply in range(len(game.moves) + 1):
+            mover = match._player_color(match.current_turn)
+            _encode_position(
+                board, planes[row], legal[row], mover, color_index, type_index
+            )
+            side[row] = color_index[mover]
+            row += 1
+            if ply < len(game.moves):
+                start_square, end_square = game.moves[ply]
+                if not match.attempt_move(start_square, end_square):
+                    raise ValueError(
+                        f"Illegal move {start_square}->{end_square} at ply {ply} "
+                        f"of game {game_number} in chunk starting at row {start}"
+                    )
+        result = game.result
+        if match.is_completed:
+            winner = match._player_color(match.current_turn)
+            result = 1 if winner == PieceColor.WHITE else -1
+        outcome[first:row] = 0 if result is None else result
+    for array in (planes, side, legal, outcome):
+        array.flush()
+    return row - start
+
+
+def _encode_position(
+    board: Chessboard,
+    planes: np.ndarray,
+    legal: np.ndarray,
+    mover: PieceColor,
+    color_index: Dict[PieceColor, int],
+    type_index: Dict[PieceType, int],
+) -> None:
+    """Write piece planes and the packed legal-move mask for ``mover``."""
+    width = board.BOARD_WIDTH
+    squares = board.BOARD_HEIGHT * width
+    planes[...] = 0
+    mask = np.zeros((squares, squares), dtype=np.uint8)
+    for r in range(board.BOARD_HEIGHT):
+        for c in range(width):
+            piece = board.get_piece(r, c)
+            if piece is None:
+                continue
+            piece_type, color = piece
+            if color not in color_index:
+                raise ValueError(f"Color {color.value} is not part of this dataset")
+            planes[
+                color_index[color] * len(_PIECE_TYPES) + type_index[piece_type], r, c
+            ] = 1
+            if color != mover:
+                continue
+            for move in generate_moves(piece_type, board, color, r, c):
+                mask[r * width + c, move.end[0] * width + move.end[1]] = 1
+    legal[...] = np.packbits(mask, axis=-1)
@@ -2,6 +2,14 @@
 
 from __future__ import annotations
 
+import re
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from .backend.pieces import PieceMove
+
+_MOVE_RE = re.compile(r"^([a-z]+)(\d+)([a-z]+)(\d+)$")
+
 
 def index_to_letters(index: int) -> str:
     """Return the alphabetical representation for ``index``.
@@ -18,3 +26,38 @@ def index_to_letters(index: int) -> str:
         result = chr(ord("A") + index % 26) + result
         index //= 26
     return result
+
+
+def letters_to_index(letters: str) -> int:
+    """Return the one-based index for alphabetical ``letters``.
+
+    This is the inverse of :func:`index_to_letters` and accepts either case.
+    """
+    if not letters or not letters.isalpha() or not letters.isascii():
+        raise ValueError("letters must be a non-empty alphabetical string")
+
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index
+
+
+def square_name(height: int, row: int, col: int) -> str:
+    """Return the UCI name (``"e2"``) of ``row`` and ``col``."""
+    return f"{index_to_letters(col + 1).lower()}{height - row}"
+
+
+def move_name(height: int, move: "PieceMove") -> str:
+    """Return ``move`` in UCI long algebraic notation."""
+    return square_name(height, *move.start) + square_name(height, *move.end)
+
+
+def parse_move(height: int, text: str) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Return ``(start, end)`` board coordinates for a UCI move string."""
+    match = _MOVE_RE.match(text)
+    if match is None:
+        raise ValueError(f"Invalid UCI move: {text!r}")
+    from_col, from_rank, to_col, to_rank = match.groups()
+    start = (height - int(from_rank), letters_to_index(from_col) - 1)
+    end = (height - int(to_rank), letters_to_index(to_col) - 1)
+    return start, end
@@ -0,0 +1,150 @@
+"""Incremental ANSI terminal rendering for live games."""
+
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, List, Optional, Set, Tuple
+
+from .unicode_board import _EMPTY_CELL, _piece_cells, draw_board
+
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from ..core.backend.chessboard import Chessboard
+
+_CSI = "\x1b["
+
+Snapshot = Tuple[Tuple[object, ...], ...]
+
+
+class LiveBoardRenderer:
+    """Render a board once, then emit ANSI updates for changed cells only.
+
+    The first call to :meth:`update` returns the full ``draw_board`` output.
+    Later calls return cursor movements relative to the line just below the
+    board, followed by the new contents of each changed cell, and finish with
+    the cursor back below the board. Terminals that have already shown the
+    previous frame can therefore apply the update without redrawing.
+    """
+
+    def __init__(self, *, with_coords: bool = False, invert: bool = False) -> None:
+        self.with_coords = with_coords
+        self.invert = invert
+        self._snapshot: Optional[Snapshot] = None
+        self._frame: str = ""
+
+    @property
+    def frame(self) -> str:
+        """Return the full text of the most recently rendered board."""
+        return self._frame
+
+    def reset(self) -> None:
+        """Forget the previous frame so the next update redraws everything."""
+        self._snapshot = None
+        self._frame = ""
+
+    def update(self, board: "Chessboard") -> str:
+        """Return the text needed to bring the terminal up to date with ``board``."""
+        snapshot = _snapshot(board)
+        previous = self._snapshot
+        if previous is not None and (
+            len(previous) != len(snapshot) or len(previous[0]) != len(snapshot[0])
+        ):
+            previous = None
+
+        self._snapshot = snapshot
+        self._frame = draw_board(
+            board, with_coords=self.with_coords, invert=self.invert
+        )
+        if previous is None:
+            return self._frame
+
+        changed = [
+            (row, col)
+            for row, (old_row, new_row) in enumerate(zip(previous, snapshot))
+            for col, (old, new) in enumerate(zip(old_row, new_row))
+            if old != new
+        ]
+        if not changed:
+            return ""
+        return self._diff(board, changed)
+
+    def _diff(self, board: "Chessboard", changed: List[Tuple[int, int]]) -> str:
+        h = board.BOARD_HEIGHT
+        w = board.BOARD_WIDTH
+        total_lines = self._frame.count("\n")
+        cells = _piece_cells()
+        targets = []
+        for row, col in changed:
+            display_row = h - 1 - row if self.invert else row
+            display_col = w - 1 - col if self.invert else col
+            line = 1 + 2 * display_row
+            prefix = 0
+            if self.with_coords:
+                label = display_row + 1 if self.invert else h - display_row
+                prefix = len(f"{label} ")
+            column = prefix + 1 + 4 * display_col
+            piece = board.get_piece(row, col)
+            text = _EMPTY_CELL if piece is None else cells[piece]
+            targets.append((line, column, text))
+
+        parts: List[str] = []
+        current = total_lines
+        for line, column, text in sorted(targets):
+            parts.append(_move_vertical(line - current))
+            parts.append(f"{_CSI}{column + 1}G{text}")
+            current = line
+        parts.append(_move_vertical(total_lines - current))
+        parts.append(f"{_CSI}1G")
+        return "".join(parts)
+
+
+class LiveBoardBroadcaster:
+    """Fan one live board out to many spectator streams.
+
+    Each update is diffed once and the same text is written to every stream,
+    so the cost of a move does not grow with the rendering work per spectator.
+    New spectators receive the full current frame.
+    """
+
+    def __init__(self, *, with_coords: bool = False, invert: bool = False) -> None:
+        self.renderer = LiveBoardRenderer(with_coords=with_coords, invert=invert)
+        self._streams: Set[IO[str]] = set()
+
+    def add(self, stream: IO[str]) -> None:
+        """Start streaming to ``stream``, sending the current frame if any."""
+        self._streams.add(stream)
+        if self.renderer.frame:
+            _send(stream, self.renderer.frame)
+
+    def remove(self, stream: IO[str]) -> None:
+        """Stop streaming to ``stream``."""
+        self._streams.discard(stream)
+
+    def publish(self, board: "Chessboard") -> str:
+        """Write the update for ``board`` to every stream and return it."""
+        text = self.renderer.update(board)
+        if text:
+            for stream in list(self._streams):
+                try:
+                    _send(stream, text)
+                except (OSError, ValueError):
+                    self._streams.discard(stream)
+        return text
+
+
+def _snapshot(board: "Chessboard") -> Snapshot:
+    return tuple(
+        tuple(board.get_piece(row, col) for col in range(board.BOARD_WIDTH))
+        for row in range(board.BOARD_HEIGHT)
+    )
+
+
+def _move_vertical(delta: int) -> str:
+    if delta < 0:
+        return f"{_CSI}{-delta}A"
+    if delta > 0:
+        return f"{_CSI}{delta}B"
+    return ""
+
+
+def _send(stream: IO[str], text: str) -> None:
+    stream.write(text)
+    stream.flush()
@@ -0,0 +1,248 @@
+"""Bulk SVG and HTML chessboard rendering with cached templates."""
+
+from __future__ import annotations
+
+import html
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, List, Tuple, Union
+
+from ..core.backend.pieces import PieceColor, PieceType
+from ..core.utils import index_to_letters
+
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from ..core.backend.chessboard import Chessboard
+
+CELL_SIZE = 45
+COORD_MARGIN = 20
+LIGHT_SQUARE = "#f0d9b5"
+DARK_SQUARE = "#b58863"
+
+_GLYPHS = {
+    PieceType.PAWN: "♟",
+    PieceType.KNIGHT: "♞",
+    PieceType.BISHOP: "♝",
+    PieceType.ROOK: "♜",
+    PieceType.QUEEN: "♛",
+    PieceType.KING: "♚",
+}
+
+_STYLE = (
+    "<style>"
+    ".chess-white{fill:#fff;stroke:#000;stroke-width:1.2}"
+    ".chess-black{fill:#000}"
+    ".chess-red{fill:#c62828;stroke:#000;stroke-width:0.6}"
+    ".chess-blue{fill:#1565c0;stroke:#000;stroke-width:0.6}"
+    ".chess-coord{font:12px sans-serif;fill:#333}"
+    "</style>"
+)
+
+_GLYPH_DEFS = "".join(
+    f'<symbol id="chess-{piece.value}" viewBox="0 0 {CELL_SIZE} {CELL_SIZE}">'
+    f'<text x="{CELL_SIZE / 2}" y="{CELL_SIZE * 0.78}" text-anchor="middle" '
+    f'font-size="{CELL_SIZE * 0.8}">{glyph}</text></symbol>'
+    for piece, glyph in _GLYPHS.items()
+)
+
+PathOrFile = Union[str, Path, IO[str]]
+
+
+def _frame_id(height: int, width: int, with_coords: bool, invert: bool) -> str:
+    suffix = ("-c" if with_coords else "") + ("-i" if invert else "")
+    return f"chess-frame-{height}x{width}{suffix}"
+
+
+@lru_cache(maxsize=None)
+def _frame_symbol(height: int, width: int, with_coords: bool, invert: bool) -> str:
+    """Return a ``<symbol>`` drawing the squares and coordinates of a board."""
+    offset = COORD_MARGIN if with_coords else 0
+    total_w = width * CELL_SIZE + offset
+    total_h = height * CELL_SIZE + offset
+    parts = [
+        f'<symbol id="{_frame_id(height, width, with_coords, invert)}" '
+        f'viewBox="0 0 {total_w} {total_h}">',
+        f'<rect x="{offset}" y="0" width="{width * CELL_SIZE}" '
+        f'height="{height * CELL_SIZE}" fill="{LIGHT_SQUARE}"/>',
+    ]
+    for row in range(height):
+        for col in range(width):
+            if (row + col) % 2:
+                parts.append(
+                    f'<rect x="{offset + col * CELL_SIZE}" y="{row * CELL_SIZE}" '
+                    f'width="{CELL_SIZE}" height="{CELL_SIZE}" fill="{DARK_SQUARE}"/>'
+                )
+    if with_coords:
+        for idx in range(height):
+            label = idx + 1 if invert else height - idx
+            y = idx * CELL_SIZE + CELL_SIZE / 2 + 4
+            parts.append(
+                f'<text class="chess-coord" x="{COORD_MARGIN / 2}" y="{y}" '
+                f'text-anchor="middle">{label}</text>'
+            )
+        for idx in range(width):
+            col = width - 1 - idx if invert else idx
+            x = offset + idx * CELL_SIZE + CELL_SIZE / 2
+            parts.append(
+                f'<text class="chess-coord" x="{x}" y="{total_h - 5}" '
+                f'text-anchor="middle">{index_to_letters(col + 1)}</text>'
+            )
+    parts.append("</symbol>")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _svg_open(height: int, width: int, with_coords: bool, invert: bool) -> str:
+    """Return the opening tag and frame reference shared by every position."""
+    offset = COORD_MARGIN if with_coords else 0
+    total_w = width * CELL_SIZE + offset
+    total_h = height * CELL_SIZE + offset
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{total_w}" '
+        f'height="{total_h}" viewBox="0 0 {total_w} {total_h}">'
+        f'<use href="#{_frame_id(height, width, with_coords, invert)}" '
+        f'width="{total_w}" height="{total_h}"/>'
+    )
+
+
+@lru_cache(maxsize=None)
+def _standalone_defs(height: int, width: int, with_coords: bool, invert: bool) -> str:
+    return (
+        f"<defs>{_STYLE}{_GLYPH_DEFS}"
+        f"{_frame_symbol(height, width, with_coords, invert)}</defs>"
+    )
+
+
+@lru_cache(maxsize=4096)
+def _piece_use(piece: PieceType, color: PieceColor, x: int, y: int) -> str:
+    return (
+        f'<use href="#chess-{piece.value}" x="{x}" y="{y}" width="{CELL_SIZE}" '
+        f'height="{CELL_SIZE}" class="chess-{color.value}"/>'
+    )
+
+
+def _piece_overlays(board: "Chessboard", with_coords: bool, invert: bool) -> str:
+    """Return ``<use>`` elements for every piece on ``board``."""
+    h = board.BOARD_HEIGHT
+    w = board.BOARD_WIDTH
+    offset = COORD_MARGIN if with_coords else 0
+    parts: List[str] = []
+    for row in range(h):
+        y = (h - 1 - row if invert else row) * CELL_SIZE
+        for col in range(w):
+            piece = board.get_piece(row, col)
+            if piece is None:
+                continue
+            x = offset + (w - 1 - col if invert else col) * CELL_SIZE
+            parts.append(_piece_use(piece[0], piece[1], x, y))
+    return "".join(parts)
+
+
+def _board_key(
+    board: "Chessboard", with_coords: bool, invert: bool
+) -> Tuple[int, int, bool, bool]:
+    return board.BOARD_HEIGHT, board.BOARD_WIDTH, with_coords, invert
+
+
+def render_svg(
+    board: "Chessboard", *, with_coords: bool = False, invert: bool = False
+) -> str:
+    """Return a standalone SVG document for ``board``.
+
+    Parameters
+    ----------
+    board:
+        The ``Chessboard`` instance to render.
+    with_coords:
+        If ``True``, include numeric coordinates along the left edge and
+        alphabetical coordinates along the bottom of the board.
+    invert:
+        If ``True``, draw the board upside down.
+    """
+
+    key = _board_key(board, with_coords, invert)
+    return (
+        _svg_open(*key)
+        + _standalone_defs(*key)
+        + _piece_overlays(board, with_coords, invert)
+        + "</svg>\n"
+    )
+
+
+def iter_svg(
+    boards: Iterable["Chessboard"], *, with_coords: bool = False, invert: bool = False
+) -> Iterator[str]:
+    """Yield a standalone SVG document for each board in ``boards``."""
+
+    for board in boards:
+        yield render_svg(board, with_coords=with_coords, invert=invert)
+
+
+def save_svg_boards(
+    boards: Iterable["Chessboard"],
+    directory: str | Path,
+    *,
+    pattern: str = "board_{index:05d}.svg",
+    with_coords: bool = False,
+    invert: bool = False,
+) -> int:
+    """Write one SVG file per board into ``directory`` and return the count."""
+
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for index, svg in enumerate(
+        iter_svg(boards, with_coords=with_coords, invert=invert)
+    ):
+        (target / pattern.format(index=index)).write_text(svg, encoding="utf-8")
+        count += 1
+    return count
+
+
+def save_html(
+    boards: Iterable["Chessboard"],
+    path: PathOrFile,
+    *,
+    title: str = "Chess boards",
+    with_coords: bool = False,
+    invert: bool = False,
+) -> int:
+    """Stream ``boards`` into a single HTML page and return the board count.
+
+    Glyphs and board frames are defined once in the page and every position
+    only adds its piece overlays, so the file grows with the number of pieces
+    rather than the number of squares.
+    """
+
+    if isinstance(path, (str, Path)):
+        with open(path, "w", encoding="utf-8") as handle:
+            return _write_html(boards, handle, title, with_coords, invert)
+    return _write_html(boards, path, title, with_coords, invert)
+
+
+def _write_html(
+    boards: Iterable["Chessboard"],
+    out: IO[str],
+    title: str,
+    with_coords: bool,
+    invert: bool,
+) -> int:
+    hidden = '<svg width="0" height="0" style="position:absolute">'
+    out.write(
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+        f"<title>{html.escape(title)}</title></head><body>\n"
+        f"{hidden}<defs>{_STYLE}{_GLYPH_DEFS}</defs></svg>\n"
+    )
+    defined = set()
+    count = 0
+    for count, board in enumerate(boards, start=1):
+        key = _board_key(board, with_coords, invert)
+        if key not in defined:
+            defined.add(key)
+            out.write(f"{hidden}<defs>{_frame_symbol(*key)}</defs></svg>\n")
+        out.write(
+            f"<figure>{_svg_open(*key)}"
+            f"{_piece_overlays(board, with_coords, invert)}</svg>"
+            f"<figcaption>Position {count}</figcaption></figure>\n"
+        )
+    out.write("</body></html>\n")
+    return count
@@ -0,0 +1,239 @@
+"""Universal Chess Interface (UCI) adapter driving ``MatchFacade``."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Dict, List, Optional, TextIO
+
+from ..core.backend.pieces import PieceColor
+from ..core.backend.search import SearchResult, Searcher, legal_moves
+from ..core.match_facade import MatchFacade
+from ..core.utils import move_name, parse_move
+
+ENGINE_NAME = "dh_workspace chess"
+ENGINE_AUTHOR = "dh_workspace"
+
+# Search depth used by ``go`` when no depth, time control, or ``infinite``
+# limit is supplied.
+DEFAULT_DEPTH = 3
+DEFAULT_MOVES_TO_GO = 30
+
+_GO_VALUE_OPTIONS = {
+    "wtime",
+    "btime",
+    "winc",
+    "binc",
+    "movestogo",
+    "movetime",
+    "depth",
+}
+
+
+class UciEngine:
+    """Speak UCI over text streams while searching on a background thread.
+
+    Commands are handled on the caller's thread, so ``isready``, ``stop`` and
+    ``ponderhit`` are answered while a search is running. ``go ponder`` and
+    ``go infinite`` searches hold back ``bestmove`` until ``ponderhit`` or
+    ``stop`` arrives, as the protocol requires.
+    """
+
+    def __init__(self, output: TextIO = sys.stdout) -> None:
+        self._output = output
+        self._output_lock = threading.Lock()
+        self.facade = MatchFacade(num_players=2)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._release = threading.Event()
+        self._timer: Optional[threading.Timer] = None
+        self._ponder_budget: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Protocol loop
+    def run(self, stream: TextIO = sys.stdin) -> None:
+        """Process commands from ``stream`` until ``quit`` or end of input."""
+        try:
+            for line in stream:
+                if not self.handle(line):
+                    break
+        finally:
+            self._stop_search()
+
+    def handle(self, line: str) -> bool:
+        """Handle one command line. Return ``False`` once ``quit`` is received."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "quit":
+            return False
+        if command == "uci":
+            self._send(f"id name {ENGINE_NAME}")
+            self._send(f"id author {ENGINE_AUTHOR}")
+            self._send("uciok")
+        elif command == "isready":
+            self._send("readyok")
+        elif command == "ucinewgame":
+            self._stop_search()
+            self.facade.reset_game()
+        elif command == "position":
+            self._stop_search()
+            self._set_position(args)
+        elif command == "go":
+            self._go(args)
+        elif command == "stop":
+            self._stop_search()
+        elif command == "ponderhit":
+            self._ponderhit()
+        elif command in {"debug", "setoption", "register"}:
+            pass
+        else:
+            self._send(f"info string unknown command {command}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Command handlers
+    def _set_position(self, args: List[str]) -> None:
+        if not args or args[0] != "startpos":
+            self._send("info string only 'position startpos' is supported")
+            return
+        self.facade.reset_game()
+        moves = args[2:] if len(args) > 1 and args[1] == "moves" else []
+        height = self.facade.board.BOARD_HEIGHT
+        for text in moves:
+            try:
+                start, end = parse_move(height, text)
+                legal = self.facade.move_piece(start, end)
+            except ValueError:
+                legal = False
+            if not legal:
+                self._send(f"info string illegal move {text}")
+                return
+
+    def _go(self, args: List[str]) -> None:
+        self._stop_search()
+        limits: Dict[str, int] = {}
+        ponder = "ponder" in args
+        infinite = "infinite" in args
+        for index, name in enumerate(args):
+            if name not in _GO_VALUE_OPTIONS:
+                continue
+            try:
+                limits[name] = int(args[index + 1])
+            except (IndexError, ValueError):
+                # GUIs expect a malformed limit to be ignored, not fatal.
+                self._send(f"info string ignoring go {name} without a number")
+
+        budget = self._time_budget(limits)
+        depth = limits.get("depth")
+        if depth is None and budget is None and not infinite:
+            depth = DEFAULT_DEPTH
+
+        self._stop = threading.Event()
+        self._release = threading.Event()
+        self._ponder_budget = budget if ponder else None
+        if not (ponder or infinite):
+            self._release.set()
+            self._start_timer(budget)
+
+        searcher = Searcher(self.facade.match)
+        self._thread = threading.Thread(
+            target=self._search,
+            args=(searcher, depth, self._stop, self._release),
+            name="UciSearch",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _ponderhit(self) -> None:
+        if self._thread is None or self._release.is_set():
+            return
+        self._start_timer(self._ponder_budget)
+        self._release.set()
+
+    def _stop_search(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._stop.set()
+        self._release.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Search thread
+    def _search(
+        self,
+        searcher: Searcher,
+        depth: Optional[int],
+        stop: threading.Event,
+        release: threading.Event,
+    ) -> None:
+        height = searcher.board.BOARD_HEIGHT
+        last: Optional[SearchResult] = None
+        for result in searcher.iterate(depth, stop=stop):
+            last = result
+            self._send(self._info_line(height, result))
+        # Ponder and infinite searches may finish early but must not report
+        # until the GUI releases them.
+        release.wait()
+
+        line = last.best if last is not None else None
+        if line is None or not line.moves:
+            fallback = legal_moves(searcher.board, searcher.color)
+            if not fallback:
+                self._send("bestmove 0000")
+                return
+            moves = fallback[:1]
+        else:
+            moves = line.moves
+        reply = f"bestmove {move_name(height, moves[0])}"
+        if len(moves) > 1:
+            reply += f" ponder {move_name(height, moves[1])}"
+        self._send(reply)
+
+    def _info_line(self, height: int, result: SearchResult) -> str:
+        best = result.best
+        assert best is not None
+        mate_in = best.mate_in
+        score = f"mate {mate_in}" if mate_in is not None else f"cp {best.score}"
+        pv = " ".join(move_name(height, move) for move in best.moves)
+        return (
+            f"info depth {result.depth} score {score} nodes {result.nodes} "
+            f"time {int(result.elapsed * 1000)} pv {pv}"
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    def _time_budget(self, limits: Dict[str, int]) -> Optional[float]:
+        """Return the seconds to spend on this move, or ``None`` if untimed."""
+        if "movetime" in limits:
+            return limits["movetime"] / 1000
+        white = self.facade.match._player_color(self.facade.get_current_turn())
+        prefix = "w" if white == PieceColor.WHITE else "b"
+        remaining = limits.get(f"{prefix}time")
+        if remaining is None:
+            return None
+        increment = limits.get(f"{prefix}inc", 0)
+        moves_to_go = limits.get("movestogo") or DEFAULT_MOVES_TO_GO
+        budget = remaining / moves_to_go + increment / 2
+        return min(budget, remaining / 2) / 1000
+
+    def _start_timer(self, budget: Optional[float]) -> None:
+        if budget is None:
+            return
+        self._timer = threading.Timer(budget, self._stop.set)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _send(self, line: str) -> None:
+        with self._output_lock:
+            self._output.write(line + "\n")
+            self._output.flush()
+
+
+def run_uci(stream: TextIO = sys.stdin, output: TextIO = sys.stdout) -> None:
+    """Run a UCI session reading ``stream`` and writing to ``output``."""
+    UciEngine(output).run(stream)
@@ -2,16 +2,62 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Tuple
 
 from ..utils.config import CONFIG
 from ..core.utils import index_to_letters
 
-
 _H_SEG = "━" * 3
 _EMPTY_CELL = " " * 3
 
 
+@lru_cache(maxsize=None)
+def _borders(width: int) -> Tuple[str, str, str]:
+    """Return the top, middle and bottom border lines for ``width`` columns."""
+    top = "┏" + "┳".join(_H_SEG for _ in range(width)) + "┓"
+    mid = "┣" + "╋".join(_H_SEG for _ in range(width)) + "┫"
+    bottom = "┗" + "┻".join(_H_SEG for _ in range(width)) + "┛"
+    return top, mid, bottom
+
+
+@lru_cache(maxsize=None)
+def _piece_cells() -> Dict[Tuple[object, object], str]:
+    """Return the rendered cell for every ``(PieceType, PieceColor)`` pair."""
+    from ..core.backend.pieces import PieceColor, PieceType
+
+    unicode_map = {
+        PieceColor.WHITE: {
+            PieceType.PAWN: "♙",
+            PieceType.KNIGHT: "♘",
+            PieceType.BISHOP: "♗",
+            PieceType.ROOK: "♖",
+            PieceType.QUEEN: "♕",
+            PieceType.KING: "♔",
+        },
+        PieceColor.BLACK: {
+            PieceType.PAWN: "♟",
+            PieceType.KNIGHT: "♞",
+            PieceType.BISHOP: "♝",
+            PieceType.ROOK: "♜",
+            PieceType.QUEEN: "♛",
+            PieceType.KING: "♚",
+        },
+    }
+    # RED and BLUE reuse the solid glyphs, tinted with ANSI colors.
+    tints = {PieceColor.RED: "\x1b[31m", PieceColor.BLUE: "\x1b[34m"}
+    cells = {}
+    for p_color in PieceColor:
+        glyphs = unicode_map.get(p_color, unicode_map[PieceColor.BLACK])
+        for p_type in PieceType:
+            glyph = glyphs[p_type]
+            if p_color in tints:
+                glyph = f"{tints[p_color]}{glyph}\x1b[0m"
+            cells[(p_type, p_color)] = f" {glyph} "
+    return cells
+
+
 def draw_empty_board(
     width: int | None = None,
     height: int | None = None,
@@ -34,9 +80,7 @@ def draw_empty_board(
     w = width or CONFIG.board_width
     h = height or CONFIG.board_height
 
-    top = "┏" + "┳".join(_H_SEG for _ in range(w)) + "┓"
-    mid = "┣" + "╋".join(_H_SEG for _ in range(w)) + "┫"
-    bottom = "┗" + "┻".join(_H_SEG for _ in range(w)) + "┛"
+    top, mid, bottom = _borders(w)
 
     lines: list[str] = [top if not with_coords else f"  {top}"]
     for idx in range(h):
@@ -72,33 +116,12 @@ def draw_board(
         player's perspective.
     """
 
-    from ..core.backend.pieces import PieceColor, PieceType
-
-    unicode_map = {
-        PieceColor.WHITE: {
-            PieceType.PAWN: "♙",
-            PieceType.KNIGHT: "♘",
-            PieceType.BISHOP: "♗",
-            PieceType.ROOK: "♖",
-            PieceType.QUEEN: "♕",
-            PieceType.KING: "♔",
-        },
-        PieceColor.BLACK: {
-            PieceType.PAWN: "♟",
-            PieceType.KNIGHT: "♞",
-            PieceType.BISHOP: "♝",
-            PieceType.ROOK: "♜",
-            PieceType.QUEEN: "♛",
-            PieceType.KING: "♚",
-        },
-    }
+    cells_by_piece = _piece_cells()
 
     w = board.BOARD_WIDTH
     h = board.BOARD_HEIGHT
 
-    top = "┏" + "┳".join(_H_SEG for _ in range(w)) + "┓"
-    mid = "┣" + "╋".join(_H_SEG for _ in range(w)) + "┫"
-    bottom = "┗" + "┻".join(_H_SEG for _ in range(w)) + "┛"
+    top, mid, bottom = _borders(w)
 
     row_range = range(h - 1, -1, -1) if invert else range(h)
     col_range = range(w - 1, -1, -1) if invert else range(w)
@@ -111,9 +134,7 @@ def draw_board(
             if piece is None:
                 cells.append(_EMPTY_CELL)
             else:
-                p_type, p_color = piece
-                char = unicode_map.get(p_color, {}).get(p_type, "?")
-                cells.append(f" {char} ")
+                cells.append(cells_by_piece[piece])
         row_line = "┃" + "┃".join(cells) + "┃"
         if with_coords:
             label = idx + 1 if invert else h - idx
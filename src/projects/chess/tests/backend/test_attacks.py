@@ -0,0 +1,37 @@
+from projects.chess import Chessboard, Match, PieceColor, PieceType
+from projects.chess.core.backend.attacks import AttackMaps
+from projects.chess.core.backend.moves import _square_under_attack
+
+
+def test_in_check_matches_board_scan() -> None:
+    board = Chessboard()
+    board.reset_board()
+    board.place_piece(4, 4, PieceType.KING, PieceColor.RED)
+    board.place_piece(2, 2, PieceType.BISHOP, PieceColor.BLUE)
+    attacks = AttackMaps(board)
+    for color in (PieceColor.WHITE, PieceColor.BLACK, PieceColor.RED):
+        king = attacks.king(color)
+        assert king is not None
+        assert attacks.in_check(color) == _square_under_attack(board, color, *king)
+    assert attacks.in_check(PieceColor.RED)
+
+
+def test_updates_match_a_full_rebuild() -> None:
+    board = Chessboard()
+    board.reset_board()
+    match = Match(board, num_players=2)
+    moves = [((6, 4), (5, 4)), ((1, 3), (2, 3)), ((7, 5), (3, 1)), ((0, 2), (1, 3))]
+    for start, end in moves:
+        assert match.attempt_move(start, end)
+        incremental = match._attack_maps()
+        assert incremental._counts == AttackMaps(board)._counts
+    assert match._is_in_check(PieceColor.BLACK) is False
+
+
+def test_outside_edits_trigger_rebuild() -> None:
+    board = Chessboard()
+    board.place_piece(0, 0, PieceType.KING, PieceColor.BLACK)
+    match = Match(board, num_players=2)
+    assert not match._is_in_check(PieceColor.BLACK)
+    board.place_piece(5, 0, PieceType.ROOK, PieceColor.WHITE)
+    assert match._is_in_check(PieceColor.BLACK)
@@ -0,0 +1,92 @@
+import random
+
+import numpy as np
+
+from projects.chess import Chessboard, PieceColor, PieceType
+from projects.chess.core.backend.batch import BatchBoard, piece_code
+from projects.chess.core.backend.moves import (
+    _square_under_attack,
+    generate_king_moves,
+    generate_moves,
+)
+
+
+def _random_board(rng: random.Random, pieces: int = 14) -> Chessboard:
+    board = Chessboard()
+    squares = rng.sample(range(64), pieces)
+    for square in squares:
+        piece = rng.choice(list(PieceType))
+        color = rng.choice([PieceColor.WHITE, PieceColor.BLACK])
+        board.place_piece(*divmod(square, 8), piece, color)
+    return board
+
+
+def _reference_moves(board: Chessboard, color: PieceColor) -> set:
+    moves = set()
+    for row in range(8):
+        for col in range(8):
+            piece = board.get_piece(row, col)
+            if piece is None or piece[1] != color:
+                continue
+            if piece[0] == PieceType.KING:
+                generated = generate_king_moves(board, color, row, col, False)
+            else:
+                generated = generate_moves(piece[0], board, color, row, col)
+            for move in generated:
+                moves.add(
+                    (move.start[0] * 8 + move.start[1], move.end[0] * 8 + move.end[1])
+                )
+    return moves
+
+
+def test_round_trip_through_chessboard() -> None:
+    board = Chessboard()
+    board.reset_board()
+    board.place_piece(4, 4, PieceType.QUEEN, PieceColor.RED)
+    batch = BatchBoard.from_boards([board, Chessboard()])
+    assert batch.squares.shape == (2, 8, 8)
+    assert batch.squares[0, 4, 4] == piece_code(PieceType.QUEEN, PieceColor.RED)
+    restored = batch.to_boards()
+    assert restored[0]._board == board._board
+    assert all(restored[1].is_empty(r, c) for r in range(8) for c in range(8))
+
+
+def test_batch_moves_match_per_board_generation() -> None:
+    rng = random.Random(7)
+    boards = [_random_board(rng) for _ in range(40)]
+    colors = [rng.choice([0, 1]) for _ in boards]
+    batch = BatchBoard.from_boards(boards)
+
+    moves = batch.generate_moves(np.array(colors))
+    for index, board in enumerate(boards):
+        selected = moves.board == index
+        actual = set(zip(moves.start[selected].tolist(), moves.end[selected].tolist()))
+        color = [PieceColor.WHITE, PieceColor.BLACK][colors[index]]
+        assert actual == _reference_moves(board, color)
+
+
+def test_attack_maps_match_square_under_attack() -> None:
+    rng = random.Random(11)
+    boards = [_random_board(rng, pieces=10) for _ in range(10)]
+    attacked = BatchBoard.from_boards(boards).attack_maps(PieceColor.BLACK)
+    for index, board in enumerate(boards):
+        for row in range(8):
+            for col in range(8):
+                if board.get_piece(row, col) is not None:
+                    continue
+                expected = _square_under_attack(board, PieceColor.WHITE, row, col)
+                assert attacked[index, row, col] == expected
+
+
+def test_apply_moves_steps_boards_in_lockstep() -> None:
+    board = Chessboard()
+    board.reset_board()
+    batch = BatchBoard.from_boards([board, board])
+    moves = batch.generate_moves(PieceColor.WHITE)
+    first = np.unique(moves.board, return_index=True)[1]
+    chosen = type(moves)(moves.board[first], moves.start[first], moves.end[first])
+    batch.apply_moves(chosen)
+    stepped = batch.to_board(0)
+    start, end = divmod(int(chosen.start[0]), 8), divmod(int(chosen.end[0]), 8)
+    assert stepped.is_empty(*start)
+    assert stepped.get_piece(*end) == board.get_piece(*start)
@@ -1,6 +1,6 @@
 import pytest
 
-from projects.chess import Chessboard, PieceColor, PieceType
+from projects.chess import CONFIG, Chessboard, PieceColor, PieceType
 
 
 def test_board_initially_empty():
@@ -44,3 +44,33 @@ def test_reset_board() -> None:
     assert board.get_piece(7, 3) == (PieceType.QUEEN, PieceColor.WHITE)
     assert board.get_piece(7, 4) == (PieceType.KING, PieceColor.WHITE)
     assert board.get_piece(0, 4) == (PieceType.KING, PieceColor.BLACK)
+
+
+def test_reset_board_four_players() -> None:
+    old_w, old_h = CONFIG.board_width, CONFIG.board_height
+    CONFIG.board_width = CONFIG.board_height = 14
+    try:
+        board = Chessboard()
+        board.reset_board(num_players=4)
+    finally:
+        CONFIG.board_width = old_w
+        CONFIG.board_height = old_h
+    assert board.get_piece(13, 7) == (PieceType.KING, PieceColor.WHITE)
+    assert board.get_piece(0, 7) == (PieceType.KING, PieceColor.BLACK)
+    assert board.get_piece(7, 0) == (PieceType.KING, PieceColor.RED)
+    assert board.get_piece(7, 12) == (PieceType.PAWN, PieceColor.BLUE)
+    assert board.get_piece(7, 13) == (PieceType.KING, PieceColor.BLUE)
+    assert board.is_empty(0, 0)
+    assert board.is_empty(1, 1)
+    counts = {}
+    for row in range(14):
+        for col in range(14):
+            piece = board.get_piece(row, col)
+            if piece is not None:
+                counts[piece[1]] = counts.get(piece[1], 0) + 1
+    assert counts == {color: 16 for color in PieceColor}
+
+
+def test_reset_board_four_players_needs_room() -> None:
+    with pytest.raises(ValueError):
+        Chessboard().reset_board(num_players=4)
@@ -1,3 +1,5 @@
+import pytest
+
 from projects.chess import Chessboard, Match, PieceColor, PieceType
 from projects.chess.core.backend.chessboard import Piece
 
@@ -33,3 +35,91 @@ def test_attempt_move_success_and_fail() -> None:
     assert not match.attempt_move((6, 1), (5, 1))
     assert match.current_turn == 1
     assert match.move_number == 2
+
+
+def test_mated_player_is_skipped_in_turn_order() -> None:
+    board = Chessboard()
+    board.place_piece(0, 7, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(1, 6, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 7, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(7, 0, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    board.place_piece(5, 3, PieceType.KING, PieceColor.RED)
+    board.place_piece(4, 6, PieceType.PAWN, PieceColor.RED)
+    match = Match(board, num_players=3)
+
+    assert match.attempt_move((7, 0), (0, 0))
+    assert match.eliminated == {1}
+    assert not match.is_completed
+    assert match.current_turn == 2
+    # The eliminated player's pieces leave the board and stop attacking.
+    assert board.get_piece(0, 7) is None
+    assert board.get_piece(1, 6) is None
+    assert not match._attack_maps().is_attacked(PieceColor.RED, 2, 7)
+
+    assert match.attempt_move((4, 6), (4, 7))
+    assert match.current_turn == 0
+    assert match.attempt_move((7, 4), (7, 5))
+    assert match.current_turn == 2
+
+
+_CAPTURE_LINE = [
+    ((6, 3), (5, 3)),
+    ((1, 4), (2, 4)),
+    ((5, 3), (4, 3)),
+    ((2, 4), (3, 4)),
+    ((4, 3), (3, 4)),
+]
+
+
+def _board_state(board: Chessboard) -> list:
+    return [[board.get_piece(r, c) for c in range(8)] for r in range(8)]
+
+
+def test_replay_matches_attempt_move() -> None:
+    expected_board = Chessboard()
+    expected_board.reset_board()
+    expected = Match(expected_board, num_players=2)
+    for start, end in _CAPTURE_LINE:
+        assert expected.attempt_move(start, end)
+
+    for validate in (True, False):
+        board = Chessboard()
+        board.reset_board()
+        match = Match(board, num_players=2)
+        assert match.replay(_CAPTURE_LINE, validate=validate) == len(_CAPTURE_LINE)
+        assert _board_state(board) == _board_state(expected_board)
+        assert match.captured == expected.captured
+        assert match.current_turn == expected.current_turn
+        assert match.move_number == expected.move_number
+
+
+def test_replay_rejects_illegal_move_with_ply() -> None:
+    board = Chessboard()
+    board.reset_board()
+    match = Match(board, num_players=2)
+    with pytest.raises(ValueError, match="ply 1"):
+        match.replay([((6, 0), (5, 0)), ((1, 0), (3, 0))])
+    assert board.get_piece(5, 0) == (PieceType.PAWN, PieceColor.WHITE)
+
+
+def test_trusted_replay_detects_final_mate() -> None:
+    board = Chessboard()
+    board.place_piece(0, 6, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(1, 5, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 6, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 7, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(7, 0, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    match = Match(board, num_players=2)
+    match.replay([((7, 0), (6, 0)), ((1, 5), (2, 5)), ((6, 0), (0, 0))], validate=False)
+    assert not match.is_completed
+
+    board.remove_piece(0, 0)
+    board.remove_piece(2, 5)
+    board.place_piece(1, 5, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(7, 0, PieceType.ROOK, PieceColor.WHITE)
+    match = Match(board, num_players=2)
+    match.replay([((7, 0), (0, 0))], validate=False)
+    assert match.is_completed
+    assert match.current_turn == 0
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+
 from projects.chess import MatchFacade, PieceType, PieceColor
 
 
@@ -29,3 +33,31 @@ def test_facade_reset_game():
 def test_facade_get_valid_moves_empty_square():
     facade = MatchFacade(num_players=2)
     assert facade.get_valid_moves(3, 3) == []
+
+
+def test_facade_analyze_streams_deepening_results():
+    facade = MatchFacade(num_players=2)
+
+    async def collect():
+        return [result async for result in facade.analyze(multipv=2, max_depth=2)]
+
+    results = asyncio.run(collect())
+    assert [result.depth for result in results] == [1, 2]
+    assert all(len(result.lines) == 2 for result in results)
+    assert results[-1].lines[0].score >= results[-1].lines[1].score
+
+
+def test_facade_analyze_cancellation_stops_search():
+    facade = MatchFacade(num_players=2)
+
+    async def first_result():
+        analysis = facade.analyze(multipv=1)
+        result = await analysis.__anext__()
+        await analysis.aclose()
+        return result
+
+    assert asyncio.run(first_result()).depth == 1
+    deadline = time.monotonic() + 2.0
+    while any(t.name == "MatchFacadeAnalysis" for t in threading.enumerate()):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
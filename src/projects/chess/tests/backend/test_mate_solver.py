@@ -0,0 +1,60 @@
+from projects.chess import Chessboard, Match, PieceColor, PieceType
+from projects.chess.core.backend.mate_solver import solve_mate
+from projects.chess.core.backend.search import make_move
+
+
+def _back_rank() -> Chessboard:
+    board = Chessboard()
+    board.place_piece(0, 6, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(1, 5, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 6, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 7, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(7, 0, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    return board
+
+
+def _rook_ladder() -> Chessboard:
+    board = Chessboard()
+    board.place_piece(0, 4, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(7, 0, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(6, 7, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    return board
+
+
+def _snapshot(board: Chessboard) -> list:
+    return [[board.get_piece(r, c) for c in range(8)] for r in range(8)]
+
+
+def test_solves_mate_in_one() -> None:
+    result = solve_mate(_back_rank(), PieceColor.WHITE, 2)
+    assert result.proven is True
+    assert result.mate_in == 1
+    assert [(m.start, m.end) for m in result.line] == [((7, 0), (0, 0))]
+
+
+def test_returns_full_forcing_line_and_restores_board() -> None:
+    board = _rook_ladder()
+    before = _snapshot(board)
+    result = solve_mate(board, PieceColor.WHITE, 3)
+    assert result.proven is True
+    assert result.mate_in == 2
+    assert len(result.line) == 3
+    assert _snapshot(board) == before
+
+    for move in result.line:
+        make_move(board, move)
+    assert Match(board, num_players=2)._is_checkmate(PieceColor.BLACK)
+
+
+def test_refutes_when_no_mate_exists() -> None:
+    result = solve_mate(_rook_ladder(), PieceColor.BLACK, 2)
+    assert result.proven is False
+    assert result.line == []
+
+
+def test_node_limit_returns_unknown() -> None:
+    result = solve_mate(_rook_ladder(), PieceColor.WHITE, 3, max_nodes=5)
+    assert result.proven is None
+    assert result.nodes == 5
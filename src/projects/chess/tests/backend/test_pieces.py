@@ -62,6 +62,15 @@ def test_pawn_capture() -> None:
     assert capture.captures == [(3, 3)]
 
 
+def test_side_pawns_advance_across_files() -> None:
+    board = Chessboard()
+    board.place_piece(3, 5, PieceType.PAWN, PieceColor.BLACK)
+    red_moves = Pawn(PieceColor.RED, board).possible_moves(4, 4)
+    assert {m.end for m in red_moves} == {(4, 5), (3, 5)}
+    blue_moves = Pawn(PieceColor.BLUE, board).possible_moves(4, 4)
+    assert {m.end for m in blue_moves} == {(4, 3)}
+
+
 def test_pawn_blocked() -> None:
     board = Chessboard()
     pawn = Pawn(PieceColor.WHITE, board)
@@ -0,0 +1,64 @@
+import threading
+
+from projects.chess import Chessboard, Match, PieceColor, PieceType
+from projects.chess.core.backend.search import (
+    Searcher,
+    legal_moves,
+    make_move,
+    unmake_move,
+)
+
+
+def _mate_in_one() -> Match:
+    board = Chessboard()
+    board.place_piece(0, 6, PieceType.KING, PieceColor.BLACK)
+    board.place_piece(1, 5, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 6, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(1, 7, PieceType.PAWN, PieceColor.BLACK)
+    board.place_piece(7, 0, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    return Match(board, num_players=2)
+
+
+def test_make_and_unmake_restore_board() -> None:
+    board = Chessboard()
+    board.reset_board()
+    before = [[board.get_piece(r, c) for c in range(8)] for r in range(8)]
+    for move in legal_moves(board, PieceColor.WHITE):
+        undo = make_move(board, move)
+        unmake_move(board, undo)
+    after = [[board.get_piece(r, c) for c in range(8)] for r in range(8)]
+    assert before == after
+
+
+def test_legal_moves_respect_pins() -> None:
+    board = Chessboard()
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    board.place_piece(6, 4, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(0, 4, PieceType.ROOK, PieceColor.BLACK)
+    rook_moves = [m for m in legal_moves(board, PieceColor.WHITE) if m.start == (6, 4)]
+    assert rook_moves
+    assert all(move.end[1] == 4 for move in rook_moves)
+
+
+def test_search_finds_mate_in_one() -> None:
+    results = list(Searcher(_mate_in_one()).iterate(3))
+    best = results[-1].best
+    assert best.mate_in == 1
+    assert (best.moves[0].start, best.moves[0].end) == ((7, 0), (0, 0))
+
+
+def test_search_reports_requested_number_of_lines() -> None:
+    match = Match(Chessboard(), num_players=2)
+    match.board.reset_board()
+    result = next(Searcher(match).iterate(1, multipv=3))
+    assert result.depth == 1
+    assert len(result.lines) == 3
+    scores = [line.score for line in result.lines]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_stopped_search_yields_nothing() -> None:
+    stop = threading.Event()
+    stop.set()
+    assert list(Searcher(_mate_in_one()).iterate(3, stop=stop)) == []
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from projects.chess.core.backend.chessboard import Chessboard
+from projects.chess.core.backend.pieces import PieceColor, PieceType
+from projects.chess.core.training_export import (
+    GameRecord,
+    TrainingDataset,
+    _encode_position,
+    read_uci_games,
+)
+
+# e2e3 e7e6 d1g4
+_OPENING = [((6, 4), (5, 4)), ((1, 4), (2, 4)), ((7, 3), (4, 6))]
+
+
+def test_append_writes_planes_masks_and_outcomes(tmp_path) -> None:
+    dataset = TrainingDataset.create(tmp_path / "data", capacity=10)
+    written = dataset.append_games([GameRecord(_OPENING, result=-1)])
+    assert written == 4
+
+    arrays = dataset.arrays()
+    assert arrays["planes"].shape == (10, 12, 8, 8)
+    start = arrays["planes"][0]
+    assert start.sum() == 32
+    # White pawn plane (color 0, pawn type 0) covers the seventh row.
+    assert start[0, 6].tolist() == [1] * 8
+    assert arrays["side_to_move"][:4].tolist() == [0, 1, 0, 1]
+    assert arrays["outcome"][:4].tolist() == [-1, -1, -1, -1]
+    # Destination squares are bit-packed, 64 squares into 8 bytes.
+    assert arrays["legal_moves"].shape == (10, 64, 8)
+    legal = dataset.legal_moves(0)
+    # Eight single-step pawn moves and four knight moves.
+    assert legal.shape == (64, 64)
+    assert legal.sum() == 12
+    assert legal[6 * 8 + 4, 5 * 8 + 4] == 1
+
+
+def test_append_continues_across_runs(tmp_path) -> None:
+    TrainingDataset.create(tmp_path, capacity=6).append_games([GameRecord(_OPENING)])
+    reopened = TrainingDataset(tmp_path)
+    assert reopened.count == 4
+    reopened.append_games([GameRecord(_OPENING[:1], result=1)])
+    assert TrainingDataset(tmp_path).count == 6
+    assert reopened.arrays()["outcome"][4:6].tolist() == [1, 1]
+    with pytest.raises(ValueError):
+        reopened.append_games([GameRecord()])
+
+
+def test_process_pool_matches_serial_export(tmp_path) -> None:
+    games = [GameRecord(_OPENING[: n % 4], result=n % 3 - 1) for n in range(9)]
+    serial = TrainingDataset.create(tmp_path / "serial", capacity=40)
+    parallel = TrainingDataset.create(tmp_path / "parallel", capacity=40)
+    assert serial.append_games(games) == parallel.append_games(
+        games, processes=2, chunk_size=2
+    )
+    for name, array in serial.arrays().items():
+        np.testing.assert_array_equal(array, parallel.arrays()[name])
+
+
+def test_read_uci_games(tmp_path) -> None:
+    path = tmp_path / "games.txt"
+    path.write_text("# archive\ne2e3 e7e6 d1g4 1-0\n\ne2e3 *\n")
+    games = list(read_uci_games(path))
+    assert games[0] == GameRecord(_OPENING, result=1)
+    assert games[1] == GameRecord(_OPENING[:1], result=None)
+
+
+def test_illegal_moves_are_rejected(tmp_path) -> None:
+    dataset = TrainingDataset.create(tmp_path, capacity=4)
+    with pytest.raises(ValueError):
+        dataset.append_games([GameRecord([((6, 4), (3, 4))])])
+    assert TrainingDataset(tmp_path).count == 0
+
+
+def test_legal_mask_holds_pseudo_legal_moves() -> None:
+    board = Chessboard()
+    board.place_piece(7, 4, PieceType.KING, PieceColor.WHITE)
+    board.place_piece(6, 4, PieceType.ROOK, PieceColor.WHITE)
+    board.place_piece(0, 4, PieceType.ROOK, PieceColor.BLACK)
+    board.place_piece(0, 0, PieceType.KING, PieceColor.BLACK)
+    planes = np.zeros((12, 8, 8), dtype=np.uint8)
+    packed = np.zeros((64, 8), dtype=np.uint8)
+    colors = {PieceColor.WHITE: 0, PieceColor.BLACK: 1}
+    types = {piece: index for index, piece in enumerate(PieceType)}
+    _encode_position(board, planes, packed, PieceColor.WHITE, colors, types)
+    legal = np.unpackbits(packed, axis=-1, count=64)
+    # The pinned rook may still leave the file, as Match allows.
+    assert legal[6 * 8 + 4, 6 * 8 + 0] == 1
+    assert legal[6 * 8 + 4, 0 * 8 + 4] == 1
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from projects.chess.benchmarks import (
+    BENCHMARKS,
+    DEFAULT_BASELINE,
+    compare_results,
+    load_results,
+    main,
+    run_benchmarks,
+    save_results,
+    score_benchmarks,
+)
+
+
+def test_every_benchmark_runs() -> None:
+    results = run_benchmarks(repeat=1, min_time=0.0)
+    assert set(results) == set(BENCHMARKS)
+    assert all(seconds > 0 for seconds in results.values())
+
+
+def test_scores_are_relative_to_the_calibration_loop() -> None:
+    scores = score_benchmarks(["clone"], repeat=3, min_time=0.0)
+    seconds, score = scores["clone"]
+    assert seconds > 0 and score > 0
+
+
+def test_compare_results_flags_only_regressions() -> None:
+    baseline = {"fast": 1.0, "slow": 1.0, "stable": 1.0}
+    current = {"fast": 0.5, "slow": 1.5, "stable": 1.1, "new": 9.0}
+    assert compare_results(baseline, current, threshold=0.25) == {"slow": 1.5}
+
+
+def test_results_round_trip(tmp_path) -> None:
+    path = tmp_path / "baseline.json"
+    save_results({"clone": 0.25}, path)
+    assert load_results(path) == {"clone": 0.25}
+
+
+def test_baselines_in_seconds_are_rejected(tmp_path) -> None:
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"unit": "seconds", "results": {"clone": 3e-5}}))
+    with pytest.raises(ValueError, match="--update"):
+        load_results(path)
+
+
+def test_committed_baseline_covers_every_benchmark() -> None:
+    assert set(load_results(DEFAULT_BASELINE)) == set(BENCHMARKS)
+
+
+def test_main_fails_on_regression(tmp_path) -> None:
+    path = tmp_path / "baseline.json"
+    save_results({"clone": 1e-12}, path)
+    args = ["clone", "--baseline", str(path), "--repeat", "1"]
+    assert main([*args, "--confirm", "0"]) == 1
+    assert main([*args, "--update"]) == 0
+    assert load_results(path)["clone"] > 1e-12
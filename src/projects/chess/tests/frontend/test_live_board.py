@@ -0,0 +1,91 @@
+import io
+import re
+
+import pytest
+
+from projects.chess import Chessboard, Match, draw_board
+from projects.chess.frontend.live_board import LiveBoardBroadcaster, LiveBoardRenderer
+
+_ESCAPE = re.compile(r"\x1b\[(\d+)([ABG])")
+
+
+def _apply(screen: list, row: int, text: str) -> int:
+    """Apply ``text`` to ``screen`` starting at ``row`` and return the new row."""
+    col = 0
+    pos = 0
+    while pos < len(text):
+        match = _ESCAPE.match(text, pos)
+        if match:
+            amount, code = int(match.group(1)), match.group(2)
+            if code == "A":
+                row -= amount
+            elif code == "B":
+                row += amount
+            else:
+                col = amount - 1
+            pos = match.end()
+            continue
+        char = text[pos]
+        pos += 1
+        if char == "\n":
+            row, col = row + 1, 0
+            continue
+        while len(screen) <= row:
+            screen.append([])
+        line = screen[row]
+        while len(line) <= col:
+            line.append(" ")
+        line[col] = char
+        col += 1
+    return row
+
+
+def _render(screen: list) -> str:
+    return "".join("".join(line) + "\n" for line in screen)
+
+
+@pytest.mark.parametrize("with_coords", [False, True])
+@pytest.mark.parametrize("invert", [False, True])
+def test_updates_reproduce_full_frame(with_coords: bool, invert: bool) -> None:
+    board = Chessboard()
+    board.reset_board()
+    match = Match(board, num_players=2)
+    renderer = LiveBoardRenderer(with_coords=with_coords, invert=invert)
+
+    screen: list = []
+    row = _apply(screen, 0, renderer.update(board))
+    for start, end in [((6, 3), (5, 3)), ((0, 1), (2, 2)), ((7, 2), (2, 7))]:
+        assert match.attempt_move(start, end)
+        update = renderer.update(board)
+        assert len(update) < 60
+        row = _apply(screen, row, update)
+        expected = draw_board(board, with_coords=with_coords, invert=invert)
+        assert _render(screen) == expected
+        assert row == expected.count("\n")
+
+
+def test_unchanged_board_emits_nothing() -> None:
+    board = Chessboard()
+    renderer = LiveBoardRenderer()
+    assert renderer.update(board) == draw_board(board)
+    assert renderer.update(board) == ""
+    renderer.reset()
+    assert renderer.update(board) == draw_board(board)
+
+
+def test_broadcaster_shares_updates_with_spectators() -> None:
+    board = Chessboard()
+    board.reset_board()
+    broadcaster = LiveBoardBroadcaster()
+    early = io.StringIO()
+    broadcaster.add(early)
+    broadcaster.publish(board)
+
+    late = io.StringIO()
+    broadcaster.add(late)
+    assert late.getvalue() == early.getvalue() == draw_board(board)
+
+    board.remove_piece(6, 0)
+    update = broadcaster.publish(board)
+    assert early.getvalue().endswith(update)
+    assert late.getvalue().endswith(update)
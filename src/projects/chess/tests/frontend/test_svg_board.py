@@ -0,0 +1,53 @@
+import io
+import re
+
+from projects.chess import Chessboard, PieceColor, PieceType
+from projects.chess.frontend.svg_board import (
+    iter_svg,
+    render_svg,
+    save_html,
+    save_svg_boards,
+)
+
+
+def _starting_board() -> Chessboard:
+    board = Chessboard()
+    board.reset_board()
+    return board
+
+
+def test_render_svg_contains_one_overlay_per_piece() -> None:
+    svg = render_svg(_starting_board())
+    assert svg.startswith("<svg ")
+    assert svg.count('class="chess-white"') == 16
+    assert svg.count('class="chess-black"') == 16
+    assert svg.count("<symbol") == 7
+
+
+def test_render_svg_supports_red_and_blue_and_invert() -> None:
+    board = Chessboard()
+    board.place_piece(0, 0, PieceType.KING, PieceColor.RED)
+    board.place_piece(7, 7, PieceType.QUEEN, PieceColor.BLUE)
+    svg = render_svg(board, invert=True, with_coords=True)
+    assert re.search(r'href="#chess-king" x="335" y="315"[^>]*chess-red', svg)
+    assert re.search(r'href="#chess-queen" x="20" y="0"[^>]*chess-blue', svg)
+    assert "?" not in svg
+
+
+def test_save_html_defines_templates_once() -> None:
+    boards = [_starting_board() for _ in range(3)]
+    out = io.StringIO()
+    assert save_html(boards, out, title="Report") == 3
+    page = out.getvalue()
+    assert page.count("<figure>") == 3
+    assert page.count('<symbol id="chess-king"') == 1
+    assert page.count('<symbol id="chess-frame-8x8"') == 1
+    assert "<title>Report</title>" in page
+
+
+def test_save_svg_boards_writes_each_board(tmp_path) -> None:
+    boards = [_starting_board(), Chessboard()]
+    assert save_svg_boards(boards, tmp_path) == 2
+    files = sorted(tmp_path.iterdir())
+    assert [f.name for f in files] == ["board_00000.svg", "board_00001.svg"]
+    assert files[1].read_text() == next(iter_svg([Chessboard()]))
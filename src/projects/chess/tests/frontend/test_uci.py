@@ -0,0 +1,93 @@
+import queue
+import time
+
+import pytest
+
+from projects.chess import PieceMove
+from projects.chess.frontend.uci import UciEngine, move_name, parse_move
+
+
+class _LineSink:
+    """File-like object collecting written lines into a queue."""
+
+    def __init__(self) -> None:
+        self.lines: "queue.Queue[str]" = queue.Queue()
+
+    def write(self, text: str) -> None:
+        for line in text.splitlines():
+            self.lines.put(line)
+
+    def flush(self) -> None:
+        pass
+
+    def wait_for(self, prefix: str, timeout: float = 10.0) -> str:
+        deadline = time.monotonic() + timeout
+        while True:
+            line = self.lines.get(timeout=max(deadline - time.monotonic(), 0.01))
+            if line.startswith(prefix):
+                return line
+
+
+def _engine() -> "tuple[UciEngine, _LineSink]":
+    sink = _LineSink()
+    return UciEngine(sink), sink
+
+
+def test_move_notation_round_trip() -> None:
+    assert parse_move(8, "e2e4") == ((6, 4), (4, 4))
+    assert move_name(8, PieceMove(start=(6, 4), end=(4, 4))) == "e2e4"
+    with pytest.raises(ValueError):
+        parse_move(8, "e2")
+
+
+def test_handshake_and_quit() -> None:
+    engine, sink = _engine()
+    assert engine.handle("uci")
+    assert sink.wait_for("uciok") == "uciok"
+    assert engine.handle("isready")
+    assert sink.wait_for("readyok") == "readyok"
+    assert not engine.handle("quit")
+
+
+def test_position_and_depth_limited_go() -> None:
+    engine, sink = _engine()
+    engine.handle("position startpos moves e2e3")
+    assert engine.facade.get_current_turn() == 1
+    engine.handle("go depth 1")
+    best = sink.wait_for("bestmove").split()[1]
+    start, _ = parse_move(8, best)
+    assert engine.facade.board.get_piece(*start)[1].value == "black"
+
+
+def test_go_ignores_malformed_limits() -> None:
+    engine, sink = _engine()
+    engine.handle("position startpos")
+    engine.handle("go depth x movetime")
+    assert (
+        sink.wait_for("info string") == "info string ignoring go depth without a number"
+    )
+    assert sink.wait_for("info string").endswith("go movetime without a number")
+    assert sink.wait_for("bestmove").startswith("bestmove ")
+    assert engine.handle("isready")
+
+
+def test_infinite_search_waits_for_stop() -> None:
+    engine, sink = _engine()
+    engine.handle("position startpos")
+    engine.handle("go infinite")
+    sink.wait_for("info depth 1")
+    engine.handle("isready")
+    assert sink.wait_for("readyok") == "readyok"
+    engine.handle("stop")
+    assert sink.wait_for("bestmove", timeout=1.0).startswith("bestmove ")
+
+
+def test_ponder_reports_only_after_ponderhit() -> None:
+    engine, sink = _engine()
+    engine.handle("position startpos moves e2e3")
+    engine.handle("go ponder depth 1")
+    sink.wait_for("info depth 1")
+    with pytest.raises(queue.Empty):
+        sink.wait_for("bestmove", timeout=0.2)
+    engine.handle("ponderhit")
+    assert sink.wait_for("bestmove", timeout=1.0).startswith("bestmove ")
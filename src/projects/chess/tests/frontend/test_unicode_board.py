@@ -4,6 +4,8 @@ from projects.chess import (
     Chessboard,
     Match,
     CONFIG,
+    PieceColor,
+    PieceType,
     draw_board,
     draw_board_inverted,
     draw_empty_board,
@@ -56,6 +58,16 @@ def test_unicode_board_structure() -> None:
     assert draw_empty_board(width=2, height=2) == expected
 
 
+def test_side_colors_are_tinted() -> None:
+    board = Chessboard()
+    board.place_piece(0, 0, PieceType.KING, PieceColor.RED)
+    board.place_piece(0, 1, PieceType.PAWN, PieceColor.BLUE)
+    text = draw_board(board)
+    assert "\x1b[31m♚\x1b[0m" in text
+    assert "\x1b[34m♟\x1b[0m" in text
+    assert "?" not in text
+
+
 def test_board_after_pawn_and_knight_moves() -> None:
     """Regression test for board state after pawn and knight moves."""
     board = Chessboard()
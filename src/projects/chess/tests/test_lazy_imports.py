@@ -0,0 +1,66 @@
+"""Import-time checks for the lazily loaded ``projects.chess`` package."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import projects.chess
+
+SRC_DIR = Path(__file__).resolve().parents[3]
+
+# Cumulative microseconds ``python -X importtime`` may report for the package.
+IMPORT_BUDGET_US = 50_000
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])
+    )
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def test_import_does_not_load_submodules() -> None:
+    result = _run(
+        "import logging, sys, projects.chess\n"
+        "print(sorted(m for m in sys.modules if m.startswith('projects.chess.')))\n"
+        "print(len(logging.getLogger('projects.chess').handlers))"
+    )
+    loaded, handlers = result.stdout.splitlines()
+    assert loaded == "[]"
+    assert handlers == "0"
+
+
+def test_import_time_within_budget() -> None:
+    result = _run("import projects.chess", "-X", "importtime")
+    line = next(
+        line for line in result.stderr.splitlines() if line.endswith("projects.chess")
+    )
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < IMPORT_BUDGET_US
+
+
+def test_exports_resolve_on_first_use() -> None:
+    for name in projects.chess.__all__:
+        assert getattr(projects.chess, name) is not None
+        assert name in dir(projects.chess)
+    from projects.chess.utils.log import logger
+
+    assert projects.chess.logger is logger
+
+
+def test_config_import_does_not_install_log_handler() -> None:
+    result = _run(
+        "import logging, projects.chess.utils.config\n"
+        "print(len(logging.getLogger('projects.chess').handlers))\n"
+        "from projects.chess.utils import logger\n"
+        "print(type(logger).__name__, len(logger.handlers))"
+    )
+    assert result.stdout.splitlines() == ["0", "Logger 1"]
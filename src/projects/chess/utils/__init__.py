@@ -1,5 +1,13 @@
-from .config import CONFIG, Config, configure
-from .logger import logger
+from ..._lazy import attach
+
+# The logger lives in ``.log`` rather than a ``.logger`` submodule, whose import
+# would bind the module object over the lazily resolved ``logger`` attribute.
+_EXPORTS = {
+    "CONFIG": ".config",
+    "Config": ".config",
+    "configure": ".config",
+    "logger": ".log",
+}
 
 __all__ = [
     "CONFIG",
@@ -7,3 +15,10 @@ __all__ = [
     "configure",
     "logger",
 ]
+
+__getattr__, __dir__ = attach(__name__, attributes=_EXPORTS)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from .config import CONFIG, Config, configure
+    from .log import logger
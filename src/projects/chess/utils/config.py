@@ -18,6 +18,6 @@ def configure(config: Config) -> None:
     """Set global configuration and update logger level."""
     global CONFIG
     CONFIG = config
-    from .logger import logger
+    from .log import logger
 
     logger.setLevel(config.log_level)
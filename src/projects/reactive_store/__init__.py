@@ -3,23 +3,122 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import heapq
 import inspect
+import itertools
 import logging
 import os
+import pickle
 import queue
 import re
 import threading
 import time
 import uuid
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
-__all__ = ["ReactiveStore", "Event", "SubscriptionId"]
+from ._persistent import EMPTY_MAP, KeyTrie, PersistentMap
+from .snapshot_file import SnapshotImage, write_snapshot
+from .wal import WriteAheadLog, encode_record, read_log
+
+__all__ = [
+    "ReactiveStore",
+    "Event",
+    "SubscriptionId",
+    "Transaction",
+    "DispatchStats",
+    "SubscriptionStats",
+    "DeadLetterHandler",
+    "OVERFLOW_POLICIES",
+    "BATCH_ROOT",
+    "PathKey",
+    "Snapshot",
+]
 
 SubscriptionId = str
 
+# What a full subscription queue does with a new event: wait for space, evict
+# the oldest queued event, discard the new event, or replace the queued event
+# for the same path (evicting the oldest if there is none).
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+# ``Event.path`` of a batch whose changes share no leading path segment.
+BATCH_ROOT = "*"
+
 _PATH_SEGMENT_RE = re.compile(r"^[A-Za-z0-9_]+$")
-_MISSING = object()
+_ABSENT = object()
+# Marks a key of a loaded snapshot file that was deleted afterwards.
+_DELETED = object()
+# Number of distinct plain-string paths whose validation is remembered.
+_PATH_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_PATH_CACHE_SIZE)
+def _checked_path(path: str) -> str:
+    if not path:
+        raise ValueError("Path must be a non-empty string")
+    segments = path.split(".")
+    if any(not _PATH_SEGMENT_RE.fullmatch(segment) for segment in segments):
+        raise ValueError(f"Invalid path: {path!r}")
+    return path
+
+
+class PathKey:
+    """A validated store path with its segments split and hash cached.
+
+    Create one with ``ReactiveStore.key`` and pass it wherever a path is
+    accepted to skip validation on every call.
+    """
+
+    __slots__ = ("path", "segments", "_hash")
+
+    path: str
+    segments: Tuple[str, ...]
+
+    def __init__(self, path: str) -> None:
+        if not isinstance(path, str):
+            raise ValueError("Path must be a non-empty string")
+        path = _checked_path(str(path))
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "segments", tuple(path.split(".")))
+        object.__setattr__(self, "_hash", hash((PathKey, path)))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PathKey is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PathKey):
+            return self.path == other.path
+        return NotImplemented
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (PathKey, (self.path,))
+
+    def __repr__(self) -> str:
+        return f"PathKey({self.path!r})"
+
+    def __str__(self) -> str:
+        return self.path
 
 
 @dataclass(frozen=True)
@@ -32,6 +131,35 @@ class Event:
     timestamp: float = 0.0
     version: int = 0
     origin: Dict[str, int] | None = None
+    changes: Tuple["Event", ...] = ()
+
+
+@dataclass(frozen=True)
+class DispatchStats:
+    """Counters describing event delivery since the store was created."""
+
+    delivered: int = 0
+    failures: int = 0
+    retries: int = 0
+    dead_letters: int = 0
+    pending_retries: int = 0
+    queued: int = 0
+    dropped: int = 0
+    conflated: int = 0
+
+
+@dataclass(frozen=True)
+class SubscriptionStats:
+    """Queue state of a single subscription."""
+
+    queued: int
+    dropped: int
+    capacity: Optional[int]
+    overflow: str
+    conflated: int = 0
+
+
+DeadLetterHandler = Callable[[Event, SubscriptionId, BaseException], Any]
 
 
 @dataclass
@@ -41,6 +169,8 @@ class _Subscription:
     match_exact: bool
     prefix: Optional[str]
     retry_on_error: bool
+    mailbox: _Mailbox
+    shard: int = 0
 
     def matches(self, path: str) -> bool:
         if self.match_exact:
@@ -50,6 +180,99 @@ class _Subscription:
         return path.startswith(self.prefix)
 
 
+class _IndexNode:
+    __slots__ = ("children", "exact", "descendants")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _IndexNode] = {}
+        self.exact: Dict[SubscriptionId, _Subscription] = {}
+        self.descendants: Dict[SubscriptionId, _Subscription] = {}
+
+
+class _SubscriptionIndex:
+    """Trie of subscriptions keyed by selector segments.
+
+    Exact selectors live in the ``exact`` bucket of their node, ``"a.*"``
+    selectors in the ``descendants`` bucket of node ``a`` and ``"*"`` in the
+    root's ``descendants`` bucket. Finding the subscribers of a path only
+    walks that path's segments.
+    """
+
+    def __init__(self) -> None:
+        self._root = _IndexNode()
+        self._entries: Dict[SubscriptionId, Tuple[int, _Subscription]] = {}
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, subscription_id: SubscriptionId, subscription: _Subscription) -> None:
+        node = self._root
+        for segment in self._segments(subscription):
+            node = node.children.setdefault(segment, _IndexNode())
+        self._bucket(node, subscription)[subscription_id] = subscription
+        self._counter += 1
+        self._entries[subscription_id] = (self._counter, subscription)
+
+    def remove(self, subscription_id: SubscriptionId) -> Optional[_Subscription]:
+        entry = self._entries.pop(subscription_id, None)
+        if entry is None:
+            return None
+        subscription = entry[1]
+        path = [self._root]
+        segments = self._segments(subscription)
+        for segment in segments:
+            path.append(path[-1].children[segment])
+        del self._bucket(path[-1], subscription)[subscription_id]
+        # Drop nodes that no longer lead to any subscription.
+        while len(path) > 1:
+            node = path.pop()
+            if node.children or node.exact or node.descendants:
+                break
+            del path[-1].children[segments[len(path) - 1]]
+        return subscription
+
+    def match(self, path: str) -> List[Tuple[SubscriptionId, _Subscription]]:
+        """Return subscribers of ``path`` in subscription order."""
+        node = self._root
+        found: List[Tuple[SubscriptionId, _Subscription]] = list(
+            node.descendants.items()
+        )
+        segments = path.split(".")
+        last = len(segments) - 1
+        for index, segment in enumerate(segments):
+            child = node.children.get(segment)
+            if child is None:
+                break
+            node = child
+            found.extend((node.exact if index == last else node.descendants).items())
+        if len(found) > 1:
+            entries = self._entries
+            found.sort(key=lambda item: entries[item[0]][0])
+        return found
+
+    def get(self, subscription_id: SubscriptionId) -> Optional[_Subscription]:
+        entry = self._entries.get(subscription_id)
+        return None if entry is None else entry[1]
+
+    def subscriptions(self) -> List[_Subscription]:
+        return [subscription for _, subscription in self._entries.values()]
+
+    @staticmethod
+    def _segments(subscription: _Subscription) -> List[str]:
+        if subscription.match_exact:
+            return subscription.selector.split(".")
+        if subscription.prefix is None:
+            return []
+        return subscription.prefix[:-1].split(".")
+
+    @staticmethod
+    def _bucket(
+        node: _IndexNode, subscription: _Subscription
+    ) -> Dict[SubscriptionId, _Subscription]:
+        return node.exact if subscription.match_exact else node.descendants
+
+
 @dataclass
 class _QueuedEvent:
     event: Event
@@ -59,8 +282,506 @@ class _QueuedEvent:
     delay: float = 0.0
 
 
+class _Mailbox:
+    """Bounded queue of one subscription's pending events.
+
+    The worker only sees the mailbox itself: it is put on the shard queue
+    when it becomes non-empty and re-queued after each delivery while events
+    remain, so a subscription never has more than one entry on its shard.
+    A delivery lasts from :meth:`take` to :meth:`done`, which for an async
+    callback is when its awaitable finishes. A failed delivery instead ends
+    with :meth:`hold`, and the mailbox waits on the timer heap.
+    """
+
+    def __init__(self, capacity: Optional[int], overflow: str) -> None:
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped = 0
+        self.conflated = 0
+        self._events: Deque[_QueuedEvent] = deque()
+        self._cond = threading.Condition()
+        self._scheduled = False
+        self._closed = False
+        # Retried events put back by ``hold``; ``discard_held`` drops them.
+        self._held: List[_QueuedEvent] = []
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._events)
+
+    def offer(self, queued: _QueuedEvent, *, may_block: bool) -> bool:
+        """Queue ``queued`` and return ``True`` if the mailbox needs scheduling."""
+        with self._cond:
+            events = self._events
+            while (
+                self.capacity is not None
+                and len(events) >= self.capacity
+                and not self._closed
+            ):
+                if self.overflow == "block":
+                    if may_block:
+                        self._cond.wait()
+                        continue
+                    # A callback is writing; waiting for the mailbox to
+                    # drain could deadlock the workers.
+                    break
+                self.dropped += 1
+                if self.overflow == "drop_newest":
+                    return False
+                if self.overflow == "coalesce":
+                    path = queued.event.path
+                    for index, pending in enumerate(events):
+                        if pending.event.path == path:
+                            events[index] = queued
+                            return False
+                events.popleft()
+                break
+            if self._closed:
+                return False
+            events.append(queued)
+            if self._scheduled:
+                return False
+            self._scheduled = True
+            return True
+
+    def take(self) -> Optional[_QueuedEvent]:
+        """Pop the next event; the mailbox stays scheduled until :meth:`done`."""
+        with self._cond:
+            queued = self._events.popleft() if self._events else None
+            self._cond.notify()
+            return queued
+
+    def done(self) -> bool:
+        """End the current delivery and return ``True`` if events remain.
+
+        The caller must then put the mailbox back on its shard.
+        """
+        with self._cond:
+            more = len(self) > 0
+            self._scheduled = more
+            return more
+
+    def hold(self, retry: _QueuedEvent) -> None:
+        """End a failed delivery by putting ``retry`` ahead of later events.
+
+        The mailbox stays scheduled, so it is not queued again until the
+        shard's timer heap hands it back.
+        """
+        with self._cond:
+            self._events.appendleft(retry)
+            self._held = [retry]
+
+    def discard_held(self) -> bool:
+        """Drop the held retry unless it was evicted; ``True`` if events remain."""
+        with self._cond:
+            if self._held and self._events and self._events[0] is self._held[0]:
+                self._events.popleft()
+            self._held = []
+        return self.done()
+
+    def close(self) -> None:
+        """Reject further events and release blocked writers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class _ConflatingMailbox(_Mailbox):
+    """Mailbox that keeps only the latest pending event for each path.
+
+    A path keeps its place in line when it is overwritten, so hot keys cannot
+    starve the others. Batch events are split into their changes. With
+    ``batch`` every pending path is delivered together as one ``batch``
+    event; otherwise the latest events are delivered one at a time.
+    """
+
+    def __init__(self, batch: bool) -> None:
+        super().__init__(None, "coalesce")
+        self.batch = batch
+        self._latest: "OrderedDict[str, _QueuedEvent]" = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._latest)
+
+    def offer(self, queued: _QueuedEvent, *, may_block: bool) -> bool:
+        with self._cond:
+            if self._closed:
+                return False
+            latest = self._latest
+            for event in queued.event.changes or (queued.event,):
+                if event.path in latest:
+                    self.conflated += 1
+                latest[event.path] = _QueuedEvent(
+                    event=event,
+                    subscription_id=queued.subscription_id,
+                    subscription=queued.subscription,
+                    delay=queued.delay,
+                )
+            if self._scheduled:
+                return False
+            self._scheduled = True
+            return True
+
+    def take(self) -> Optional[_QueuedEvent]:
+        with self._cond:
+            latest = self._latest
+            if not latest:
+                return None
+            if self.batch:
+                pending = list(latest.values())
+                latest.clear()
+                return _conflated_batch(pending)
+            return latest.popitem(last=False)[1]
+
+    def hold(self, retry: _QueuedEvent) -> None:
+        # Put the failed paths back first unless newer events replaced them.
+        with self._cond:
+            latest = self._latest
+            held = []
+            for event in reversed(retry.event.changes or (retry.event,)):
+                if event.path in latest:
+                    continue
+                latest[event.path] = _QueuedEvent(
+                    event=event,
+                    subscription_id=retry.subscription_id,
+                    subscription=retry.subscription,
+                    attempt=retry.attempt,
+                    delay=retry.delay,
+                )
+                latest.move_to_end(event.path, last=False)
+                held.append(latest[event.path])
+            self._held = held
+
+    def discard_held(self) -> bool:
+        with self._cond:
+            latest = self._latest
+            for queued in self._held:
+                if latest.get(queued.event.path) is queued:
+                    del latest[queued.event.path]
+            self._held = []
+        return self.done()
+
+
+def _conflated_batch(pending: List[_QueuedEvent]) -> _QueuedEvent:
+    changes = tuple(queued.event for queued in pending)
+    last = max(changes, key=lambda event: event.version)
+    first = pending[0]
+    return _QueuedEvent(
+        event=Event(
+            type="batch",
+            path=_common_prefix([event.path for event in changes]),
+            timestamp=last.timestamp,
+            version=last.version,
+            origin=last.origin,
+            changes=changes,
+        ),
+        subscription_id=first.subscription_id,
+        subscription=first.subscription,
+        # Keep the backoff of paths put back after a failed delivery.
+        attempt=max(queued.attempt for queued in pending),
+        delay=max(queued.delay for queued in pending),
+    )
+
+
+_WAKE = object()
+
+
+class _Shard:
+    """Dispatch queue for one worker plus a heap of delayed retries.
+
+    Retries wait in the heap until they are due instead of sleeping on the
+    worker, so backoff never holds up other subscriptions on the shard. A
+    subscription's mailbox waits there with its retry at the front, so the
+    subscription's later events stay behind the retry.
+    """
+
+    def __init__(self) -> None:
+        self.queue: "queue.Queue[object]" = queue.Queue()
+        self._retries: List[Tuple[float, int, _Mailbox]] = []
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        # Awaitables started by this shard's worker that have not finished.
+        self._running_async = 0
+
+    def put(self, item: Optional[_Mailbox]) -> None:
+        self.queue.put(item)
+
+    def schedule(self, item: _Mailbox, due: float) -> None:
+        with self._lock:
+            heapq.heappush(self._retries, (due, next(self._counter), item))
+            earliest = self._retries[0][2] is item
+        if earliest:
+            # Wake the worker so it shortens its wait to the new due time.
+            self.queue.put(_WAKE)
+
+    def pending_retries(self) -> int:
+        with self._lock:
+            return len(self._retries)
+
+    def start_async(self) -> None:
+        with self._lock:
+            self._running_async += 1
+
+    def finish_async(self) -> None:
+        with self._lock:
+            self._running_async -= 1
+        # Wake a draining worker that waits for the awaitable.
+        self.queue.put(_WAKE)
+
+    def next_item(self) -> Optional[_Mailbox]:
+        """Block until a retry is due or a mailbox is ready; ``None`` stops."""
+        while True:
+            with self._lock:
+                timeout = None
+                if self._retries:
+                    timeout = self._retries[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        return heapq.heappop(self._retries)[2]
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if item is not _WAKE:
+                return item  # type: ignore[return-value]
+
+    def drain(self, stop: threading.Event) -> Iterator[_Mailbox]:
+        """Yield queued items until none are left and no awaitable is running.
+
+        Mailboxes come back when their awaitables finish, so the queue is
+        only empty for good once nothing runs. Retries that are not due yet
+        are dropped, and the rest of their mailboxes delivered. Returns early
+        once ``stop`` is set.
+        """
+        while not stop.is_set():
+            # Read the count first: a finishing awaitable re-queues its
+            # mailbox before it decrements the count.
+            with self._lock:
+                running = self._running_async > 0
+            try:
+                item = self.queue.get(block=running, timeout=0.05)
+            except queue.Empty:
+                if running:
+                    continue
+                with self._lock:
+                    held = [entry[2] for entry in self._retries]
+                    self._retries.clear()
+                if not held:
+                    return
+                for item in held:
+                    if item.discard_held():
+                        yield item
+                continue
+            if item is not _WAKE and item is not None:
+                yield item  # type: ignore[misc]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._retries.clear()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+
+class Snapshot:
+    """Immutable point-in-time view of a ``ReactiveStore``.
+
+    Returned by ``ReactiveStore.snapshot``. Reads take no lock and never see
+    writes made after the snapshot was taken, so several keys read from one
+    snapshot are always consistent with each other.
+    """
+
+    __slots__ = ("version", "_data", "_keys", "_base", "_size")
+
+    def __init__(
+        self,
+        data: PersistentMap = EMPTY_MAP,
+        keys: KeyTrie = KeyTrie(),
+        version: int = 0,
+        base: Optional[SnapshotImage] = None,
+        size: int = 0,
+    ) -> None:
+        # ``data`` and ``keys`` hold changes made since ``base``, a loaded
+        # snapshot file, was written; deleted base keys map to ``_DELETED``.
+        self._data = data
+        self._keys = keys
+        self._base = base
+        self._size = size
+        self.version = version
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, path: str | PathKey) -> Any | None:
+        return self._lookup(_validate_path(path))
+
+    def exists(self, path: str | PathKey) -> bool:
+        return self._lookup(_validate_path(path), _ABSENT) is not _ABSENT
+
+    def get_many(self, paths: Iterable[str | PathKey]) -> Dict[str, Any]:
+        """Return ``{path: value}`` for ``paths``, with ``None`` for missing keys."""
+        return {
+            normalized: self._lookup(normalized)
+            for normalized in map(_validate_path, paths)
+        }
+
+    def list(self, prefix: str | PathKey | None = None) -> Iterable[str]:
+        normalized = (
+            None if prefix is None else _validate_selector(prefix, allow_wildcard=False)
+        )
+        return tuple(self._iter_keys(normalized))
+
+    def get_tree(self, prefix: str | PathKey | None = None) -> Dict[str, Any]:
+        """Return the values at and below ``prefix`` as nested dictionaries.
+
+        Each segment maps to its value, or to a dictionary when it has keys
+        below it. A key that has both a value and children keeps its value
+        under ``""``; the value stored at ``prefix`` itself also sits there.
+        """
+        normalized = (
+            None if prefix is None else _validate_selector(prefix, allow_wildcard=False)
+        )
+        depth = 0 if normalized is None else normalized.count(".") + 1
+        tree: Dict[str, Any] = {}
+        # Stored values may be dicts themselves, so remember which dicts are
+        # branches created here.
+        branches = {id(tree)}
+        for path in self._iter_keys(normalized):
+            segments = path.split(".")[depth:]
+            value = self._lookup(path)
+            if not segments:
+                tree[""] = value
+                continue
+            branch = tree
+            for segment in segments[:-1]:
+                child = branch.get(segment, _ABSENT)
+                if id(child) not in branches:
+                    # Keys sort before their descendants, so a parent's value
+                    # is already in place and moves under "".
+                    child = {} if child is _ABSENT else {"": child}
+                    branches.add(id(child))
+                    branch[segment] = child
+                branch = child
+            branch[segments[-1]] = value
+        return tree
+
+    def _lookup(self, path: str, default: Any = None) -> Any:
+        value = self._data.get(path, _ABSENT)
+        if value is _ABSENT:
+            if self._base is None:
+                return default
+            return self._base.get(path, default)
+        return default if value is _DELETED else value
+
+    def _iter_keys(self, prefix: Optional[str]) -> Iterable[str]:
+        """Return the keys at and below ``prefix`` sorted segment by segment."""
+        keys = self._keys.iter(prefix)
+        base = self._base
+        if base is None:
+            return keys
+        data = self._data
+        if not len(data):
+            return base.paths if prefix is None else base.iter(prefix)
+        merged = set(keys)
+        merged.update(
+            path
+            for path in (base.paths if prefix is None else base.iter(prefix))
+            if data.get(path, _ABSENT) is not _DELETED
+        )
+        # "." sorts before every segment character, so plain string order
+        # matches the segment by segment order of the trie.
+        return sorted(merged)
+
+    def _entries(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield ``(path, pickled value)`` in path order for a snapshot file."""
+        base = self._base
+        data = self._data
+        # String order is path order (see ``_iter_keys``), and sorting the
+        # keys directly is much faster than walking the trie.
+        paths = set(data.keys())
+        if base is not None:
+            paths.update(base.paths)
+        for path in sorted(paths):
+            value = data.get(path, _ABSENT)
+            if value is _ABSENT and base is not None:
+                # Copy untouched values from the loaded file without decoding.
+                yield path, base.raw(path)
+            elif value is not _DELETED:
+                yield path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class _StateBuilder:
+    """Changes to a ``Snapshot`` made by one writer while holding the lock."""
+
+    __slots__ = ("data", "keys", "base", "size")
+
+    def __init__(self, state: Snapshot) -> None:
+        self.data = state._data
+        self.keys = state._keys
+        self.base = state._base
+        self.size = state._size
+
+    def set(self, path: str, value: Any) -> None:
+        current = self.data.get(path, _ABSENT)
+        if current is _ABSENT or current is _DELETED:
+            self.keys = self.keys.add(path)
+            if current is _DELETED or self.base is None or path not in self.base:
+                self.size += 1
+        self.data = self.data.set(path, value)
+
+    def delete(self, path: str) -> bool:
+        """Remove ``path`` and return whether it existed."""
+        current = self.data.get(path, _ABSENT)
+        in_base = self.base is not None and path in self.base
+        if current is _DELETED or (current is _ABSENT and not in_base):
+            return False
+        if current is not _ABSENT:
+            self.keys = self.keys.discard(path)
+        self.data = self.data.set(path, _DELETED) if in_base else self.data.delete(path)
+        self.size -= 1
+        return True
+
+    def build(self, version: int) -> Snapshot:
+        return Snapshot(self.data, self.keys, version, self.base, self.size)
+
+
 class ReactiveStore:
-    """Thread-safe hierarchical key-value store with reactive callbacks."""
+    """Thread-safe hierarchical key-value store with reactive callbacks.
+
+    Callbacks run on ``workers`` dispatch threads. Each subscription is
+    assigned to one worker's queue, so its events are delivered in order
+    while different subscriptions are dispatched in parallel.
+
+    Pending events wait in a per-subscription queue holding at most
+    ``max_queue_size`` events (unbounded by default). When it is full the
+    ``overflow`` policy, one of :data:`OVERFLOW_POLICIES`, decides what
+    happens to the next event. Both can be overridden per subscription.
+    Subscriptions made with ``conflate`` instead keep only the latest pending
+    event for each path.
+
+    Awaitables returned by callbacks run on one long-lived event loop: the
+    ``loop`` passed in, which must be running in another thread, or a loop
+    the store starts on first use. At most ``max_concurrent_callbacks`` run
+    at once. A subscription's next event is dispatched only when its
+    previous awaitable has finished, so they complete in event order and
+    the queue limits also bound async subscribers.
+
+    Failed deliveries are retried with exponential backoff from a per-worker
+    timer heap; the subscription's later events wait behind the retry.
+    After ``max_attempts`` failed attempts, or the first failure of a
+    subscription without retries, the event is passed to ``dead_letter``.
+
+    With ``wal_path`` every change is appended to a write-ahead log, and the
+    log is replayed when a store is created with the same path. See
+    :mod:`projects.reactive_store.wal` for the ``durability`` modes. Once a
+    record cannot be written the store is read-only: later writes raise
+    ``RuntimeError`` without changing anything. Changes already visible when
+    the log failed stay applied but are lost on restart. With
+    ``snapshot_path`` the store starts from a file written by
+    :meth:`save_snapshot`, and only log records newer than it are replayed.
+    """
 
     def __init__(
         self,
@@ -68,122 +789,328 @@ class ReactiveStore:
         logger: Optional[logging.Logger] = None,
         retry_base_delay: float = 0.05,
         retry_max_delay: float = 1.0,
+        workers: int = 1,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        max_concurrent_callbacks: int = 100,
+        max_attempts: Optional[int] = None,
+        dead_letter: Optional[DeadLetterHandler] = None,
+        max_queue_size: Optional[int] = None,
+        overflow: str = "block",
+        wal_path: Optional[str] = None,
+        durability: str = "always",
+        fsync_interval: float = 0.05,
+        snapshot_path: Optional[str] = None,
     ) -> None:
-        self._data: Dict[str, Any] = {}
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_concurrent_callbacks < 1:
+            raise ValueError("max_concurrent_callbacks must be at least 1")
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        _validate_queue_options(max_queue_size, overflow)
+        # Writers serialise on ``_lock`` and publish a new immutable state by
+        # replacing ``_state``; readers use whichever state they load.
+        self._state = Snapshot()
+        if snapshot_path is not None:
+            image = SnapshotImage(snapshot_path)
+            self._state = Snapshot(version=image.version, base=image, size=len(image))
         self._lock = threading.RLock()
-        self._version = 0
-        self._subscriptions: Dict[SubscriptionId, _Subscription] = {}
-        self._queue: "queue.Queue[_QueuedEvent | None]" = queue.Queue()
+        self._wal: Optional[WriteAheadLog] = None
+        if wal_path is not None:
+            records = read_log(wal_path, after=self._state.version)
+            self._state = self._replay(self._state, records)
+            self._wal = WriteAheadLog(
+                wal_path, durability=durability, fsync_interval=fsync_interval
+            )
+        self._subscriptions = _SubscriptionIndex()
+        self._shards = [_Shard() for _ in range(workers)]
+        self._next_shard = 0
         self._stop_event = threading.Event()
         self._logger = logger or logging.getLogger(__name__)
         self._retry_base_delay = retry_base_delay
         self._retry_max_delay = retry_max_delay
-        self._worker = threading.Thread(
-            target=self._worker_loop, name="ReactiveStoreWorker", daemon=True
-        )
-        self._worker.start()
+        self._max_attempts = max_attempts
+        self._dead_letter = dead_letter
+        self._max_queue_size = max_queue_size
+        self._overflow = overflow
+        self._stats_lock = threading.Lock()
+        self._counters = {
+            "delivered": 0,
+            "failures": 0,
+            "retries": 0,
+            "dead_letters": 0,
+        }
+        self._loop = loop
+        self._owns_loop = loop is None
+        self._loop_lock = threading.Lock()
+        self._loop_thread: Optional[threading.Thread] = None
+        # Idents of the worker threads and the callback loop's thread, which
+        # never wait for space in a mailbox.
+        self._callback_threads: Set[int] = set()
+        self._async_pending: Set["concurrent.futures.Future[None]"] = set()
+        # Created on the callback loop by ``_run_async``: before Python 3.10,
+        # asyncio primitives bind to the loop current when they are built.
+        self._max_concurrent_callbacks = max_concurrent_callbacks
+        self._async_limit: Optional[asyncio.Semaphore] = None
+        self._workers = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(shard,),
+                name=f"ReactiveStoreWorker-{index}",
+                daemon=True,
+            )
+            for index, shard in enumerate(self._shards)
+        ]
+        for worker in self._workers:
+            worker.start()
 
     # ------------------------------------------------------------------
     # Public API
-    def set(self, path: str, value: Any) -> None:
-        normalized = self._validate_path(path)
-        with self._lock:
-            self._data[normalized] = value
-            event = self._build_event("set", normalized, value)
-        self._enqueue_event(event)
+    def key(self, path: str) -> PathKey:
+        """Validate ``path`` once and return a reusable :class:`PathKey`."""
+        return PathKey(path)
 
-    def get(self, path: str) -> Any | None:
-        normalized = self._validate_path(path)
-        with self._lock:
-            return self._data.get(normalized)
+    @property
+    def durability(self) -> Optional[str]:
+        """The write-ahead log's durability mode, or ``None`` without a log."""
+        return None if self._wal is None else self._wal.durability
 
-    def exists(self, path: str) -> bool:
-        normalized = self._validate_path(path)
+    def set(self, path: str | PathKey, value: Any) -> None:
+        normalized = _validate_path(path)
         with self._lock:
-            return normalized in self._data
+            state = _StateBuilder(self._state)
+            state.set(normalized, value)
+            version = self._state.version + 1
+            ticket = self._log(version, [("set", normalized, value)])
+            self._state = state.build(version)
+        self._sync(ticket)
+        self._enqueue_event(self._build_event("set", normalized, value, version))
+
+    def set_many(self, values: Mapping[str | PathKey, Any]) -> None:
+        """Store every item of ``values`` as one change with a single version."""
+        self._commit(
+            [("set", _validate_path(path), value) for path, value in values.items()]
+        )
+
+    def get(self, path: str | PathKey) -> Any | None:
+        return self._state._lookup(_validate_path(path))
+
+    def exists(self, path: str | PathKey) -> bool:
+        return self._state._lookup(_validate_path(path), _ABSENT) is not _ABSENT
+
+    def snapshot(self) -> Snapshot:
+        """Return an immutable view of the store as of now."""
+        return self._state
+
+    def save_snapshot(self, path: str, *, compact_log: bool = True) -> int:
+        """Write the current state to a snapshot file and return its version.
+
+        The file is written from an immutable :meth:`snapshot`, so writers
+        carry on while it is saved. With a write-ahead log and
+        ``compact_log``, the log records the snapshot holds are then dropped,
+        so restarting needs the snapshot file as well as the log.
+        """
+        state = self._state
+        self._write_snapshot(path, state, compact_log)
+        return state.version
+
+    def start_snapshot(
+        self, path: str, *, compact_log: bool = True
+    ) -> "concurrent.futures.Future[int]":
+        """Run :meth:`save_snapshot` on a background thread."""
+        state = self._state
+        future: "concurrent.futures.Future[int]" = concurrent.futures.Future()
 
-    def delete(self, path: str) -> None:
-        normalized = self._validate_path(path)
+        def run() -> None:
+            try:
+                self._write_snapshot(path, state, compact_log)
+            except BaseException as exc:  # pragma: no cover - reported via future
+                future.set_exception(exc)
+            else:
+                future.set_result(state.version)
+
+        future.set_running_or_notify_cancel()
+        threading.Thread(target=run, name="ReactiveStoreSnapshot", daemon=True).start()
+        return future
+
+    def _write_snapshot(self, path: str, state: Snapshot, compact_log: bool) -> None:
+        write_snapshot(path, state.version, state._entries())
+        if compact_log and self._wal is not None:
+            self._wal.compact(state.version)
+
+    @classmethod
+    def load_snapshot(cls, path: str, **options: Any) -> "ReactiveStore":
+        """Create a store from a snapshot file written by :meth:`save_snapshot`.
+
+        The file is memory-mapped and values are decoded on first access.
+        ``options`` are passed to the constructor; with ``wal_path`` the log
+        records written after the snapshot are replayed on top of it.
+        """
+        return cls(snapshot_path=path, **options)
+
+    def delete(self, path: str | PathKey) -> None:
+        normalized = _validate_path(path)
         with self._lock:
-            value = self._data.pop(normalized, _MISSING)
-            if value is _MISSING:
+            state = _StateBuilder(self._state)
+            if not state.delete(normalized):
                 return
-            event = self._build_event("delete", normalized, None)
-        self._enqueue_event(event)
-
-    def list(self, prefix: str | None = None) -> Iterable[str]:
-        if prefix is not None:
-            normalized = self._validate_selector(prefix, allow_wildcard=False)
-        else:
-            normalized = None
-        with self._lock:
-            keys = tuple(self._data.keys())
-        if normalized is None:
-            return keys
-        dotted_prefix = f"{normalized}."
-        return tuple(
-            key for key in keys if key == normalized or key.startswith(dotted_prefix)
-        )
+            version = self._state.version + 1
+            ticket = self._log(version, [("delete", normalized, None)])
+            self._state = state.build(version)
+        self._sync(ticket)
+        self._enqueue_event(self._build_event("delete", normalized, None, version))
+
+    def delete_many(self, paths: Iterable[str | PathKey]) -> None:
+        """Delete ``paths`` as one change; missing paths are skipped."""
+        self._commit([("delete", _validate_path(path), None) for path in paths])
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator["Transaction"]:
+        """Buffer writes and apply them together when the block exits.
+
+        Nothing is applied if the block raises.
+        """
+        transaction = Transaction(self)
+        yield transaction
+        self._commit(transaction._changes())
+
+    def delete_tree(self, prefix: str | PathKey) -> int:
+        """Delete ``prefix`` and every key below it as one change.
+
+        Subscribers receive one ``batch`` event for the removed keys. Returns
+        the number of keys removed.
+        """
+        normalized = _validate_selector(prefix, allow_wildcard=False)
+        return self._commit([("delete_tree", normalized, None)])
+
+    def list(self, prefix: str | PathKey | None = None) -> Iterable[str]:
+        return self._state.list(prefix)
+
+    def get_tree(self, prefix: str | PathKey | None = None) -> Dict[str, Any]:
+        """Return the values at and below ``prefix`` as nested dictionaries.
+
+        See :meth:`Snapshot.get_tree` for the layout.
+        """
+        return self._state.get_tree(prefix)
 
     def subscribe(
         self,
-        selector: str,
+        selector: str | PathKey,
         callback: Callable[[Event], Awaitable[None] | None | Any],
         *,
         retry_on_error: bool = True,
+        max_queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+        conflate: "bool | str" = False,
     ) -> SubscriptionId:
+        """Register ``callback`` for changes matching ``selector``.
+
+        ``max_queue_size`` and ``overflow`` default to the store's settings.
+        With ``conflate=True`` events that pile up while the callback is busy
+        are collapsed to the latest one per path, and with ``"batch"`` they
+        are delivered together as a single ``batch`` event. Conflated queues
+        hold one event per path, so the size limit does not apply to them.
+        """
+        if conflate not in (False, True, "batch"):
+            raise ValueError(
+                f"conflate must be True, False or 'batch', got {conflate!r}"
+            )
+        capacity = (
+            max_queue_size if max_queue_size is not None else self._max_queue_size
+        )
+        policy = overflow if overflow is not None else self._overflow
+        _validate_queue_options(capacity, policy)
+        if isinstance(selector, PathKey):
+            selector = selector.path
+        mailbox = (
+            _ConflatingMailbox(batch=conflate == "batch")
+            if conflate
+            else _Mailbox(capacity, policy)
+        )
         subscription = self._create_subscription(
-            selector, callback, retry_on_error=retry_on_error
+            selector, callback, retry_on_error=retry_on_error, mailbox=mailbox
         )
         subscription_id = str(uuid.uuid4())
         with self._lock:
-            self._subscriptions[subscription_id] = subscription
+            subscription.shard = self._next_shard
+            self._next_shard = (self._next_shard + 1) % len(self._shards)
+            self._subscriptions.add(subscription_id, subscription)
         return subscription_id
 
     def unsubscribe(self, subscription_id: SubscriptionId) -> None:
         with self._lock:
-            self._subscriptions.pop(subscription_id, None)
+            subscription = self._subscriptions.remove(subscription_id)
+        if subscription is not None:
+            subscription.mailbox.close()
+
+    def shutdown(self, *, drain: bool = True, timeout: float = 5.0) -> None:
+        """Stop the worker threads.
 
-    def shutdown(self) -> None:
-        """Stop the worker thread and drain events for clean shutdown."""
+        With ``drain`` every event already queued is delivered first;
+        otherwise pending events are discarded. Retries that are not yet due
+        are dropped.
+        """
 
+        if not drain:
+            self._stop_event.set()
+        with self._lock:
+            subscriptions = self._subscriptions.subscriptions()
+        for subscription in subscriptions:
+            subscription.mailbox.close()
+        for shard in self._shards:
+            shard.put(None)
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
         self._stop_event.set()
-        self._queue.put(None)
-        self._worker.join(timeout=5.0)
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-            except queue.Empty:
-                break
+        self._stop_async(max(0.0, deadline - time.monotonic()))
+        for shard in self._shards:
+            shard.clear()
+        if self._wal is not None:
+            self._wal.close()
+
+    def stats(self) -> DispatchStats:
+        """Return delivery counters."""
+        with self._stats_lock:
+            counters = dict(self._counters)
+        pending = sum(shard.pending_retries() for shard in self._shards)
+        with self._lock:
+            mailboxes = [
+                subscription.mailbox
+                for subscription in self._subscriptions.subscriptions()
+            ]
+        return DispatchStats(
+            pending_retries=pending,
+            queued=sum(len(mailbox) for mailbox in mailboxes),
+            dropped=sum(mailbox.dropped for mailbox in mailboxes),
+            conflated=sum(mailbox.conflated for mailbox in mailboxes),
+            **counters,
+        )
+
+    def subscription_stats(self, subscription_id: SubscriptionId) -> SubscriptionStats:
+        """Return queue depth and drop count for ``subscription_id``."""
+        with self._lock:
+            subscription = self._subscriptions.get(subscription_id)
+        if subscription is None:
+            raise KeyError(subscription_id)
+        mailbox = subscription.mailbox
+        return SubscriptionStats(
+            queued=len(mailbox),
+            dropped=mailbox.dropped,
+            capacity=mailbox.capacity,
+            overflow=mailbox.overflow,
+            conflated=mailbox.conflated,
+        )
 
     # ------------------------------------------------------------------
     # Internal helpers
-    def _validate_path(self, path: str) -> str:
-        if not isinstance(path, str) or not path:
-            raise ValueError("Path must be a non-empty string")
-        segments = path.split(".")
-        if any(not _PATH_SEGMENT_RE.fullmatch(segment) for segment in segments):
-            raise ValueError(f"Invalid path: {path!r}")
-        return path
-
-    def _validate_selector(self, selector: str, *, allow_wildcard: bool) -> str:
-        if not isinstance(selector, str) or not selector:
-            raise ValueError("Selector must be a non-empty string")
-        if allow_wildcard and selector == "*":
-            return ""
-        if allow_wildcard and selector.endswith(".*"):
-            base = selector[:-2]
-            self._validate_path(base)
-            return base + "."
-        self._validate_path(selector)
-        return selector
-
     def _create_subscription(
         self,
         selector: str,
         callback: Callable[[Event], Awaitable[None] | None | Any],
         *,
         retry_on_error: bool,
+        mailbox: _Mailbox,
     ) -> _Subscription:
         if not callable(callback):
             raise TypeError("Callback must be callable")
@@ -194,29 +1121,31 @@ class ReactiveStore:
                 match_exact=False,
                 prefix=None,
                 retry_on_error=retry_on_error,
+                mailbox=mailbox,
             )
         if selector.endswith(".*"):
-            prefix_base = self._validate_selector(selector, allow_wildcard=True)
+            prefix_base = _validate_selector(selector, allow_wildcard=True)
             return _Subscription(
                 selector=selector,
                 callback=callback,
                 match_exact=False,
                 prefix=prefix_base,
                 retry_on_error=retry_on_error,
+                mailbox=mailbox,
             )
-        normalized = self._validate_selector(selector, allow_wildcard=False)
+        normalized = _validate_selector(selector, allow_wildcard=False)
         return _Subscription(
             selector=normalized,
             callback=callback,
             match_exact=True,
             prefix=None,
             retry_on_error=retry_on_error,
+            mailbox=mailbox,
         )
 
-    def _build_event(self, event_type: str, path: str, value: Any | None) -> Event:
-        with self._lock:
-            self._version += 1
-            version = self._version
+    def _build_event(
+        self, event_type: str, path: str, value: Any | None, version: int
+    ) -> Event:
         timestamp = time.monotonic()
         origin = {"pid": os.getpid(), "tid": threading.get_ident()}
         return Event(
@@ -228,63 +1157,310 @@ class ReactiveStore:
             origin=origin,
         )
 
+    def _log(self, version: int, changes: List[Tuple[str, str, Any]]) -> int:
+        """Append a change set to the write-ahead log; call with ``_lock`` held.
+
+        Raises ``RuntimeError`` once the log has failed, before the change is
+        applied.
+        """
+        if self._wal is None:
+            return 0
+        return self._wal.append(encode_record(version, changes))
+
+    def _sync(self, ticket: int) -> None:
+        """Wait for the log record of a published change to be durable.
+
+        The change is visible to readers by then, so a failed log is not
+        reported to this write: the log logs the error and refuses later
+        records, which makes the store read-only.
+        """
+        if self._wal is not None:
+            with contextlib.suppress(RuntimeError):
+                self._wal.wait(ticket)
+
+    @staticmethod
+    def _replay(
+        state: Snapshot,
+        records: Iterable[Tuple[int, Optional[List[Tuple[str, str, Any]]]]],
+    ) -> Snapshot:
+        """Apply log records newer than ``state`` and return the result."""
+        builder = _StateBuilder(state)
+        version = state.version
+        for record_version, changes in records:
+            if record_version <= version:
+                continue
+            if changes is None:
+                # The log was compacted after a snapshot this store lacks.
+                raise ValueError(
+                    f"The write-ahead log continues from the snapshot at version "
+                    f"{record_version}, but the store is at version {version}; "
+                    "load that snapshot with snapshot_path"
+                )
+            version = record_version
+            for event_type, path, value in changes:
+                if event_type == "set":
+                    builder.set(path, value)
+                else:
+                    builder.delete(path)
+        return builder.build(version)
+
+    @staticmethod
+    def _expand_changes(
+        changes: List[Tuple[str, str, Any]], state: Snapshot
+    ) -> Iterator[Tuple[str, str, Any]]:
+        for event_type, path, value in changes:
+            if event_type == "delete_tree":
+                for key in state._iter_keys(path):
+                    yield "delete", key, None
+            else:
+                yield event_type, path, value
+
+    def _commit(self, changes: List[Tuple[str, str, Any]]) -> int:
+        """Apply ``(type, path, value)`` changes under one lock and version.
+
+        Each subscriber receives a single ``batch`` event whose ``changes``
+        hold the individual events that match its selector. A
+        ``delete_tree`` change deletes a path and its descendants. Returns
+        the number of changes applied.
+        """
+        if not changes:
+            return 0
+        applied: List[Tuple[str, str, Any]] = []
+        targets: Dict[SubscriptionId, Tuple[_Subscription, List[int]]] = {}
+        with self._lock:
+            state = self._state
+            builder = _StateBuilder(state)
+            for event_type, path, value in self._expand_changes(changes, state):
+                if event_type == "set":
+                    builder.set(path, value)
+                elif not builder.delete(path):
+                    continue
+                for subscription_id, subscription in self._subscriptions.match(path):
+                    target = targets.setdefault(subscription_id, (subscription, []))
+                    target[1].append(len(applied))
+                applied.append((event_type, path, value))
+            if not applied:
+                return 0
+            version = state.version + 1
+            ticket = self._log(version, applied)
+            self._state = builder.build(version)
+        self._sync(ticket)
+        self._enqueue_batches(applied, targets, version)
+        return len(applied)
+
+    def _enqueue_batches(
+        self,
+        applied: List[Tuple[str, str, Any]],
+        targets: Dict[SubscriptionId, Tuple[_Subscription, List[int]]],
+        version: int,
+    ) -> None:
+        timestamp = time.monotonic()
+        origin = {"pid": os.getpid(), "tid": threading.get_ident()}
+        events = [
+            Event(event_type, path, value, timestamp, version, origin)
+            for event_type, path, value in applied
+        ]
+        for subscription_id, (subscription, indices) in targets.items():
+            matched = tuple(events[index] for index in indices)
+            batch = Event(
+                type="batch",
+                path=_common_prefix([event.path for event in matched]),
+                timestamp=timestamp,
+                version=version,
+                origin=origin,
+                changes=matched,
+            )
+            self._put(
+                _QueuedEvent(
+                    event=batch,
+                    subscription_id=subscription_id,
+                    subscription=subscription,
+                    attempt=0,
+                    delay=self._retry_base_delay,
+                )
+            )
+
     def _enqueue_event(self, event: Event) -> None:
         with self._lock:
-            items = list(self._subscriptions.items())
+            items = self._subscriptions.match(event.path)
         for subscription_id, subscription in items:
-            if subscription.matches(event.path):
-                self._queue.put(
-                    _QueuedEvent(
-                        event=event,
-                        subscription_id=subscription_id,
-                        subscription=subscription,
-                        attempt=0,
-                        delay=self._retry_base_delay,
-                    )
+            self._put(
+                _QueuedEvent(
+                    event=event,
+                    subscription_id=subscription_id,
+                    subscription=subscription,
+                    attempt=0,
+                    delay=self._retry_base_delay,
                 )
+            )
 
-    def _worker_loop(self) -> None:
-        while not self._stop_event.is_set():
-            try:
-                queued = self._queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-            if queued is None:
+    def _put(self, queued: _QueuedEvent) -> None:
+        subscription = queued.subscription
+        shard = subscription.shard
+        mailbox = subscription.mailbox
+        # A callback that waited for a mailbox could be the one holding up its
+        # drain, directly or through another worker waiting in turn.
+        may_block = threading.get_ident() not in self._callback_threads
+        if mailbox.offer(queued, may_block=may_block):
+            self._shards[shard].put(mailbox)
+
+    def _worker_loop(self, shard: _Shard) -> None:
+        self._callback_threads.add(threading.get_ident())
+        while True:
+            item = shard.next_item()
+            if item is None or self._stop_event.is_set():
                 break
+            self._handle(shard, item)
+        if not self._stop_event.is_set():
+            # Mailboxes re-queue themselves behind the stop sentinel while
+            # they still hold events, so finish them when draining.
+            for item in shard.drain(self._stop_event):
+                self._handle(shard, item)
+
+    def _handle(self, shard: _Shard, mailbox: _Mailbox) -> None:
+        queued = mailbox.take()
+        if queued is not None:
             self._dispatch(queued)
+        elif mailbox.done():
+            shard.put(mailbox)
 
     def _dispatch(self, queued: _QueuedEvent) -> None:
+        """Run the callback for ``queued``, taken from its subscription's mailbox."""
+        try:
+            result = queued.subscription.callback(queued.event)
+        except Exception as exc:  # pragma: no cover - logged and retried
+            self._failed(queued, exc)
+            return
+        if inspect.isawaitable(result):
+            self._schedule_async(queued, result)
+            return
+        self._count("delivered")
+        self._release(queued)
+
+    def _release(self, queued: _QueuedEvent) -> None:
+        """End a delivery, re-queueing the mailbox if it holds more events."""
+        subscription = queued.subscription
+        if subscription.mailbox.done():
+            self._shards[subscription.shard].put(subscription.mailbox)
+
+    def _failed(self, queued: _QueuedEvent, exc: BaseException) -> None:
+        """Log a failed delivery, then schedule a retry or dead-letter it.
+
+        A retry keeps the subscription's mailbox until it is due, so later
+        events of the subscription wait behind it.
+        """
         subscription = queued.subscription
-        event = queued.event
-        delay = max(self._retry_base_delay, min(queued.delay, self._retry_max_delay))
         attempt = queued.attempt + 1
-        try:
-            result = subscription.callback(event)
-            if inspect.isawaitable(result):
-                asyncio.run(self._await_result(result))
-        except Exception:  # pragma: no cover - logged and retried
-            self._logger.exception(
-                "ReactiveStore callback failed",
-                extra={"subscription": subscription.selector, "attempt": attempt},
-            )
-            if not subscription.retry_on_error:
-                return
-            time.sleep(delay)
-            next_delay = min(delay * 2, self._retry_max_delay)
-            self._queue.put(
-                _QueuedEvent(
-                    event=event,
-                    subscription_id=queued.subscription_id,
-                    subscription=subscription,
-                    attempt=attempt,
-                    delay=next_delay,
+        self._logger.error(
+            "ReactiveStore callback failed",
+            exc_info=exc,
+            extra={"subscription": subscription.selector, "attempt": attempt},
+        )
+        self._count("failures")
+        exhausted = self._max_attempts is not None and attempt >= self._max_attempts
+        if not subscription.retry_on_error or exhausted:
+            self._count("dead_letters")
+            if self._dead_letter is not None:
+                try:
+                    self._dead_letter(queued.event, queued.subscription_id, exc)
+                except Exception:  # pragma: no cover - logged only
+                    self._logger.exception("ReactiveStore dead-letter hook failed")
+            self._release(queued)
+            return
+        delay = max(self._retry_base_delay, min(queued.delay, self._retry_max_delay))
+        retry = _QueuedEvent(
+            event=queued.event,
+            subscription_id=queued.subscription_id,
+            subscription=subscription,
+            attempt=attempt,
+            delay=min(delay * 2, self._retry_max_delay),
+        )
+        self._count("retries")
+        subscription.mailbox.hold(retry)
+        self._shards[subscription.shard].schedule(
+            subscription.mailbox, time.monotonic() + delay
+        )
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._counters[name] += 1
+
+    # ------------------------------------------------------------------
+    # Async callbacks
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the loop for async callbacks, starting the owned one if needed."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._loop_thread = threading.Thread(
+                    target=run, name="ReactiveStoreLoop", daemon=True
                 )
+                self._loop_thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _schedule_async(
+        self,
+        queued: _QueuedEvent,
+        awaitable: Awaitable[Any],
+    ) -> None:
+        self._shards[queued.subscription.shard].start_async()
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_async(queued, awaitable), self._event_loop()
+        )
+        with self._loop_lock:
+            self._async_pending.add(future)
+        future.add_done_callback(self._async_done)
+
+    def _async_done(self, future: "concurrent.futures.Future[None]") -> None:
+        with self._loop_lock:
+            self._async_pending.discard(future)
+
+    async def _run_async(
+        self,
+        queued: _QueuedEvent,
+        awaitable: Awaitable[Any],
+    ) -> None:
+        # The mailbox is released only once the awaitable finishes, so each
+        # subscription has at most one awaitable running and its later events
+        # wait in the bounded mailbox.
+        self._callback_threads.add(threading.get_ident())
+        limit = self._async_limit
+        if limit is None:
+            limit = self._async_limit = asyncio.Semaphore(
+                self._max_concurrent_callbacks
             )
-        else:
-            return
+        try:
+            async with limit:
+                try:
+                    await awaitable
+                except Exception as exc:  # pragma: no cover - logged and retried
+                    self._failed(queued, exc)
+                    return
+            self._count("delivered")
+            self._release(queued)
+        finally:
+            self._shards[queued.subscription.shard].finish_async()
 
-    async def _await_result(self, result: Awaitable[Any]) -> None:
-        await result
+    def _stop_async(self, timeout: float) -> None:
+        with self._loop_lock:
+            pending = list(self._async_pending)
+        if pending:
+            concurrent.futures.wait(pending, timeout=timeout)
+        if self._owns_loop and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._loop_thread is not None:
+                self._loop_thread.join(timeout=timeout)
+            if not self._loop.is_running():
+                self._loop.close()
 
     # Context manager helpers
     def __enter__(self) -> "ReactiveStore":
@@ -292,3 +1468,87 @@ class ReactiveStore:
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self.shutdown()
+
+
+class Transaction:
+    """Writes buffered by ``ReactiveStore.transaction``.
+
+    Reads see the transaction's own pending writes first. Only the last write
+    to each path is applied when the transaction commits.
+    """
+
+    def __init__(self, store: ReactiveStore) -> None:
+        self._store = store
+        self._pending: Dict[str, Tuple[str, Any]] = {}
+
+    def set(self, path: str | PathKey, value: Any) -> None:
+        normalized = _validate_path(path)
+        self._pending.pop(normalized, None)
+        self._pending[normalized] = ("set", value)
+
+    def delete(self, path: str | PathKey) -> None:
+        normalized = _validate_path(path)
+        self._pending.pop(normalized, None)
+        self._pending[normalized] = ("delete", None)
+
+    def get(self, path: str | PathKey) -> Any | None:
+        normalized = _validate_path(path)
+        if normalized in self._pending:
+            return self._pending[normalized][1]
+        return self._store.get(normalized)
+
+    def _changes(self) -> List[Tuple[str, str, Any]]:
+        return [(kind, path, value) for path, (kind, value) in self._pending.items()]
+
+
+def _validate_path(path: str | PathKey) -> str:
+    if type(path) is PathKey:
+        return path.path  # type: ignore[union-attr]
+    if type(path) is str:
+        return _checked_path(path)
+    if isinstance(path, PathKey):
+        return path.path
+    if not isinstance(path, str):
+        raise ValueError("Path must be a non-empty string")
+    return _checked_path(str(path))
+
+
+def _validate_selector(selector: str | PathKey, *, allow_wildcard: bool) -> str:
+    if isinstance(selector, PathKey):
+        return selector.path
+    if not isinstance(selector, str) or not selector:
+        raise ValueError("Selector must be a non-empty string")
+    if allow_wildcard and selector == "*":
+        return ""
+    if allow_wildcard and selector.endswith(".*"):
+        base = selector[:-2]
+        _validate_path(base)
+        return base + "."
+    _validate_path(selector)
+    return selector
+
+
+def _validate_queue_options(max_queue_size: Optional[int], overflow: str) -> None:
+    if max_queue_size is not None and max_queue_size < 1:
+        raise ValueError("max_queue_size must be at least 1")
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}, got {overflow!r}"
+        )
+
+
+def _common_prefix(paths: List[str]) -> str:
+    """Return the longest dotted path shared by every entry of ``paths``.
+
+    Returns :data:`BATCH_ROOT` when the paths share no segment.
+    """
+    common = paths[0].split(".")
+    for path in paths[1:]:
+        segments = path.split(".")
+        size = 0
+        for left, right in zip(common, segments):
+            if left != right:
+                break
+            size += 1
+        common = common[:size]
+    return ".".join(common) or BATCH_ROOT
@@ -0,0 +1,290 @@
+"""Immutable map and key trie used for ``ReactiveStore`` state.
+
+Every update returns a new structure that shares all untouched nodes with
+the old one, so a reader holding an old root keeps a consistent view while
+writers publish new roots.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_BITS = 6
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+# Shifts past this point have consumed all 64 hash bits.
+_MAX_SHIFT = 60
+
+_Leaf = Tuple[int, Any, Any]
+# Interior nodes are plain dicts from a 6-bit hash chunk to a
+# ``(hash, key, value)`` leaf, a child node or a ``_Collision``. They are
+# never mutated once published, and copying one is a single C-level call.
+_Node = Dict[int, Any]
+
+
+class _Collision:
+    """Leaves whose keys share the full 64-bit hash."""
+
+    __slots__ = ("leaves",)
+
+    def __init__(self, leaves: Tuple[_Leaf, ...]) -> None:
+        self.leaves = leaves
+
+
+def _merge(shift: int, first: _Leaf, second: _Leaf) -> Any:
+    if shift > _MAX_SHIFT:
+        return _Collision((first, second))
+    first_index = (first[0] >> shift) & _MASK
+    second_index = (second[0] >> shift) & _MASK
+    if first_index == second_index:
+        return {first_index: _merge(shift + _BITS, first, second)}
+    return {first_index: first, second_index: second}
+
+
+def _assoc(node: _Node, shift: int, leaf: _Leaf) -> Tuple[_Node, bool]:
+    """Return ``node`` with ``leaf`` stored and whether a key was added."""
+    index = (leaf[0] >> shift) & _MASK
+    entry = node.get(index)
+    if entry is None:
+        replacement: Any = leaf
+        added = True
+    elif type(entry) is tuple:
+        if entry[1] == leaf[1]:
+            if entry[2] is leaf[2]:
+                return node, False
+            replacement = leaf
+            added = False
+        else:
+            replacement = _merge(shift + _BITS, entry, leaf)
+            added = True
+    elif type(entry) is dict:
+        replacement, added = _assoc(entry, shift + _BITS, leaf)
+        if replacement is entry:
+            return node, False
+    else:
+        replacement, added = _assoc_collision(entry, leaf)
+        if replacement is entry:
+            return node, False
+    updated = node.copy()
+    updated[index] = replacement
+    return updated, added
+
+
+def _assoc_collision(node: _Collision, leaf: _Leaf) -> Tuple[_Collision, bool]:
+    leaves = node.leaves
+    for index, existing in enumerate(leaves):
+        if existing[1] == leaf[1]:
+            if existing[2] is leaf[2]:
+                return node, False
+            return _Collision(leaves[:index] + (leaf,) + leaves[index + 1 :]), False
+    return _Collision(leaves + (leaf,)), True
+
+
+def _dissoc(node: _Node, shift: int, key_hash: int, key: Any) -> Any:
+    """Return ``node`` without ``key``.
+
+    The result is ``node`` itself if the key is missing, ``None`` if the node
+    became empty, or a bare leaf that the parent should inline.
+    """
+    index = (key_hash >> shift) & _MASK
+    entry = node.get(index)
+    if entry is None:
+        return node
+    if type(entry) is tuple:
+        if entry[1] != key:
+            return node
+        replacement: Any = None
+    elif type(entry) is dict:
+        replacement = _dissoc(entry, shift + _BITS, key_hash, key)
+        if replacement is entry:
+            return node
+    else:
+        leaves = tuple(leaf for leaf in entry.leaves if leaf[1] != key)
+        if len(leaves) == len(entry.leaves):
+            return node
+        replacement = leaves[0] if len(leaves) == 1 else _Collision(leaves)
+    updated = node.copy()
+    if replacement is None:
+        del updated[index]
+    else:
+        updated[index] = replacement
+    if not updated:
+        return None
+    if shift and len(updated) == 1:
+        (only,) = updated.values()
+        if type(only) is tuple:
+            return only
+    return updated
+
+
+def _iter_leaves(node: _Node) -> Iterator[_Leaf]:
+    stack = [node]
+    while stack:
+        for entry in stack.pop().values():
+            if type(entry) is tuple:
+                yield entry
+            elif type(entry) is dict:
+                stack.append(entry)
+            else:
+                yield from entry.leaves
+
+
+class PersistentMap:
+    """Hash array mapped trie with copy-on-write updates.
+
+    Lookups and updates touch ``O(log64 n)`` nodes; updates copy only the
+    nodes on the path to the changed key.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, _root: Optional[_Node] = None, _size: int = 0) -> None:
+        self._root: _Node = {} if _root is None else _root
+        self._size = _size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.keys()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        key_hash = hash(key) & _HASH_MASK
+        entry = self._root.get(key_hash & _MASK)
+        shift = 0
+        while type(entry) is dict:
+            shift += _BITS
+            entry = entry.get((key_hash >> shift) & _MASK)
+        if entry is None:
+            return default
+        if type(entry) is tuple:
+            return entry[2] if entry[1] == key else default
+        for leaf in entry.leaves:
+            if leaf[1] == key:
+                return leaf[2]
+        return default
+
+    def set(self, key: Any, value: Any) -> "PersistentMap":
+        """Return a map with ``key`` set to ``value``."""
+        root, added = _assoc(self._root, 0, (hash(key) & _HASH_MASK, key, value))
+        if root is self._root:
+            return self
+        return PersistentMap(root, self._size + added)
+
+    def delete(self, key: Any) -> "PersistentMap":
+        """Return a map without ``key``; the same map if it is missing."""
+        root = _dissoc(self._root, 0, hash(key) & _HASH_MASK, key)
+        if root is self._root:
+            return self
+        if root is None:
+            return PersistentMap()
+        return PersistentMap(root, self._size - 1)
+
+    def keys(self) -> Iterator[Any]:
+        return (leaf[1] for leaf in _iter_leaves(self._root))
+
+    def values(self) -> Iterator[Any]:
+        return (leaf[2] for leaf in _iter_leaves(self._root))
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        return ((leaf[1], leaf[2]) for leaf in _iter_leaves(self._root))
+
+
+_ABSENT = object()
+EMPTY_MAP = PersistentMap()
+
+
+class KeyTrie:
+    """Immutable trie of dotted paths keyed by segment.
+
+    A node's ``path`` is the dotted path leading to it and ``has_value``
+    marks stored keys. Adding or removing a key copies only the nodes along
+    its path.
+    """
+
+    __slots__ = ("path", "has_value", "children")
+
+    def __init__(
+        self,
+        path: str = "",
+        has_value: bool = False,
+        children: PersistentMap = EMPTY_MAP,
+    ) -> None:
+        self.path = path
+        self.has_value = has_value
+        self.children = children
+
+    def add(self, path: str) -> "KeyTrie":
+        """Return a trie that contains ``path``."""
+        return self._add(path.split("."), 0)
+
+    def _add(self, segments: list, depth: int) -> "KeyTrie":
+        if depth == len(segments):
+            if self.has_value:
+                return self
+            return KeyTrie(self.path, True, self.children)
+        segment = segments[depth]
+        child = self.children.get(segment)
+        if child is None:
+            child = KeyTrie(f"{self.path}.{segment}" if self.path else segment)
+        updated = child._add(segments, depth + 1)
+        if updated is child and segment in self.children:
+            return self
+        return KeyTrie(self.path, self.has_value, self.children.set(segment, updated))
+
+    def discard(self, path: str) -> "KeyTrie":
+        """Return a trie without ``path``, pruning branches left empty."""
+        updated = self._discard(path.split("."), 0)
+        return KeyTrie() if updated is None else updated
+
+    def _discard(self, segments: list, depth: int) -> Optional["KeyTrie"]:
+        if depth == len(segments):
+            if not self.has_value:
+                return self
+            if not len(self.children):
+                return None
+            return KeyTrie(self.path, False, self.children)
+        segment = segments[depth]
+        child = self.children.get(segment)
+        if child is None:
+            return self
+        updated = child._discard(segments, depth + 1)
+        if updated is child:
+            return self
+        if updated is None:
+            children = self.children.delete(segment)
+            if not len(children) and not self.has_value and self.path:
+                return None
+            return KeyTrie(self.path, self.has_value, children)
+        return KeyTrie(self.path, self.has_value, self.children.set(segment, updated))
+
+    def find(self, prefix: Optional[str]) -> Optional["KeyTrie"]:
+        """Return the node for ``prefix``, or the root when it is ``None``."""
+        node: Optional[KeyTrie] = self
+        if prefix is not None:
+            for segment in prefix.split("."):
+                node = node.children.get(segment)  # type: ignore[union-attr]
+                if node is None:
+                    return None
+        return node
+
+    def iter(self, prefix: Optional[str]) -> Iterator[str]:
+        """Yield ``prefix`` if stored, then every key below it.
+
+        Keys come out depth first with siblings in sorted order, so the order
+        does not depend on string hashing.
+        """
+        node = self.find(prefix)
+        if node is None:
+            return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.has_value:
+                yield node.path
+            stack.extend(
+                child for _, child in sorted(node.children.items(), reverse=True)
+            )
@@ -0,0 +1,312 @@
+"""asyncio interface to ``ReactiveStore``.
+
+``AsyncReactiveStore`` wraps a store with awaitable reads and writes and
+turns subscriptions into async iterators::
+
+    async with AsyncReactiveStore() as store:
+        async with store.watch("app.*") as events:
+            await store.set("app.name", "demo")
+            async for event in events:
+                ...
+
+Events reach a watch on a store worker thread. They are buffered there and
+handed to the event loop in batches: the first event of a burst schedules
+one ``call_soon_threadsafe`` callback, which moves every event buffered by
+the time it runs into the watch's bounded ``asyncio.Queue``. Worker threads
+never wait for a consumer: when a ``"block"`` watch is full, its callback
+returns an awaitable that finishes once the consumer makes room, and the
+store keeps the later events in the subscription's queue meanwhile. That
+queue holds at most ``max_queue_size`` events too, so once it is full,
+writers wait for the consumer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Mapping,
+    Optional,
+    Set,
+)
+
+from . import Event, PathKey, ReactiveStore, Snapshot
+
+__all__ = ["AsyncReactiveStore", "WATCH_OVERFLOW_POLICIES", "Watch"]
+
+# What a full watch queue does with a new event: leave it and later events in
+# the store's subscription queue, of the same size, until the consumer makes
+# room, evict the oldest queued event, or discard the new one.
+WATCH_OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+_CLOSED = object()
+
+
+class Watch:
+    """Async iterator over the events matching one selector.
+
+    Created by :meth:`AsyncReactiveStore.watch`. At most ``max_queue_size``
+    events wait for the consumer; ``overflow`` decides what happens to
+    further events. With ``"block"`` up to ``max_queue_size`` more wait in
+    the store's queue for the subscription, and writers then wait until the
+    consumer makes room. Iteration ends once the watch is closed, which
+    discards events that were not consumed yet. Use it as an async context
+    manager, or call :meth:`aclose`, so the store subscription is removed.
+    """
+
+    def __init__(
+        self,
+        store: ReactiveStore,
+        selector: str | PathKey,
+        *,
+        max_queue_size: int,
+        overflow: str,
+        conflate: "bool | str",
+        on_close: Callable[["Watch"], None],
+    ) -> None:
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1")
+        if overflow not in WATCH_OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {', '.join(WATCH_OVERFLOW_POLICIES)}, "
+                f"got {overflow!r}"
+            )
+        self.dropped = 0
+        self._store = store
+        self._on_close = on_close
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue(max_queue_size)
+        self._capacity = max_queue_size
+        self._overflow = overflow
+        # Events received on the worker thread and not yet moved to ``_queue``.
+        self._pending: Deque[Event] = deque()
+        # Events in ``_pending`` and ``_queue``, updated under ``_lock`` so the
+        # worker and the consumer agree on whether the watch is full.
+        self._size = 0
+        self._lock = threading.Lock()
+        self._scheduled = False
+        # Completed by the consumer once a full ``block`` watch has room.
+        self._space: Optional["concurrent.futures.Future[None]"] = None
+        self._closed = False
+        # Bound the store's queue behind a ``block`` watch the same way.
+        bound = (
+            {"max_queue_size": max_queue_size, "overflow": "block"}
+            if overflow == "block"
+            else {}
+        )
+        self._subscription_id = store.subscribe(
+            selector, self._receive, retry_on_error=False, conflate=conflate, **bound
+        )
+
+    def __aiter__(self) -> "Watch":
+        return self
+
+    async def __anext__(self) -> Event:
+        event = await self._queue.get()
+        if event is _CLOSED:
+            # Leave the marker for any other task iterating this watch.
+            self._queue.put_nowait(_CLOSED)
+            raise StopAsyncIteration
+        with self._lock:
+            self._size -= 1
+        self._release_space()
+        return event
+
+    def close(self) -> None:
+        """Remove the subscription and end iteration; call on the loop thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.clear()
+        self._release_space()
+        self._store.unsubscribe(self._subscription_id)
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_CLOSED)
+        self._on_close(self)
+
+    async def aclose(self) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Watch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _receive(self, event: Event) -> Optional[Awaitable[None]]:
+        # Runs on a store worker thread.
+        with self._lock:
+            if self._closed:
+                return None
+            pending = self._pending
+            if self._size >= self._capacity:
+                if self._overflow == "block":
+                    # The store keeps this subscription's later events queued
+                    # until the awaitable finishes.
+                    space: "concurrent.futures.Future[None]"
+                    space = self._space = concurrent.futures.Future()
+                    return self._receive_later(space, event)
+                if self._overflow == "drop_newest":
+                    self.dropped += 1
+                    return None
+                # ``drop_oldest``: ``_flush`` evicts from the queue if needed.
+                if len(pending) >= self._capacity:
+                    pending.popleft()
+                    self._size -= 1
+                    self.dropped += 1
+            pending.append(event)
+            self._size += 1
+            if self._scheduled:
+                return None
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._flush)
+        except RuntimeError:
+            # The loop is closed; nobody is left to consume the event.
+            pass
+        return None
+
+    async def _receive_later(
+        self, space: "concurrent.futures.Future[None]", event: Event
+    ) -> None:
+        # Runs on the store's callback loop, not on the watch's loop.
+        await asyncio.wrap_future(space)
+        retry = self._receive(event)
+        if retry is not None:
+            await retry
+
+    def _release_space(self) -> None:
+        with self._lock:
+            space, self._space = self._space, None
+        # The wait is only done already if the store's loop cancelled it.
+        if space is not None and not space.done():
+            space.set_result(None)
+
+    def _flush(self) -> None:
+        # Runs on the event loop thread.
+        with self._lock:
+            self._scheduled = False
+            if self._closed:
+                return
+            queue = self._queue
+            pending = self._pending
+            while pending:
+                if queue.full():
+                    queue.get_nowait()
+                    self._size -= 1
+                    self.dropped += 1
+                queue.put_nowait(pending.popleft())
+
+
+class AsyncReactiveStore:
+    """asyncio facade over a :class:`ReactiveStore`.
+
+    Wraps ``store``, or a new store built from ``options``, which
+    :meth:`aclose` then shuts down. Reads never block, so they run directly
+    on the loop. Writes also run directly unless ``offload_writes`` is set,
+    in which case they run in the loop's default executor. By default writes
+    are offloaded only when the store waits for a write-ahead log fsync on
+    every write, or while a ``"block"`` watch is open, since a write may then
+    wait for its consumer. Also offload them if the store's subscriptions use
+    bounded ``"block"`` queues, since a write may then wait for a callback.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ReactiveStore] = None,
+        *,
+        offload_writes: Optional[bool] = None,
+        **options: Any,
+    ) -> None:
+        if store is not None and options:
+            raise TypeError("Pass either an existing store or store options")
+        self.store = ReactiveStore(**options) if store is None else store
+        self._owns_store = store is None
+        if offload_writes is None:
+            offload_writes = self.store.durability == "always"
+        self._offload_writes = offload_writes
+        self._watches: Set[Watch] = set()
+        # Open ``"block"`` watches; writes are offloaded while there are any.
+        self._blocking_watches: Set[Watch] = set()
+
+    async def get(self, path: str | PathKey) -> Any | None:
+        return self.store.get(path)
+
+    async def exists(self, path: str | PathKey) -> bool:
+        return self.store.exists(path)
+
+    async def list(self, prefix: str | PathKey | None = None) -> Iterable[str]:
+        return self.store.list(prefix)
+
+    def snapshot(self) -> Snapshot:
+        return self.store.snapshot()
+
+    async def set(self, path: str | PathKey, value: Any) -> None:
+        await self._write(self.store.set, path, value)
+
+    async def set_many(self, values: Mapping[str | PathKey, Any]) -> None:
+        await self._write(self.store.set_many, values)
+
+    async def delete(self, path: str | PathKey) -> None:
+        await self._write(self.store.delete, path)
+
+    def watch(
+        self,
+        selector: str | PathKey,
+        *,
+        max_queue_size: int = 1000,
+        overflow: str = "block",
+        conflate: "bool | str" = False,
+    ) -> Watch:
+        """Return a :class:`Watch` over changes matching ``selector``.
+
+        Must be called from a running event loop. ``overflow`` is one of
+        :data:`WATCH_OVERFLOW_POLICIES`; ``conflate`` works as in
+        :meth:`ReactiveStore.subscribe`.
+        """
+        watch = Watch(
+            self.store,
+            selector,
+            max_queue_size=max_queue_size,
+            overflow=overflow,
+            conflate=conflate,
+            on_close=self._forget,
+        )
+        self._watches.add(watch)
+        if overflow == "block":
+            self._blocking_watches.add(watch)
+        return watch
+
+    async def aclose(self) -> None:
+        """Close every watch, then shut down the store if this facade made it."""
+        for watch in list(self._watches):
+            watch.close()
+        if self._owns_store:
+            await asyncio.get_running_loop().run_in_executor(None, self.store.shutdown)
+
+    def _forget(self, watch: Watch) -> None:
+        self._watches.discard(watch)
+        self._blocking_watches.discard(watch)
+
+    async def _write(self, method: Callable[..., Any], *args: Any) -> None:
+        if self._offload_writes or self._blocking_watches:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(method, *args))
+        else:
+            method(*args)
+
+    async def __aenter__(self) -> "AsyncReactiveStore":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
@@ -0,0 +1,302 @@
+"""Throughput benchmarks for ``ReactiveStore``.
+
+Run ``python -m projects.reactive_store.benchmarks`` to print fan-out
+throughput for several dispatch worker counts, pass ``--suite wal`` to
+compare write throughput with each write-ahead log durability mode, pass
+``--suite snapshot`` to time loading a large snapshot file, or pass
+``--suite remote`` to compare a store served from another process with
+in-process use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import Event, ReactiveStore
+from .client import StoreClient
+from .protocol import Address
+from .server import StoreServer
+from .snapshot_file import write_snapshot
+from .wal import DURABILITY_MODES
+
+
+def fanout_throughput(
+    workers: int,
+    *,
+    subscriptions: int = 32,
+    events: int = 200,
+    callback_delay: float = 0.0005,
+) -> float:
+    """Return delivered events per second for a store with ``workers`` threads.
+
+    Every write is fanned out to ``subscriptions`` prefix subscribers whose
+    callbacks sleep for ``callback_delay`` seconds to stand in for I/O.
+    """
+    expected = subscriptions * events
+    delivered = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def callback(event: Event) -> None:
+        nonlocal delivered
+        if callback_delay:
+            time.sleep(callback_delay)
+        with lock:
+            delivered += 1
+            if delivered == expected:
+                done.set()
+
+    store = ReactiveStore(workers=workers)
+    try:
+        for _ in range(subscriptions):
+            store.subscribe("bench.*", callback)
+        start = time.perf_counter()
+        for index in range(events):
+            store.set("bench.value", index)
+        if not done.wait(timeout=60.0):
+            raise RuntimeError(f"Only {delivered} of {expected} events were delivered")
+        elapsed = time.perf_counter() - start
+    finally:
+        store.shutdown()
+    return expected / elapsed
+
+
+def run_fanout(
+    worker_counts: Sequence[int] = (1, 2, 4, 8),
+    *,
+    subscriptions: int = 32,
+    events: int = 200,
+    callback_delay: float = 0.0005,
+) -> Dict[int, float]:
+    """Return ``fanout_throughput`` for each entry of ``worker_counts``."""
+    return {
+        workers: fanout_throughput(
+            workers,
+            subscriptions=subscriptions,
+            events=events,
+            callback_delay=callback_delay,
+        )
+        for workers in worker_counts
+    }
+
+
+def write_throughput(
+    durability: Optional[str],
+    *,
+    writers: int = 8,
+    writes: int = 500,
+) -> float:
+    """Return writes per second from ``writers`` threads.
+
+    ``durability`` selects a write-ahead log mode in a temporary directory;
+    ``None`` benchmarks the in-memory store.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        options = {}
+        if durability is not None:
+            options = {
+                "wal_path": os.path.join(directory, "store.wal"),
+                "durability": durability,
+            }
+        store = ReactiveStore(**options)
+
+        def write(worker: int) -> None:
+            for index in range(writes):
+                store.set(f"bench.w{worker}", index)
+
+        threads = [
+            threading.Thread(target=write, args=(worker,)) for worker in range(writers)
+        ]
+        try:
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            store.shutdown()
+    return writers * writes / elapsed
+
+
+def run_wal(
+    modes: Sequence[Optional[str]] = (None, *DURABILITY_MODES),
+    *,
+    writers: int = 8,
+    writes: int = 500,
+) -> Dict[Optional[str], float]:
+    """Return ``write_throughput`` for each durability mode in ``modes``."""
+    return {
+        mode: write_throughput(mode, writers=writers, writes=writes) for mode in modes
+    }
+
+
+def snapshot_load_time(keys: int) -> float:
+    """Return the seconds ``ReactiveStore.load_snapshot`` takes for ``keys`` keys.
+
+    The file is written directly with ``write_snapshot`` because populating a
+    store with millions of keys through ``set_many`` dominates the run.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "store.snap")
+        paths = sorted(f"bench.g{index % 1000}.k{index}" for index in range(keys))
+        write_snapshot(
+            path,
+            1,
+            ((key, pickle.dumps(index)) for index, key in enumerate(paths)),
+        )
+        start = time.perf_counter()
+        store = ReactiveStore.load_snapshot(path)
+        elapsed = time.perf_counter() - start
+        store.shutdown()
+    return elapsed
+
+
+def _serve(address: Address, addresses: Any) -> None:
+    store = ReactiveStore()
+    server = StoreServer(store, address)
+    addresses.put(server.address)
+    server.serve_forever()
+
+
+def remote_throughput(
+    transport: Optional[str], *, requests: int = 2000, batch: int = 100
+) -> Tuple[float, float]:
+    """Return ``(round trip microseconds, pipelined gets per second)``.
+
+    ``transport`` is ``"unix"`` or ``"tcp"`` for a server in a separate
+    process, or ``None`` to call an in-process store directly. Round trips
+    are sequential ``get`` calls; the pipelined rate sends ``batch`` gets per
+    :meth:`~.client.StoreClient.pipeline` call.
+    """
+    if transport is None:
+        with ReactiveStore() as store:
+            store.set("bench.value", 1)
+            start = time.perf_counter()
+            for _ in range(requests):
+                store.get("bench.value")
+            elapsed = time.perf_counter() - start
+        return elapsed / requests * 1e6, requests / elapsed
+
+    with tempfile.TemporaryDirectory() as directory:
+        address: Address = (
+            os.path.join(directory, "store.sock")
+            if transport == "unix"
+            else ("127.0.0.1", 0)
+        )
+        context = multiprocessing.get_context("spawn")
+        addresses = context.Queue()
+        process = context.Process(target=_serve, args=(address, addresses))
+        process.start()
+        try:
+            with StoreClient(addresses.get(timeout=30.0)) as client:
+                client.set("bench.value", 1)
+                start = time.perf_counter()
+                for _ in range(requests):
+                    client.get("bench.value")
+                latency = (time.perf_counter() - start) / requests * 1e6
+                start = time.perf_counter()
+                for _ in range(max(1, requests // batch)):
+                    pipeline = client.pipeline()
+                    for _ in range(batch):
+                        pipeline.get("bench.value")
+                    pipeline.execute()
+                rate = max(1, requests // batch) * batch / (time.perf_counter() - start)
+        finally:
+            process.terminate()
+            process.join()
+    return latency, rate
+
+
+def run_remote(
+    transports: Sequence[Optional[str]] = (None, "unix", "tcp"),
+    *,
+    requests: int = 2000,
+    batch: int = 100,
+) -> Dict[Optional[str], Tuple[float, float]]:
+    """Return ``remote_throughput`` for each entry of ``transports``."""
+    return {
+        transport: remote_throughput(transport, requests=requests, batch=batch)
+        for transport in transports
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ReactiveStore benchmarks")
+    parser.add_argument(
+        "--suite", choices=["fanout", "wal", "snapshot", "remote"], default="fanout"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--subscriptions", type=int, default=32)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument(
+        "--callback-delay",
+        type=float,
+        default=0.0005,
+        help="Seconds each callback sleeps to simulate I/O",
+    )
+    parser.add_argument(
+        "--writers", type=int, default=8, help="Writer threads for --suite wal"
+    )
+    parser.add_argument(
+        "--writes", type=int, default=500, help="Writes per thread for --suite wal"
+    )
+    parser.add_argument(
+        "--keys",
+        type=int,
+        nargs="+",
+        default=[100_000, 1_000_000],
+        help="Snapshot sizes for --suite snapshot",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Requests for --suite remote"
+    )
+    parser.add_argument(
+        "--batch", type=int, default=100, help="Pipeline size for --suite remote"
+    )
+    args = parser.parse_args(argv)
+
+    if args.suite == "remote":
+        print(f"{'transport':>10}  {'round trip us':>13}  {'pipelined ops/s':>15}")
+        for transport, (latency, rate) in run_remote(
+            requests=args.requests, batch=args.batch
+        ).items():
+            print(f"{transport or 'in-process':>10}  {latency:>13.2f}  {rate:>15,.0f}")
+        return 0
+
+    if args.suite == "snapshot":
+        print(f"{'keys':>10}  {'load s':>8}")
+        for keys in args.keys:
+            print(f"{keys:>10,}  {snapshot_load_time(keys):>8.3f}")
+        return 0
+
+    if args.suite == "wal":
+        rates = run_wal(writers=args.writers, writes=args.writes)
+        memory = rates[None]
+        print(f"{'mode':>10}  {'writes/s':>12}  {'vs memory':>9}")
+        for mode, rate in rates.items():
+            print(f"{mode or 'memory':>10}  {rate:>12,.0f}  {rate / memory:>8.2f}x")
+        return 0
+
+    results = run_fanout(
+        args.workers,
+        subscriptions=args.subscriptions,
+        events=args.events,
+        callback_delay=args.callback_delay,
+    )
+    baseline = results[args.workers[0]]
+    print(f"{'workers':>8}  {'events/s':>12}  {'speedup':>8}")
+    for workers, rate in results.items():
+        print(f"{workers:>8}  {rate:>12,.0f}  {rate / baseline:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,391 @@
+"""Client for a ``ReactiveStore`` served by :class:`~.server.StoreServer`.
+
+``StoreClient`` keeps a small pool of persistent connections. Every
+connection is pipelined: callers on different threads share it, each
+request is tagged with an id, and a reader thread matches replies to the
+waiting callers. :meth:`StoreClient.pipeline` sends a whole batch of
+requests with one write. Subscription events are streamed over a separate
+connection and handed to callbacks on one dispatch thread, in order. At
+most ``_EVENT_BACKLOG`` events wait for the callbacks; then the client stops
+reading the connection, so the server holds further events back.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import itertools
+import logging
+import queue
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import Event, PathKey, SubscriptionId
+from .protocol import (
+    DELETE,
+    ERROR,
+    EVENT,
+    GET,
+    LIST,
+    SET,
+    SUBSCRIBE,
+    UNSUBSCRIBE,
+    Address,
+    FrameReader,
+    connect,
+    decode_error,
+    decode_event,
+    encode_frame,
+)
+
+__all__ = ["Pipeline", "StoreClient"]
+
+logger = logging.getLogger(__name__)
+
+_RECV_SIZE = 256 * 1024
+
+# Received events that may wait for the dispatch thread.
+_EVENT_BACKLOG = 1024
+
+Request = Tuple[int, Tuple[Any, ...]]
+
+
+def _path(path: "str | PathKey | None") -> Optional[str]:
+    return path.path if isinstance(path, PathKey) else path
+
+
+class _Connection:
+    """A socket shared by many callers, with replies matched by request id."""
+
+    def __init__(
+        self,
+        address: Address,
+        on_event: Optional[Callable[[Tuple[str, Event]], None]] = None,
+    ) -> None:
+        self.sock = connect(address)
+        self.closed = False
+        self._on_event = on_event
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._reader = threading.Thread(
+            target=self._read_loop, name="ReactiveStoreClient", daemon=True
+        )
+        self._reader.start()
+
+    def submit(self, requests: Sequence[Request]) -> List[concurrent.futures.Future]:
+        """Send ``requests`` with one write and return a future for each.
+
+        Raises ``TypeError``, sending nothing, if an argument is not plain data.
+        """
+        futures: List[concurrent.futures.Future] = []
+        frames: List[bytes] = []
+        with self._lock:
+            if self.closed:
+                raise ConnectionError("Connection to the store server is closed")
+            ids = [next(self._ids) for _ in requests]
+            for request_id, (opcode, args) in zip(ids, requests):
+                frames.append(encode_frame(opcode, request_id, args))
+            for request_id in ids:
+                future: concurrent.futures.Future = concurrent.futures.Future()
+                self._pending[request_id] = future
+                futures.append(future)
+            try:
+                self.sock.sendall(b"".join(frames))
+            except OSError as exc:
+                self._fail(exc)
+                raise ConnectionError("Lost connection to the store server") from exc
+        return futures
+
+    def results(
+        self, futures: List[concurrent.futures.Future], timeout: float
+    ) -> List[Any]:
+        """Wait for ``futures`` from :meth:`submit`, forgetting them on timeout."""
+        try:
+            return [future.result(timeout) for future in futures]
+        except concurrent.futures.TimeoutError:
+            abandoned = set(futures)
+            with self._lock:
+                for request_id, future in list(self._pending.items()):
+                    if future in abandoned:
+                        del self._pending[request_id]
+            raise
+
+    def close(self) -> None:
+        with contextlib.suppress(OSError):
+            self.sock.shutdown(socket.SHUT_RDWR)
+        self._reader.join()
+        self.sock.close()
+
+    def _read_loop(self) -> None:
+        reader = FrameReader()
+        error: BaseException = ConnectionError("Store server closed the connection")
+        try:
+            while True:
+                data = self.sock.recv(_RECV_SIZE)
+                if not data:
+                    break
+                for opcode, request_id, payload in reader.feed(data):
+                    if opcode == EVENT:
+                        if self._on_event is not None:
+                            token, event = payload
+                            self._on_event((token, decode_event(event)))
+                        continue
+                    future = self._pending.pop(request_id, None)
+                    if future is None:
+                        continue
+                    if opcode == ERROR:
+                        future.set_exception(decode_error(payload))
+                    else:
+                        future.set_result(payload)
+        except (OSError, ConnectionError) as exc:
+            error = exc
+        with self._lock:
+            self._fail(error)
+
+    def _fail(self, error: BaseException) -> None:
+        # Called with ``_lock`` held.
+        self.closed = True
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if isinstance(error, ConnectionError):
+                future.set_exception(error)
+            else:
+                future.set_exception(ConnectionError(str(error)))
+
+
+class Pipeline:
+    """Requests collected by :meth:`StoreClient.pipeline` and sent together.
+
+    Each method queues a request and returns the pipeline, so calls can be
+    chained. :meth:`execute` sends them with one write and returns their
+    results in order, raising the first error a request produced.
+    """
+
+    def __init__(self, client: "StoreClient") -> None:
+        self._client = client
+        self._requests: List[Request] = []
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def get(self, path: str | PathKey) -> "Pipeline":
+        self._requests.append((GET, (_path(path),)))
+        return self
+
+    def set(self, path: str | PathKey, value: Any) -> "Pipeline":
+        self._requests.append((SET, (_path(path), value)))
+        return self
+
+    def delete(self, path: str | PathKey) -> "Pipeline":
+        self._requests.append((DELETE, (_path(path),)))
+        return self
+
+    def list(self, prefix: str | PathKey | None = None) -> "Pipeline":
+        self._requests.append((LIST, (_path(prefix),)))
+        return self
+
+    def execute(self) -> List[Any]:
+        requests, self._requests = self._requests, []
+        if not requests:
+            return []
+        connection = self._client._connection()
+        return connection.results(connection.submit(requests), self._client.timeout)
+
+
+class StoreClient:
+    """Access a remote ``ReactiveStore`` at ``address``.
+
+    Requests are spread round-robin over up to ``pool_size`` connections,
+    which are opened on first use and reopened after a failure. Calls wait
+    at most ``timeout`` seconds for a reply. The client is thread-safe.
+
+    Subscriptions live on their own connection. If it is lost, its
+    subscriptions end; callbacks are not resubscribed automatically.
+    """
+
+    def __init__(
+        self, address: Address, *, pool_size: int = 4, timeout: float = 10.0
+    ) -> None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.address = address
+        self.timeout = timeout
+        self._pool: List[Optional[_Connection]] = [None] * pool_size
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._events: Optional[_Connection] = None
+        self._callbacks: Dict[SubscriptionId, Callable[[Event], Any]] = {}
+        self._event_queue: "queue.Queue[Optional[Tuple[str, Event]]]" = queue.Queue(
+            _EVENT_BACKLOG
+        )
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def get(self, path: str | PathKey) -> Any | None:
+        return self._call(GET, _path(path))
+
+    def set(self, path: str | PathKey, value: Any) -> None:
+        self._call(SET, _path(path), value)
+
+    def delete(self, path: str | PathKey) -> None:
+        self._call(DELETE, _path(path))
+
+    def list(self, prefix: str | PathKey | None = None) -> Tuple[str, ...]:
+        return self._call(LIST, _path(prefix))
+
+    def pipeline(self) -> Pipeline:
+        """Return a :class:`Pipeline` that sends its requests in one batch."""
+        return Pipeline(self)
+
+    def subscribe(
+        self,
+        selector: str | PathKey,
+        callback: Callable[[Event], Any],
+        *,
+        max_queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+        conflate: "bool | str" = False,
+    ) -> SubscriptionId:
+        """Register ``callback`` for remote changes matching ``selector``.
+
+        The options are applied to the subscription in the server's store,
+        so ``max_queue_size`` and ``overflow`` bound the events waiting to be
+        sent to this client. Callbacks run on one client thread in order;
+        when they fall behind, the client stops reading events and those
+        limits take effect.
+        """
+        options = {
+            "max_queue_size": max_queue_size,
+            "overflow": overflow,
+            "conflate": conflate,
+        }
+        token = str(uuid.uuid4())
+        with self._lock:
+            connection = self._event_connection()
+            self._callbacks[token] = callback
+        try:
+            self._wait(connection, SUBSCRIBE, (token, _path(selector), options))
+        except BaseException:
+            with self._lock:
+                self._callbacks.pop(token, None)
+            raise
+        return token
+
+    def unsubscribe(self, subscription_id: SubscriptionId) -> None:
+        with self._lock:
+            if self._callbacks.pop(subscription_id, None) is None:
+                return
+            connection = self._events
+        if connection is not None and not connection.closed:
+            self._wait(connection, UNSUBSCRIBE, (subscription_id,))
+
+    def close(self) -> None:
+        """Close every connection; remote subscriptions end with them."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            connections = [c for c in self._pool if c is not None]
+            if self._events is not None:
+                connections.append(self._events)
+            self._callbacks.clear()
+        for connection in connections:
+            connection.close()
+        if self._dispatcher is not None:
+            # A full queue means the dispatcher is busy; it stops after the
+            # callback it is running, seeing ``_closed``.
+            with contextlib.suppress(queue.Full):
+                self._event_queue.put_nowait(None)
+            if self._dispatcher is not threading.current_thread():
+                self._dispatcher.join()
+
+    def _call(self, opcode: int, *args: Any) -> Any:
+        return self._wait(self._connection(), opcode, args)
+
+    def _wait(self, connection: _Connection, opcode: int, args: Tuple) -> Any:
+        futures = connection.submit([(opcode, args)])
+        if (
+            connection is self._events
+            and self._dispatcher is threading.current_thread()
+        ):
+            # A callback is waiting for a reply that the reader may only read
+            # once there is room in the event queue, so keep delivering events.
+            self._dispatch_until(futures[0])
+        (result,) = connection.results(futures, self.timeout)
+        return result
+
+    def _connection(self) -> _Connection:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("StoreClient is closed")
+            index = next(self._turn) % len(self._pool)
+            connection = self._pool[index]
+            if connection is None or connection.closed:
+                connection = self._pool[index] = _Connection(self.address)
+            return connection
+
+    def _event_connection(self) -> _Connection:
+        # Called with ``_lock`` held.
+        if self._closed:
+            raise RuntimeError("StoreClient is closed")
+        if self._events is None or self._events.closed:
+            self._events = _Connection(self.address, self._queue_event)
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop,
+                name="ReactiveStoreClientEvents",
+                daemon=True,
+            )
+            self._dispatcher.start()
+        return self._events
+
+    def _queue_event(self, item: Tuple[str, Event]) -> None:
+        # Runs on the event connection's reader thread, which stops reading
+        # from the socket while the queue is full.
+        while not self._closed:
+            try:
+                self._event_queue.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    def _dispatch_loop(self) -> None:
+        while not self._closed:
+            item = self._event_queue.get()
+            if item is None:
+                return
+            self._deliver(item)
+
+    def _dispatch_until(self, future: concurrent.futures.Future) -> None:
+        deadline = time.monotonic() + self.timeout
+        while not future.done() and not self._closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                item = self._event_queue.get(timeout=min(remaining, 0.05))
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            self._deliver(item)
+
+    def _deliver(self, item: Tuple[str, Event]) -> None:
+        token, event = item
+        callback = self._callbacks.get(token)
+        if callback is None:
+            return
+        try:
+            callback(event)
+        except Exception:
+            logger.exception("Subscription callback for %s failed", token)
+
+    def __enter__(self) -> "StoreClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,252 @@
+"""Binary wire protocol shared by the store server and client.
+
+Every message is one frame::
+
+    <u32 payload length> <u8 opcode> <u32 request id> <payload>
+
+The payload is a pickled tuple of arguments or a result. ``ERROR`` frames
+carry an ``(exception name, message)`` pair and ``EVENT`` frames a
+``(subscription token, event tuple)`` pair; see :func:`encode_error` and
+:func:`encode_event`. Requests carry a client-chosen id that the server
+echoes in its reply, so a client may send many requests before reading any
+reply (pipelining). Replies come back in request order on each connection.
+``EVENT`` frames use request id ``0``.
+
+Payloads may only hold plain data: ``None``, booleans, ints, floats,
+strings, bytes, bytearrays, and lists, tuples, dicts and sets of them.
+:func:`encode_frame` raises ``TypeError`` for anything else, and
+:class:`FrameReader` decodes with an unpickler that refuses to load any
+class or function, so a peer cannot make the reader run code or build
+objects larger than its frame. :func:`listen` only serves Unix domain
+sockets, readable by their owner alone, and loopback TCP addresses.
+"""
+
+from __future__ import annotations
+
+import io
+import ipaddress
+import os
+import pickle
+import socket
+import struct
+import threading
+from typing import Any, Dict, List, Tuple, Type, Union
+
+from . import Event
+
+__all__ = [
+    "Address",
+    "DELETE",
+    "ERROR",
+    "EVENT",
+    "FrameReader",
+    "GET",
+    "LIST",
+    "MAX_FRAME_SIZE",
+    "RESULT",
+    "SET",
+    "SUBSCRIBE",
+    "UNSUBSCRIBE",
+    "connect",
+    "decode_error",
+    "decode_event",
+    "encode_error",
+    "encode_event",
+    "encode_frame",
+    "listen",
+]
+
+# A Unix domain socket path, or a ``(host, port)`` pair for TCP.
+Address = Union[str, Tuple[str, int]]
+
+GET = 1
+SET = 2
+DELETE = 3
+LIST = 4
+SUBSCRIBE = 5
+UNSUBSCRIBE = 6
+
+RESULT = 64
+ERROR = 65
+EVENT = 66
+
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+_HEADER = struct.Struct("<IBI")
+
+Frame = Tuple[int, int, Any]
+
+
+# Exceptions a server reports by name; others arrive as ``RuntimeError``.
+_ERRORS: Dict[str, Type[Exception]] = {
+    error.__name__: error
+    for error in (
+        ConnectionError,
+        KeyError,
+        LookupError,
+        RuntimeError,
+        TypeError,
+        ValueError,
+    )
+}
+
+
+class _Pickler(pickle.Pickler):
+    # Only called for objects other than None, booleans and exact ints,
+    # floats, strings, bytes, lists, tuples, dicts, sets and frozensets.
+    # Protocol 5 writes a bytearray with its own opcode, naming no class.
+    def reducer_override(self, obj: Any) -> Any:
+        if type(obj) is bytearray:
+            return NotImplemented
+        raise TypeError(
+            f"{type(obj).__name__} values cannot be sent to or from a store server"
+        )
+
+
+class _Unpickler(pickle.Unpickler):
+    # Plain data never names a class, so neither may a payload.
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"Payload refers to {module}.{name}")
+
+
+# Building a pickler costs more than pickling a small request, so each thread
+# keeps one.
+_local = threading.local()
+
+
+def encode_frame(opcode: int, request_id: int, payload: Any) -> bytes:
+    """Encode one frame; raises ``TypeError`` if ``payload`` is not plain data."""
+    try:
+        stream, pickler = _local.pickler
+    except AttributeError:
+        stream = io.BytesIO()
+        pickler = _Pickler(stream, protocol=pickle.HIGHEST_PROTOCOL)
+        _local.pickler = stream, pickler
+    stream.seek(0)
+    stream.truncate()
+    pickler.clear_memo()
+    try:
+        pickler.dump(payload)
+    except BaseException:
+        # Do not reuse a pickler that stopped halfway through a payload.
+        del _local.pickler
+        raise
+    body = stream.getvalue()
+    return _HEADER.pack(len(body), opcode, request_id) + body
+
+
+def encode_error(exc: BaseException) -> Tuple[str, str]:
+    return type(exc).__name__, str(exc)
+
+
+def decode_error(payload: Tuple[str, str]) -> Exception:
+    name, message = payload
+    error = _ERRORS.get(name)
+    if error is None:
+        return RuntimeError(f"{name}: {message}")
+    return error(message)
+
+
+def encode_event(event: Event) -> Tuple[Any, ...]:
+    return (
+        event.type,
+        event.path,
+        event.value,
+        event.timestamp,
+        event.version,
+        event.origin,
+        tuple(encode_event(change) for change in event.changes),
+    )
+
+
+def decode_event(payload: Tuple[Any, ...]) -> Event:
+    event_type, path, value, timestamp, version, origin, changes = payload
+    return Event(
+        event_type,
+        path,
+        value,
+        timestamp,
+        version,
+        origin,
+        tuple(decode_event(change) for change in changes),
+    )
+
+
+class FrameReader:
+    """Split a byte stream into ``(opcode, request id, payload)`` frames.
+
+    Raises ``ConnectionError`` for a frame that is too large or whose
+    payload is not plain data.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Frame]:
+        """Add ``data`` and return every frame it completes."""
+        buffer = self._buffer
+        buffer += data
+        headers: List[Tuple[int, int, int, int]] = []
+        offset = 0
+        while len(buffer) - offset >= _HEADER.size:
+            length, opcode, request_id = _HEADER.unpack_from(buffer, offset)
+            if length > MAX_FRAME_SIZE:
+                raise ConnectionError(f"Frame of {length} bytes exceeds the limit")
+            start = offset + _HEADER.size
+            if len(buffer) - start < length:
+                break
+            headers.append((opcode, request_id, start, length))
+            offset = start + length
+        if not headers:
+            return []
+        # One unpickler decodes every frame completed by ``data``; building
+        # one per frame would cost more than decoding a small request.
+        stream = io.BytesIO(buffer[:offset])
+        del buffer[:offset]
+        unpickler = _Unpickler(stream)
+        frames: List[Frame] = []
+        for opcode, request_id, start, length in headers:
+            stream.seek(start)
+            try:
+                payload = unpickler.load()
+            except Exception as exc:
+                raise ConnectionError(f"Malformed frame payload: {exc}") from exc
+            if stream.tell() != start + length:
+                raise ConnectionError("Frame payload does not match its length")
+            frames.append((opcode, request_id, payload))
+        return frames
+
+
+def connect(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address)
+        return sock
+    sock = socket.create_connection(address)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def listen(address: Address, backlog: int = 128) -> socket.socket:
+    """Return a listening socket, replacing a stale Unix socket file.
+
+    A Unix socket file is made accessible to its owner only. TCP addresses
+    must resolve to a loopback address, or ``ValueError`` is raised.
+    """
+    if isinstance(address, str):
+        if os.path.exists(address):
+            os.unlink(address)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(address)
+        # Nobody can connect before ``listen``, so there is no window in
+        # which the file has the umask's permissions and accepts clients.
+        os.chmod(address, 0o600)
+    else:
+        host, port = address
+        if not ipaddress.ip_address(socket.gethostbyname(host)).is_loopback:
+            raise ValueError(f"Refusing to serve on non-loopback address {host!r}")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
@@ -0,0 +1,332 @@
+"""Serve a ``ReactiveStore`` to other processes.
+
+``StoreServer`` listens on a Unix domain socket or a loopback TCP address and
+speaks the frame protocol in :mod:`projects.reactive_store.protocol`. Each
+connection is handled by its own thread, which reads every request that has
+arrived, runs them in order and answers them with a single write, so
+pipelined requests cost one system call per batch. Subscription events are
+written to the connection that created the subscription by a writer thread
+of that connection, so store workers never wait for a slow client: once
+``_EVENT_BUFFER`` events are waiting to be written, the subscriptions'
+callbacks return awaitables that finish when the writer catches up, and
+later events wait in the store, where each subscription's ``max_queue_size``
+and ``overflow`` apply.
+
+Run ``python -m projects.reactive_store.server --unix /tmp/store.sock`` to
+serve a fresh store from its own process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import logging
+import os
+import socket
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from . import Event, ReactiveStore, SubscriptionId
+from .protocol import (
+    DELETE,
+    ERROR,
+    EVENT,
+    GET,
+    LIST,
+    RESULT,
+    SET,
+    SUBSCRIBE,
+    UNSUBSCRIBE,
+    Address,
+    FrameReader,
+    encode_error,
+    encode_event,
+    encode_frame,
+    listen,
+)
+
+__all__ = ["StoreServer"]
+
+logger = logging.getLogger(__name__)
+
+_RECV_SIZE = 256 * 1024
+
+# Encoded events a connection buffers before its subscriptions wait.
+_EVENT_BUFFER = 1024
+
+
+class _Connection:
+    """One client connection and the subscriptions it created."""
+
+    def __init__(self, server: "StoreServer", sock: socket.socket) -> None:
+        self.server = server
+        self.sock = sock
+        self.thread = threading.Thread(
+            target=self.serve, name="ReactiveStoreServerConnection", daemon=True
+        )
+        self._send_lock = threading.Lock()
+        # Encoded events for ``_write_events``, guarded by ``_events_ready``.
+        self._events: Deque[bytes] = deque()
+        self._events_ready = threading.Condition(threading.Lock())
+        # Completed once a full event buffer has room again.
+        self._space: Optional["concurrent.futures.Future[None]"] = None
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        # Client subscription token -> store subscription id.
+        self._subscriptions: Dict[str, SubscriptionId] = {}
+        self._handlers: Dict[int, Callable[..., Any]] = {
+            GET: server.store.get,
+            SET: server.store.set,
+            DELETE: server.store.delete,
+            LIST: server.store.list,
+            SUBSCRIBE: self._subscribe,
+            UNSUBSCRIBE: self._unsubscribe,
+        }
+
+    def serve(self) -> None:
+        reader = FrameReader()
+        try:
+            while True:
+                data = self.sock.recv(_RECV_SIZE)
+                if not data:
+                    break
+                replies = [
+                    self._handle(opcode, request_id, args)
+                    for opcode, request_id, args in reader.feed(data)
+                ]
+                if replies:
+                    self.send(b"".join(replies))
+        except (OSError, ConnectionError) as exc:
+            if not self.server.closed:
+                logger.debug("Closing store connection: %s", exc)
+        finally:
+            self.close()
+
+    def send(self, data: bytes) -> None:
+        with self._send_lock:
+            self.sock.sendall(data)
+
+    def close(self) -> None:
+        for subscription_id in list(self._subscriptions.values()):
+            self.server.store.unsubscribe(subscription_id)
+        self._subscriptions.clear()
+        self._stop_writer()
+        with contextlib.suppress(OSError):
+            self.sock.shutdown(socket.SHUT_RDWR)
+        self.sock.close()
+        self.server._forget(self)
+
+    def _handle(self, opcode: int, request_id: int, args: Any) -> bytes:
+        handler = self._handlers.get(opcode)
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown opcode {opcode}")
+            return encode_frame(RESULT, request_id, handler(*args))
+        except Exception as exc:
+            return encode_frame(ERROR, request_id, encode_error(exc))
+
+    def _subscribe(self, token: str, selector: str, options: Dict[str, Any]) -> None:
+        if token in self._subscriptions:
+            raise ValueError(f"Subscription {token!r} already exists")
+
+        def forward(event: Event) -> Optional[Awaitable[None]]:
+            try:
+                frame = encode_frame(EVENT, 0, (token, encode_event(event)))
+            except TypeError as exc:
+                logger.warning("Not sending event for %s: %s", event.path, exc)
+                return None
+            return self._queue_event(frame)
+
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_events,
+                name="ReactiveStoreServerEvents",
+                daemon=True,
+            )
+            self._writer.start()
+        # Resending to a broken connection cannot succeed, so failed events
+        # go straight to the store's dead-letter hook.
+        self._subscriptions[token] = self.server.store.subscribe(
+            selector, forward, retry_on_error=False, **options
+        )
+
+    def _unsubscribe(self, token: str) -> None:
+        subscription_id = self._subscriptions.pop(token, None)
+        if subscription_id is not None:
+            self.server.store.unsubscribe(subscription_id)
+
+    def _queue_event(self, frame: bytes) -> Optional[Awaitable[None]]:
+        # Runs on a store worker thread, or on the store's callback loop.
+        with self._events_ready:
+            if self._closed:
+                raise ConnectionError("Store client connection is closed")
+            if len(self._events) >= _EVENT_BUFFER:
+                space = self._space
+                if space is None:
+                    space = self._space = concurrent.futures.Future()
+                return self._queue_later(space, frame)
+            self._events.append(frame)
+            self._events_ready.notify()
+        return None
+
+    async def _queue_later(
+        self, space: "concurrent.futures.Future[None]", frame: bytes
+    ) -> None:
+        # Runs on the store's callback loop; the store keeps the
+        # subscription's later events queued until this finishes.
+        await asyncio.wrap_future(space)
+        retry = self._queue_event(frame)
+        if retry is not None:
+            await retry
+
+    def _write_events(self) -> None:
+        while True:
+            with self._events_ready:
+                while not self._events and not self._closed:
+                    self._events_ready.wait()
+                if self._closed:
+                    return
+                frames = list(self._events)
+                self._events.clear()
+            try:
+                self.send(b"".join(frames))
+            except OSError as exc:
+                # The reader thread notices the broken connection and cleans
+                # up; until then, new events fail instead of piling up.
+                logger.debug("Stopped sending store events: %s", exc)
+                self._stop_writer()
+                return
+            self._release_space()
+
+    def _stop_writer(self) -> None:
+        with self._events_ready:
+            self._closed = True
+            self._events.clear()
+            self._events_ready.notify()
+        self._release_space()
+
+    def _release_space(self) -> None:
+        with self._events_ready:
+            space, self._space = self._space, None
+        # The wait is only done already if the store's loop cancelled it.
+        if space is not None and not space.done():
+            space.set_result(None)
+
+
+class StoreServer:
+    """Expose ``store`` at ``address`` to :class:`~.client.StoreClient` instances.
+
+    ``address`` is a Unix socket path or a ``(host, port)`` pair; port ``0``
+    picks a free port, available afterwards as :attr:`address`. Only
+    loopback hosts are accepted; any local user may connect to those, while
+    a Unix socket is restricted to its owner. Values must be plain data, see
+    :mod:`~.protocol`; events whose value is not are logged and skipped.
+    """
+
+    def __init__(self, store: ReactiveStore, address: Address) -> None:
+        self.store = store
+        self._listener = listen(address)
+        self.address: Address = (
+            address if isinstance(address, str) else self._listener.getsockname()
+        )
+        self.closed = False
+        self._lock = threading.Lock()
+        self._connections: Set[_Connection] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StoreServer":
+        """Accept connections on a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="ReactiveStoreServer", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Accept connections until :meth:`close` is called."""
+        while not self.closed:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                if self.closed:
+                    return
+                raise
+            if sock.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _Connection(self, sock)
+            with self._lock:
+                if self.closed:
+                    sock.close()
+                    return
+                self._connections.add(connection)
+            connection.thread.start()
+
+    def close(self) -> None:
+        """Stop accepting, close every connection and drop its subscriptions.
+
+        The store itself is left running.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            connections: List[_Connection] = list(self._connections)
+        with contextlib.suppress(OSError):
+            # Wakes a thread blocked in ``accept``.
+            self._listener.shutdown(socket.SHUT_RDWR)
+        self._listener.close()
+        if isinstance(self.address, str):
+            with contextlib.suppress(OSError):
+                os.unlink(self.address)
+        for connection in connections:
+            with contextlib.suppress(OSError):
+                connection.sock.shutdown(socket.SHUT_RDWR)
+        for connection in connections:
+            connection.thread.join()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _forget(self, connection: _Connection) -> None:
+        with self._lock:
+            self._connections.discard(connection)
+
+    def __enter__(self) -> "StoreServer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a ReactiveStore")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--unix", help="Unix domain socket path")
+    target.add_argument("--port", type=int, help="TCP port on --host")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--wal", help="Write-ahead log path")
+    parser.add_argument("--snapshot", help="Snapshot file to start from")
+    args = parser.parse_args(argv)
+
+    address: Address = args.unix if args.unix else (args.host, args.port)
+    store = ReactiveStore(wal_path=args.wal, snapshot_path=args.snapshot)
+    try:
+        server = StoreServer(store, address)
+    except ValueError as exc:
+        store.shutdown()
+        parser.error(str(exc))
+    logger.info("Serving ReactiveStore on %s", server.address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        store.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
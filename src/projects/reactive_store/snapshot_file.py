@@ -0,0 +1,146 @@
+"""Binary snapshot files for ``ReactiveStore``.
+
+Layout, all integers little-endian::
+
+    header   magic (8 bytes), u64 version, u64 count,
+             u64 paths offset, u64 offsets offset
+    values   pickled values, concatenated in path order
+    paths    UTF-8 paths joined by newlines, sorted
+    offsets  count + 1 u64 start offsets into the values section
+
+Opening a file memory-maps it and decodes only the path list; lookups
+bisect that list instead of building a dictionary, which keeps loading
+millions of keys well under a second. Values are decoded the first time they
+are read.
+"""
+
+from __future__ import annotations
+
+import array
+import bisect
+import mmap
+import os
+import pickle
+import struct
+import sys
+from typing import Any, Iterable, Iterator, List, Tuple
+
+__all__ = ["SnapshotImage", "write_snapshot"]
+
+_MAGIC = b"RSSNAP01"
+_HEADER = struct.Struct("<8sQQQQ")
+_UNLOADED = object()
+
+
+def write_snapshot(
+    path: str, version: int, entries: Iterable[Tuple[str, bytes]]
+) -> int:
+    """Write ``(path, pickled value)`` entries sorted by path to ``path``.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    never see a partial snapshot. Returns the number of entries written.
+    """
+    temporary = f"{path}.tmp"
+    paths: List[str] = []
+    offsets = array.array("Q", [0])
+    with open(temporary, "wb") as handle:
+        handle.write(b"\0" * _HEADER.size)
+        position = 0
+        for key, payload in entries:
+            handle.write(payload)
+            position += len(payload)
+            paths.append(key)
+            offsets.append(position)
+        paths_offset = _HEADER.size + position
+        blob = "\n".join(paths).encode()
+        handle.write(blob)
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+            offsets.byteswap()
+        handle.write(offsets.tobytes())
+        handle.seek(0)
+        handle.write(
+            _HEADER.pack(
+                _MAGIC, version, len(paths), paths_offset, paths_offset + len(blob)
+            )
+        )
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    return len(paths)
+
+
+class SnapshotImage:
+    """Read-only, memory-mapped view of a snapshot file.
+
+    Values are unpickled on first access and cached. Two threads reading the
+    same value for the first time may both decode it; either result is kept.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, paths_offset, offsets_offset = _HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != _MAGIC:
+            raise ValueError(f"{path!r} is not a ReactiveStore snapshot")
+        self.version: int = version
+        blob = self._mmap[paths_offset:offsets_offset]
+        self.paths: List[str] = blob.decode().split("\n") if count else []
+        if len(self.paths) != count:
+            raise ValueError(f"{path!r} is corrupt")
+        end = offsets_offset + 8 * (count + 1)
+        if sys.byteorder == "little":
+            self._offsets: Any = memoryview(self._mmap)[offsets_offset:end].cast("Q")
+        else:  # pragma: no cover - big-endian hosts
+            self._offsets = array.array("Q", self._mmap[offsets_offset:end])
+            self._offsets.byteswap()
+        self._start = _HEADER.size
+        self._values: List[Any] = [_UNLOADED] * count
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, path: str) -> bool:
+        return self._find(path) >= 0
+
+    def get(self, path: str, default: Any = None) -> Any:
+        index = self._find(path)
+        if index < 0:
+            return default
+        value = self._values[index]
+        if value is _UNLOADED:
+            value = self._values[index] = pickle.loads(self._raw(index))
+        return value
+
+    def raw(self, path: str) -> bytes:
+        """Return the pickled bytes stored for ``path``."""
+        index = self._find(path)
+        if index < 0:
+            raise KeyError(path)
+        return self._raw(index)
+
+    def iter(self, prefix: str) -> Iterator[str]:
+        """Yield ``prefix`` if stored, then every path below it."""
+        if self._find(prefix) >= 0:
+            yield prefix
+        dotted = f"{prefix}."
+        paths = self.paths
+        # Paths below ``prefix`` sort contiguously after ``prefix + "."``.
+        for index in range(bisect.bisect_left(paths, dotted), len(paths)):
+            path = paths[index]
+            if not path.startswith(dotted):
+                break
+            yield path
+
+    def _find(self, path: str) -> int:
+        """Return the index of ``path`` in ``paths``, or ``-1``."""
+        paths = self.paths
+        index = bisect.bisect_left(paths, path)
+        if index < len(paths) and paths[index] == path:
+            return index
+        return -1
+
+    def _raw(self, index: int) -> bytes:
+        start = self._start + self._offsets[index]
+        return self._mmap[start : self._start + self._offsets[index + 1]]
@@ -0,0 +1,194 @@
+"""Tests for the asyncio ReactiveStore facade."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from projects.reactive_store import Event, ReactiveStore
+from projects.reactive_store.aio import AsyncReactiveStore, Watch
+
+
+async def _take(watch, count: int) -> List[Event]:
+    events: List[Event] = []
+    async for event in watch:
+        events.append(event)
+        if len(events) == count:
+            break
+    return events
+
+
+async def _until(condition: Callable[[], object]) -> None:
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+def test_awaitable_reads_and_writes() -> None:
+    async def scenario() -> None:
+        async with AsyncReactiveStore() as store:
+            await store.set("app.name", "demo")
+            await store.set_many({"app.port": 8080, "app.debug": True})
+            assert await store.get("app.name") == "demo"
+            assert await store.exists("app.port")
+            await store.delete("app.debug")
+            assert await store.list("app") == ("app.name", "app.port")
+            assert store.snapshot().get("app.port") == 8080
+
+    asyncio.run(scenario())
+
+
+def test_watch_streams_events_in_order() -> None:
+    async def scenario() -> List[Event]:
+        async with AsyncReactiveStore() as store:
+            async with store.watch("app.*") as watch:
+                await store.set("app.a", 1)
+                await store.set("other", 0)
+                await store.set("app.b", 2)
+                await store.delete("app.a")
+                events = await asyncio.wait_for(_take(watch, 3), timeout=2.0)
+            assert not store._watches
+            assert not store.store._subscriptions.subscriptions()
+            return events
+
+    events = asyncio.run(scenario())
+    assert [(event.type, event.path) for event in events] == [
+        ("set", "app.a"),
+        ("set", "app.b"),
+        ("delete", "app.a"),
+    ]
+
+
+def test_events_are_handed_to_the_loop_in_batches() -> None:
+    async def scenario() -> None:
+        loop = asyncio.get_running_loop()
+        wakeups = 0
+        call_soon_threadsafe = loop.call_soon_threadsafe
+
+        def counting(callback, *args, **kwargs):
+            nonlocal wakeups
+            # Offloaded writes also wake the loop; count only watch flushes.
+            if getattr(callback, "__func__", None) is Watch._flush:
+                wakeups += 1
+            return call_soon_threadsafe(callback, *args, **kwargs)
+
+        async with AsyncReactiveStore() as store:
+            async with store.watch("bulk.*", max_queue_size=5000) as watch:
+                loop.call_soon_threadsafe = counting  # type: ignore[assignment]
+                for index in range(2000):
+                    await store.set("bulk.value", index)
+                events = await asyncio.wait_for(_take(watch, 2000), timeout=5.0)
+                del loop.call_soon_threadsafe
+                assert [event.value for event in events] == list(range(2000))
+                assert 0 < wakeups < 2000
+
+    asyncio.run(scenario())
+
+
+def test_blocking_watch_applies_backpressure() -> None:
+    async def scenario() -> None:
+        async with AsyncReactiveStore() as store:
+            async with store.watch("bp.*", max_queue_size=2) as watch:
+                depths: List[int] = []
+
+                async def produce() -> None:
+                    for index in range(200):
+                        await store.set("bp.value", index)
+                        depths.append(store.store.stats().queued)
+
+                producer = asyncio.ensure_future(produce())
+                await asyncio.sleep(0.1)
+                # Without a consumer the writer stops once both queues are full.
+                assert not producer.done()
+                assert store.store.stats().queued == 2
+                events = await asyncio.wait_for(_take(watch, 200), timeout=5.0)
+                await asyncio.wait_for(producer, timeout=1.0)
+                assert [event.value for event in events] == list(range(200))
+                assert watch.dropped == 0
+                assert max(depths) <= 2
+
+    asyncio.run(scenario())
+
+
+def test_full_blocking_watch_does_not_stall_the_store_worker() -> None:
+    async def scenario() -> None:
+        async with AsyncReactiveStore() as store:
+            others: List[Event] = []
+            store.store.subscribe("other.*", others.append)
+            async with store.watch("slow.*", max_queue_size=1) as watch:
+
+                async def produce() -> None:
+                    for index in range(10):
+                        await store.set("slow.value", index)
+
+                producer = asyncio.ensure_future(produce())
+                # One event is in the watch, one waits for room and one waits
+                # in the store, yet the only worker still delivers to the
+                # other subscription.
+                await asyncio.wait_for(
+                    _until(
+                        lambda: watch._space is not None
+                        and store.store.stats().queued == 1
+                    ),
+                    timeout=2.0,
+                )
+                await store.set("other.value", 1)
+                await asyncio.wait_for(_until(lambda: others), timeout=2.0)
+                events = await asyncio.wait_for(_take(watch, 10), timeout=5.0)
+                await asyncio.wait_for(producer, timeout=1.0)
+                assert [event.value for event in events] == list(range(10))
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "overflow, expected", [("drop_oldest", [17, 18, 19]), ("drop_newest", [0, 1, 2])]
+)
+def test_dropping_watches_keep_the_queue_bounded(overflow: str, expected) -> None:
+    async def scenario() -> List[int]:
+        async with AsyncReactiveStore() as store:
+            async with store.watch("d.*", max_queue_size=3, overflow=overflow) as w:
+                for index in range(20):
+                    await store.set("d.value", index)
+                # Let the store worker deliver everything before consuming.
+                while store.store.stats().delivered < 20:
+                    await asyncio.sleep(0.01)
+                await asyncio.sleep(0.01)
+                assert w.dropped == 17
+                return [event.value for event in await _take(w, 3)]
+
+    assert asyncio.run(scenario()) == expected
+
+
+def test_closing_a_watch_ends_iteration() -> None:
+    async def scenario() -> List[Event]:
+        async with AsyncReactiveStore() as store:
+            watch = store.watch("c.*")
+            consumer = asyncio.ensure_future(_take(watch, 10))
+            await store.set("c.a", 1)
+            await asyncio.sleep(0.05)
+            await watch.aclose()
+            return await asyncio.wait_for(consumer, timeout=1.0)
+
+    assert [event.value for event in asyncio.run(scenario())] == [1]
+
+
+def test_wraps_an_existing_store_and_offloads_synced_writes(tmp_path: Path) -> None:
+    store = ReactiveStore(wal_path=str(tmp_path / "store.wal"))
+
+    async def scenario() -> None:
+        facade = AsyncReactiveStore(store)
+        assert store.durability == "always"
+        assert facade._offload_writes
+        await facade.set("a.b", 1)
+        await facade.aclose()
+
+    try:
+        asyncio.run(scenario())
+        assert store.get("a.b") == 1
+    finally:
+        store.shutdown()
+    with pytest.raises(TypeError):
+        AsyncReactiveStore(store, workers=2)
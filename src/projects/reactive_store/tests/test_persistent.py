@@ -0,0 +1,74 @@
+"""Tests for the persistent map and key trie behind ReactiveStore."""
+
+from __future__ import annotations
+
+import random
+
+from projects.reactive_store._persistent import KeyTrie, PersistentMap
+
+
+class _CollidingKey:
+    def __init__(self, name: int, key_hash: int) -> None:
+        self.name = name
+        self.key_hash = key_hash
+
+    def __hash__(self) -> int:
+        return self.key_hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _CollidingKey) and other.name == self.name
+
+
+def test_persistent_map_matches_dict_and_keeps_old_versions() -> None:
+    rng = random.Random(7)
+    keys = [
+        _CollidingKey(index, rng.choice([1, 2, -7, 2**40 + 5, rng.getrandbits(64)]))
+        for index in range(200)
+    ] + [f"key{index}" for index in range(200)]
+    current = PersistentMap()
+    expected: dict = {}
+    history = []
+    for step in range(4000):
+        key = rng.choice(keys)
+        if rng.random() < 0.6:
+            value = rng.random()
+            current = current.set(key, value)
+            expected[key] = value
+        else:
+            current = current.delete(key)
+            expected.pop(key, None)
+        assert len(current) == len(expected)
+        if step % 500 == 0:
+            history.append((current, dict(expected)))
+
+    assert dict(current.items()) == expected
+    for key in keys:
+        assert current.get(key, "missing") == expected.get(key, "missing")
+        assert (key in current) == (key in expected)
+    for old, snapshot in history:
+        assert dict(old.items()) == snapshot
+
+
+def test_unchanged_updates_return_the_same_map() -> None:
+    value = object()
+    original = PersistentMap().set("a", value)
+    assert original.set("a", value) is original
+    assert original.delete("missing") is original
+    assert len(original.delete("a")) == 0
+
+
+def test_key_trie_lists_prefixes_in_sorted_order_and_prunes() -> None:
+    trie = KeyTrie()
+    for path in ["b.x", "a", "a.c", "a.b.d", "ab"]:
+        trie = trie.add(path)
+    assert list(trie.iter(None)) == ["a", "a.b.d", "a.c", "ab", "b.x"]
+    assert list(trie.iter("a")) == ["a", "a.b.d", "a.c"]
+    assert list(trie.iter("a.b")) == ["a.b.d"]
+    assert list(trie.iter("c")) == []
+
+    pruned = trie.discard("a.b.d")
+    assert pruned.find("a.b") is None
+    assert list(trie.iter("a.b")) == ["a.b.d"]
+    for path in ["b.x", "a", "a.c", "ab"]:
+        pruned = pruned.discard(path)
+    assert len(pruned.children) == 0
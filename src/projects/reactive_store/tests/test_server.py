@@ -0,0 +1,262 @@
+"""Tests for serving a ReactiveStore to other processes."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import pickle
+import stat
+import struct
+import threading
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from projects.reactive_store import Event, ReactiveStore
+from projects.reactive_store.client import StoreClient
+from projects.reactive_store.protocol import (
+    GET,
+    RESULT,
+    SUBSCRIBE,
+    FrameReader,
+    connect,
+    encode_frame,
+    listen,
+)
+from projects.reactive_store.server import StoreServer
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def served(request, tmp_path: Path) -> Iterator[tuple]:
+    address = str(tmp_path / "store.sock") if request.param == "unix" else None
+    store = ReactiveStore()
+    server = StoreServer(store, address or ("127.0.0.1", 0)).start()
+    try:
+        yield store, server
+    finally:
+        server.close()
+        store.shutdown()
+
+
+def test_client_reads_and_writes_the_served_store(served) -> None:
+    store, server = served
+    with StoreClient(server.address, pool_size=2) as client:
+        client.set("app.name", "demo")
+        client.set("app.port", 8080)
+        assert store.get("app.name") == "demo"
+        assert client.get("app.port") == 8080
+        assert client.list("app") == ("app.name", "app.port")
+        client.delete("app.port")
+        assert client.get("app.port") is None
+        with pytest.raises(ValueError, match="Invalid path"):
+            client.set("not valid", 1)
+        assert client.get("app.name") == "demo"
+
+
+def test_pipeline_returns_results_in_order(served) -> None:
+    _, server = served
+    with StoreClient(server.address) as client:
+        pipeline = client.pipeline()
+        for index in range(50):
+            pipeline.set(f"keys.k{index}", index)
+        assert len(pipeline) == 50
+        assert pipeline.execute() == [None] * 50
+        results = client.pipeline().get("keys.k7").delete("keys.k7").list().execute()
+        assert results[:2] == [7, None]
+        assert len(results[2]) == 49
+
+
+def test_pooled_connections_are_shared_by_threads(served) -> None:
+    store, server = served
+    with StoreClient(server.address, pool_size=2) as client:
+
+        def write(worker: int) -> None:
+            for index in range(100):
+                client.set(f"w{worker}.value", index)
+                assert client.get(f"w{worker}.value") == index
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum(c is not None for c in client._pool) == 2
+    assert [store.get(f"w{worker}.value") for worker in range(8)] == [99] * 8
+
+
+def test_subscription_events_are_streamed(served) -> None:
+    store, server = served
+    received: List[Event] = []
+    done = threading.Event()
+
+    def callback(event: Event) -> None:
+        received.append(event)
+        if len(received) == 3:
+            done.set()
+
+    with StoreClient(server.address) as client:
+        subscription_id = client.subscribe("app.*", callback)
+        store.set("app.a", 1)
+        client.set("other", 0)
+        client.set("app.b", 2)
+        store.delete("app.a")
+        assert done.wait(timeout=2.0)
+        assert [(event.type, event.path) for event in received] == [
+            ("set", "app.a"),
+            ("set", "app.b"),
+            ("delete", "app.a"),
+        ]
+        client.unsubscribe(subscription_id)
+        assert store.stats().queued == 0
+        store.set("app.c", 3)
+        assert client.get("app.c") == 3
+    assert len(received) == 3
+
+
+def test_slow_callbacks_push_back_on_the_server(served) -> None:
+    store, server = served
+    release = threading.Event()
+    unsubscribed = threading.Event()
+    received: List[Event] = []
+
+    with StoreClient(server.address) as client:
+
+        def callback(event: Event) -> None:
+            release.wait(timeout=10.0)
+            received.append(event)
+            # Waits for a reply that the reader reads after a full backlog.
+            client.unsubscribe(subscription_id)
+            unsubscribed.set()
+
+        subscription_id = client.subscribe("slow.*", callback, max_queue_size=10)
+
+        def write() -> None:
+            for index in range(6000):
+                store.set("slow.value", "x" * 10_000 + str(index))
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        # Every buffer between the store and the callback fills up, and then
+        # the subscription's queue makes the writer wait.
+        writer.join(timeout=1.0)
+        assert writer.is_alive()
+        assert client._event_queue.qsize() <= 1024
+        release.set()
+        assert unsubscribed.wait(timeout=5.0)
+        writer.join(timeout=5.0)
+        assert not writer.is_alive()
+        assert not store._subscriptions.subscriptions()
+    assert [event.value[-1] for event in received] == ["0"]
+
+
+def test_closing_the_server_drops_remote_subscriptions(tmp_path: Path) -> None:
+    address = str(tmp_path / "store.sock")
+    with ReactiveStore() as store:
+        server = StoreServer(store, address).start()
+        client = StoreClient(address)
+        client.subscribe("*", lambda event: None)
+        assert store._subscriptions.subscriptions()
+        server.close()
+        assert not store._subscriptions.subscriptions()
+        assert not os.path.exists(address)
+        with pytest.raises(OSError):
+            client.get("a")
+        client.close()
+
+
+def test_timed_out_requests_are_forgotten(tmp_path: Path) -> None:
+    address = str(tmp_path / "store.sock")
+    # Accepts connections but never answers.
+    silent = listen(address)
+    try:
+        with StoreClient(address, pool_size=1, timeout=0.05) as client:
+            with pytest.raises(concurrent.futures.TimeoutError):
+                client.get("a")
+            with pytest.raises(concurrent.futures.TimeoutError):
+                client.pipeline().get("a").get("b").execute()
+            assert client._pool[0]._pending == {}
+    finally:
+        silent.close()
+
+
+def test_stalled_client_does_not_hold_up_store_workers(tmp_path: Path) -> None:
+    address = str(tmp_path / "store.sock")
+    with ReactiveStore() as store, StoreServer(store, address).start():
+        stalled = connect(address)
+        try:
+            # Subscribe, then never read the events.
+            options = {"max_queue_size": 10, "overflow": "drop_oldest"}
+            stalled.sendall(encode_frame(SUBSCRIBE, 1, ("t", "slow.*", options)))
+            stalled.settimeout(2.0)
+            assert FrameReader().feed(stalled.recv(1024)) == [(RESULT, 1, None)]
+
+            delivered = threading.Event()
+            store.subscribe("other.*", lambda event: delivered.set())
+            for index in range(2000):
+                store.set("slow.value", "x" * 10_000 + str(index))
+            store.set("other.value", 1)
+            assert delivered.wait(timeout=2.0)
+            assert store.stats().dropped > 0
+        finally:
+            stalled.close()
+
+
+class _Exploit:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __reduce__(self):
+        return (os.mkdir, (self.path,))
+
+
+def test_frames_that_load_classes_are_rejected(tmp_path: Path) -> None:
+    address = str(tmp_path / "store.sock")
+    exploit = _Exploit(str(tmp_path / "pwned"))
+    body = pickle.dumps(exploit)
+    with ReactiveStore() as store, StoreServer(store, address).start():
+        sock = connect(address)
+        try:
+            sock.sendall(struct.pack("<IBI", len(body), GET, 1) + body)
+            sock.settimeout(2.0)
+            assert sock.recv(1024) == b""
+        finally:
+            sock.close()
+    assert not os.path.exists(exploit.path)
+
+
+def test_frames_cannot_build_objects_beyond_their_size() -> None:
+    # bytearray(100_000_000) in 27 bytes, through the ``bytearray`` global.
+    body = b"\x80\x05cbuiltins\nbytearray\nJ\x00\xe1\xf5\x05\x85R."
+    with pytest.raises(ConnectionError, match="builtins.bytearray"):
+        FrameReader().feed(struct.pack("<IBI", len(body), GET, 1) + body)
+
+
+def test_values_must_be_plain_data(served) -> None:
+    store, server = served
+    with StoreClient(server.address) as client:
+        plain = {"a": [1, 2.5, "x", b"y", None], "b": {(1, 2)}, "c": bytearray(2)}
+        client.set("plain", plain)
+        assert client.get("plain") == plain
+        with pytest.raises(TypeError, match="Path values cannot be sent"):
+            client.set("path", Path("/tmp"))
+        with pytest.raises(TypeError, match="complex values cannot be sent"):
+            client.set("complex", 3j)
+        store.set("path", Path("/tmp"))
+        with pytest.raises(TypeError, match="Path values cannot be sent"):
+            client.get("path")
+        assert client.get("plain") == plain
+
+
+def test_only_the_owner_can_use_a_unix_socket(tmp_path: Path) -> None:
+    address = str(tmp_path / "store.sock")
+    with ReactiveStore() as store, StoreServer(store, address):
+        assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+
+
+def test_refuses_to_listen_beyond_loopback() -> None:
+    with ReactiveStore() as store:
+        with pytest.raises(ValueError, match="non-loopback"):
+            StoreServer(store, ("0.0.0.0", 0))
+        with pytest.raises(ValueError, match="non-loopback"):
+            StoreServer(store, ("192.0.2.1", 0))
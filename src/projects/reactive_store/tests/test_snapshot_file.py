@@ -0,0 +1,195 @@
+"""Tests for ReactiveStore snapshot files."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from projects.reactive_store import ReactiveStore
+from projects.reactive_store.snapshot_file import SnapshotImage, _UNLOADED
+from projects.reactive_store.wal import read_log
+
+
+def _populated(path: str) -> int:
+    with ReactiveStore() as store:
+        store.set_many(
+            {
+                "app": "root",
+                "app.name": "demo",
+                "app.db.host": "localhost",
+                "app.db.port": 5432,
+                "app_other": [1, 2],
+                "zeta": {"nested": True},
+            }
+        )
+        return store.save_snapshot(path)
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "store.snap")
+    version = _populated(path)
+
+    with ReactiveStore.load_snapshot(path) as store:
+        assert store.snapshot().version == version
+        assert len(store.snapshot()) == 6
+        assert store.get("app.db.port") == 5432
+        assert store.exists("app") and not store.exists("app.db")
+        assert store.list("app") == ("app", "app.db.host", "app.db.port", "app.name")
+        assert store.get_tree() == {
+            "app": {
+                "": "root",
+                "name": "demo",
+                "db": {"host": "localhost", "port": 5432},
+            },
+            "app_other": [1, 2],
+            "zeta": {"nested": True},
+        }
+
+
+def test_values_are_decoded_on_first_read(tmp_path: Path) -> None:
+    path = str(tmp_path / "store.snap")
+    _populated(path)
+    image = SnapshotImage(path)
+
+    assert all(value is _UNLOADED for value in image._values)
+    assert image.get("zeta") == {"nested": True}
+    assert image.get("zeta") is image.get("zeta")
+    assert sum(value is not _UNLOADED for value in image._values) == 1
+    assert image.get("missing", "default") == "default"
+
+
+def test_writes_after_load_overlay_the_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "store.snap")
+    version = _populated(path)
+
+    with ReactiveStore.load_snapshot(path) as store:
+        store.set("app.name", "changed")
+        store.set("app.cache.size", 10)
+        store.delete("app")
+        store.delete_tree("app.db")
+        assert store.snapshot().version == version + 4
+        assert len(store.snapshot()) == 4
+        assert store.get("app") is None
+        assert store.list() == ("app.cache.size", "app.name", "app_other", "zeta")
+        assert store.get_tree("app") == {"cache": {"size": 10}, "name": "changed"}
+
+        store.set("app.db.host", "db")
+        assert len(store.snapshot()) == 5
+        resaved = str(tmp_path / "again.snap")
+        store.save_snapshot(resaved)
+
+    with ReactiveStore.load_snapshot(resaved) as store:
+        assert store.get_tree("app") == {
+            "cache": {"size": 10},
+            "db": {"host": "db"},
+            "name": "changed",
+        }
+        assert store.get("zeta") == {"nested": True}
+
+
+def test_background_snapshot_does_not_block_writers(tmp_path: Path) -> None:
+    path = str(tmp_path / "store.snap")
+    store = ReactiveStore()
+    try:
+        store.set_many({f"keys.k{index}": index for index in range(2000)})
+        before = store.snapshot()
+        future = store.start_snapshot(path)
+        stop = threading.Event()
+
+        def write() -> None:
+            index = 0
+            while not stop.is_set():
+                store.set("keys.k0", -index)
+                index += 1
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        assert future.result(timeout=10.0) == before.version
+        stop.set()
+        writer.join()
+    finally:
+        store.shutdown()
+
+    with ReactiveStore.load_snapshot(path) as restored:
+        assert len(restored.snapshot()) == 2000
+        assert restored.get("keys.k0") == 0
+        assert restored.snapshot().version == before.version
+
+
+def test_snapshot_with_write_ahead_log(tmp_path: Path) -> None:
+    snapshot_path = str(tmp_path / "store.snap")
+    wal_path = str(tmp_path / "store.wal")
+    with ReactiveStore(wal_path=wal_path) as store:
+        store.set("a.b", 1)
+        store.save_snapshot(snapshot_path)
+        store.set("a.c", 2)
+        store.delete("a.b")
+
+    with ReactiveStore.load_snapshot(snapshot_path, wal_path=wal_path) as store:
+        assert store.list() == ("a.c",)
+        assert store.snapshot().version == 3
+
+
+def test_snapshot_compacts_the_write_ahead_log(tmp_path: Path) -> None:
+    snapshot_path = str(tmp_path / "store.snap")
+    wal_path = str(tmp_path / "store.wal")
+    with ReactiveStore(wal_path=wal_path) as store:
+        for index in range(200):
+            store.set(f"keys.k{index}", "x" * 100)
+        store.save_snapshot(snapshot_path, compact_log=False)
+        assert len(list(read_log(wal_path))) == 200
+        store.save_snapshot(snapshot_path)
+        store.set("keys.k0", "changed")
+    assert os.path.getsize(wal_path) < 200
+    assert [(version, changes) for version, changes in read_log(wal_path)] == [
+        (200, None),
+        (201, [("set", "keys.k0", "changed")]),
+    ]
+    assert [version for version, _ in read_log(wal_path, after=200)] == [201]
+
+    with ReactiveStore.load_snapshot(snapshot_path, wal_path=wal_path) as store:
+        assert store.snapshot().version == 201
+        assert len(store.snapshot()) == 200
+        assert store.get("keys.k0") == "changed"
+    with pytest.raises(ValueError, match="continues from the snapshot at version 200"):
+        ReactiveStore(wal_path=wal_path)
+
+
+def test_background_snapshot_compacts_the_log_while_writing(tmp_path: Path) -> None:
+    snapshot_path = str(tmp_path / "store.snap")
+    wal_path = str(tmp_path / "store.wal")
+    store = ReactiveStore(
+        wal_path=wal_path, durability="interval", fsync_interval=0.001
+    )
+    try:
+        store.set_many({f"keys.k{index}": 0 for index in range(1000)})
+        stop = threading.Event()
+
+        def write() -> None:
+            index = 0
+            while not stop.is_set():
+                index += 1
+                store.set(f"keys.k{index % 1000}", index)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        for _ in range(3):
+            store.start_snapshot(snapshot_path).result(timeout=10.0)
+        stop.set()
+        writer.join()
+        expected = store.get_tree()
+    finally:
+        store.shutdown()
+
+    with ReactiveStore.load_snapshot(snapshot_path, wal_path=wal_path) as restored:
+        assert restored.get_tree() == expected
+
+
+def test_rejects_files_that_are_not_snapshots(tmp_path: Path) -> None:
+    path = tmp_path / "store.snap"
+    path.write_bytes(b"not a snapshot".ljust(64, b"\0"))
+    with pytest.raises(ValueError, match="not a ReactiveStore snapshot"):
+        ReactiveStore.load_snapshot(str(path))
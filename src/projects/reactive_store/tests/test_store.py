@@ -11,7 +11,7 @@ from typing import List
 
 import pytest
 
-from projects.reactive_store import Event, ReactiveStore
+from projects.reactive_store import BATCH_ROOT, Event, PathKey, ReactiveStore
 
 
 def _drain_events(
@@ -45,6 +45,114 @@ def test_basic_operations_snapshot_and_listing() -> None:
         store.shutdown()
 
 
+def test_prefix_listing_and_subtree_operations() -> None:
+    store = ReactiveStore()
+    events: "queue.Queue[Event]" = queue.Queue()
+    try:
+        store.set_many(
+            {
+                "app": "root",
+                "app.db.host": "localhost",
+                "app.db.port": 5432,
+                "app.cache": True,
+                "application.name": "other",
+            }
+        )
+        assert set(store.list("app")) == {
+            "app",
+            "app.db.host",
+            "app.db.port",
+            "app.cache",
+        }
+        assert store.list("app.db.host.missing") == ()
+        assert store.get_tree("app") == {
+            "": "root",
+            "db": {"host": "localhost", "port": 5432},
+            "cache": True,
+        }
+        assert store.get_tree("app.db.port") == {"": 5432}
+        assert store.get_tree("missing") == {}
+
+        store.subscribe("*", events.put)
+        assert store.delete_tree("app.db") == 2
+        (event,) = _drain_events(events, 1)
+        assert event.type == "batch"
+        assert event.path == "app.db"
+        assert {change.path for change in event.changes} == {
+            "app.db.host",
+            "app.db.port",
+        }
+        assert all(change.type == "delete" for change in event.changes)
+        assert store.delete_tree("app.db") == 0
+        assert set(store.list()) == {"app", "app.cache", "application.name"}
+        assert store.get_tree() == {
+            "app": {"": "root", "cache": True},
+            "application": {"name": "other"},
+        }
+    finally:
+        store.shutdown()
+
+
+def test_snapshot_is_an_immutable_point_in_time_view() -> None:
+    store = ReactiveStore()
+    try:
+        store.set_many({"acct.a": 50, "acct.b": 50})
+        before = store.snapshot()
+        store.set_many({"acct.a": 20, "acct.b": 80})
+        store.set("acct.c", 0)
+        store.delete("acct.a")
+
+        assert before.get_many(["acct.a", "acct.b", "acct.c"]) == {
+            "acct.a": 50,
+            "acct.b": 50,
+            "acct.c": None,
+        }
+        assert set(before.list("acct")) == {"acct.a", "acct.b"}
+        assert before.get_tree("acct") == {"a": 50, "b": 50}
+        assert before.version < store.snapshot().version
+        assert store.snapshot().get_many(["acct.b", "acct.c"]) == {
+            "acct.b": 80,
+            "acct.c": 0,
+        }
+        assert not store.exists("acct.a")
+    finally:
+        store.shutdown()
+
+
+def test_snapshot_reads_are_consistent_under_concurrent_writes() -> None:
+    store = ReactiveStore()
+    stop = threading.Event()
+    torn: List[dict] = []
+
+    def writer() -> None:
+        value = 0
+        while not stop.is_set():
+            value += 1
+            store.set_many({"pair.left": value, "pair.right": value})
+
+    def reader() -> None:
+        while not stop.is_set():
+            values = store.snapshot().get_many(["pair.left", "pair.right"])
+            if values["pair.left"] != values["pair.right"]:
+                torn.append(values)
+
+    try:
+        store.set_many({"pair.left": 0, "pair.right": 0})
+        threads = [threading.Thread(target=writer)] + [
+            threading.Thread(target=reader) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        assert torn == []
+        assert store.get("pair.left") == store.get("pair.right") > 0
+    finally:
+        store.shutdown()
+
+
 def test_invalid_paths_raise_value_error() -> None:
     store = ReactiveStore()
     try:
@@ -58,6 +166,36 @@ def test_invalid_paths_raise_value_error() -> None:
         store.shutdown()
 
 
+def test_path_keys_are_accepted_everywhere() -> None:
+    store = ReactiveStore()
+    events: "queue.Queue[Event]" = queue.Queue()
+    try:
+        key = store.key("cfg.db.port")
+        assert key == PathKey("cfg.db.port")
+        assert hash(key) == hash(store.key("cfg.db.port"))
+        assert key.segments == ("cfg", "db", "port")
+        assert str(key) == "cfg.db.port"
+        with pytest.raises(AttributeError):
+            key.path = "other"  # type: ignore[misc]
+        with pytest.raises(ValueError):
+            store.key("bad..path")
+
+        store.subscribe(store.key("cfg.db.port"), events.put)
+        store.set(key, 5432)
+        assert store.get(key) == store.get("cfg.db.port") == 5432
+        assert store.exists(key)
+        assert store.list(store.key("cfg")) == ("cfg.db.port",)
+        (event,) = _drain_events(events, 1)
+        assert type(event.path) is str and event.path == "cfg.db.port"
+        with store.transaction() as tx:
+            tx.set(key, 1)
+            assert tx.get(key) == 1
+        store.delete(key)
+        assert not store.exists("cfg.db.port")
+    finally:
+        store.shutdown()
+
+
 def test_exact_subscription_receives_events_in_order() -> None:
     store = ReactiveStore()
     events: "queue.Queue[Event]" = queue.Queue()
@@ -183,8 +321,547 @@ def test_callback_retries_can_be_disabled_per_subscription() -> None:
         store.shutdown()
 
 
+def test_pending_retries_do_not_stall_the_worker() -> None:
+    store = ReactiveStore(retry_base_delay=0.5, retry_max_delay=1.0)
+    healthy: "queue.Queue[Event]" = queue.Queue()
+
+    def failing(event: Event) -> None:
+        raise RuntimeError("always")
+
+    try:
+        failing_id = store.subscribe("shared.key", failing)
+        store.subscribe("shared.key", healthy.put)
+        start = time.monotonic()
+        for value in range(5):
+            store.set("shared.key", value)
+        # Both subscriptions share the only worker, yet the backoff of the
+        # failing one does not delay the healthy one.
+        events = _drain_events(healthy, 5)
+        assert time.monotonic() - start < 0.4
+        assert [event.value for event in events] == list(range(5))
+        # The failing subscription's later events wait behind its retry.
+        assert store.stats().pending_retries == 1
+        assert store.subscription_stats(failing_id).queued == 5
+    finally:
+        store.shutdown(drain=False)
+
+
+@pytest.mark.parametrize("is_async", [False, True])
+def test_retries_keep_events_in_order(is_async: bool) -> None:
+    store = ReactiveStore(retry_base_delay=0.05, retry_max_delay=0.1)
+    received: "queue.Queue[int]" = queue.Queue()
+    failed = set()
+
+    def handle(event: Event) -> None:
+        if event.value % 2 == 0 and event.value not in failed:
+            failed.add(event.value)
+            raise RuntimeError("first attempt fails")
+        received.put(event.value)
+
+    async def async_handle(event: Event) -> None:
+        handle(event)
+
+    try:
+        store.subscribe("ordered.key", async_handle if is_async else handle)
+        for value in range(6):
+            store.set("ordered.key", value)
+        assert [received.get(timeout=2.0) for _ in range(6)] == list(range(6))
+        assert store.stats().retries == 3
+    finally:
+        store.shutdown()
+
+
+def test_draining_shutdown_drops_retries_but_delivers_later_events() -> None:
+    store = ReactiveStore(retry_base_delay=5.0, retry_max_delay=5.0)
+    received: List[int] = []
+
+    def callback(event: Event) -> None:
+        if event.value == 0:
+            raise RuntimeError("retried much later")
+        received.append(event.value)
+
+    store.subscribe("later.key", callback)
+    for value in range(3):
+        store.set("later.key", value)
+    start = time.monotonic()
+    store.shutdown()
+    assert time.monotonic() - start < 1.0
+    assert received == [1, 2]
+
+
+def test_exhausted_retries_go_to_dead_letter_hook() -> None:
+    dead: "queue.Queue[tuple]" = queue.Queue()
+    store = ReactiveStore(
+        retry_base_delay=0.01,
+        retry_max_delay=0.02,
+        max_attempts=3,
+        dead_letter=lambda event, sub_id, exc: dead.put((event, sub_id, exc)),
+    )
+    attempts: List[int] = []
+
+    def callback(event: Event) -> None:
+        attempts.append(event.version)
+        raise ValueError("nope")
+
+    try:
+        sub_id = store.subscribe("dead.letter", callback)
+        store.subscribe("dead.letter", lambda event: None)
+        store.set("dead.letter", 1)
+        event, dead_id, exc = dead.get(timeout=1.0)
+        assert (event.path, dead_id) == ("dead.letter", sub_id)
+        assert isinstance(exc, ValueError)
+        assert len(attempts) == 3
+        stats = store.stats()
+        assert stats.delivered == 1
+        assert stats.failures == 3
+        assert stats.retries == 2
+        assert stats.dead_letters == 1
+        assert stats.pending_retries == 0
+    finally:
+        store.shutdown()
+
+
+def _gated_subscriber(store: ReactiveStore, selector: str, **options):
+    """Subscribe a callback that blocks on its first event until released."""
+    started = threading.Event()
+    release = threading.Event()
+    received: "queue.Queue[Event]" = queue.Queue()
+
+    def callback(event: Event) -> None:
+        started.set()
+        release.wait(1.0)
+        received.put(event)
+
+    subscription_id = store.subscribe(selector, callback, **options)
+    return subscription_id, started, release, received
+
+
+@pytest.mark.parametrize(
+    ("overflow", "expected"),
+    [("drop_oldest", [0, 3, 4]), ("drop_newest", [0, 1, 2])],
+)
+def test_full_queue_drops_events_by_policy(overflow: str, expected: List[int]) -> None:
+    store = ReactiveStore(max_queue_size=2, overflow=overflow)
+    try:
+        sub_id, started, release, received = _gated_subscriber(store, "burst.key")
+        store.set("burst.key", 0)
+        assert started.wait(1.0)
+        for value in range(1, 5):
+            store.set("burst.key", value)
+        stats = store.subscription_stats(sub_id)
+        assert (stats.queued, stats.dropped, stats.capacity) == (2, 2, 2)
+        release.set()
+        assert [event.value for event in _drain_events(received, 3)] == expected
+        assert store.stats().dropped == 2
+    finally:
+        store.shutdown()
+
+
+def test_coalesce_keeps_latest_value_per_path() -> None:
+    store = ReactiveStore()
+    try:
+        _, started, release, received = _gated_subscriber(
+            store, "burst.*", max_queue_size=2, overflow="coalesce"
+        )
+        store.set("burst.a", 0)
+        assert started.wait(1.0)
+        for path, value in [("a", 1), ("b", 1), ("a", 2), ("b", 2), ("c", 3)]:
+            store.set(f"burst.{path}", value)
+        release.set()
+        events = _drain_events(received, 3)
+        assert [(event.path, event.value) for event in events] == [
+            ("burst.a", 0),
+            ("burst.b", 2),
+            ("burst.c", 3),
+        ]
+    finally:
+        store.shutdown()
+
+
+def test_conflated_subscription_receives_latest_value_per_path() -> None:
+    store = ReactiveStore()
+    try:
+        sub_id, started, release, received = _gated_subscriber(
+            store, "hot.*", conflate=True
+        )
+        store.set("hot.a", 0)
+        assert started.wait(1.0)
+        for value in range(1, 1001):
+            store.set("hot.a", value)
+            store.set("hot.b", -value)
+        store.set_many({"hot.b": "last", "hot.c": True})
+        release.set()
+        events = _drain_events(received, 4)
+        assert [(event.path, event.value) for event in events] == [
+            ("hot.a", 0),
+            ("hot.a", 1000),
+            ("hot.b", "last"),
+            ("hot.c", True),
+        ]
+        assert store.subscription_stats(sub_id).conflated == 1999
+    finally:
+        store.shutdown()
+    assert received.empty()
+
+
+def test_conflated_batch_delivers_pending_paths_together() -> None:
+    store = ReactiveStore()
+    try:
+        _, started, release, received = _gated_subscriber(
+            store, "hot.*", conflate="batch"
+        )
+        store.set("hot.a", 0)
+        assert started.wait(1.0)
+        store.set("hot.a", 1)
+        store.set("hot.b", 1)
+        store.delete("hot.a")
+        release.set()
+        first, second = _drain_events(received, 2)
+        assert first.type == "batch"
+        assert [(event.path, event.value) for event in first.changes] == [("hot.a", 0)]
+        assert second.type == "batch"
+        assert second.path == "hot"
+        assert [(event.type, event.path) for event in second.changes] == [
+            ("delete", "hot.a"),
+            ("set", "hot.b"),
+        ]
+        assert second.version == 4
+    finally:
+        store.shutdown()
+
+
+def test_block_policy_applies_backpressure_to_writers() -> None:
+    store = ReactiveStore(max_queue_size=1)
+    try:
+        _, started, release, received = _gated_subscriber(store, "slow.key")
+        store.set("slow.key", 0)
+        assert started.wait(1.0)
+        store.set("slow.key", 1)
+        writer = threading.Thread(target=store.set, args=("slow.key", 2))
+        writer.start()
+        writer.join(0.1)
+        assert writer.is_alive()
+        assert store.stats().queued == 1
+        release.set()
+        writer.join(1.0)
+        assert not writer.is_alive()
+        assert [event.value for event in _drain_events(received, 3)] == [0, 1, 2]
+    finally:
+        store.shutdown()
+
+
+def test_callbacks_never_wait_on_another_workers_full_queue() -> None:
+    store = ReactiveStore(workers=2, max_queue_size=1)
+    started = threading.Semaphore(0)
+    release = threading.Event()
+    received: "queue.Queue[str]" = queue.Queue()
+
+    def mirror(target: str):
+        def callback(event: Event) -> None:
+            if event.value == 0:
+                started.release()
+                release.wait(1.0)
+            if event.path.endswith(".x"):
+                store.set(target, event.value)
+            received.put(event.path)
+
+        return callback
+
+    try:
+        store.subscribe("a.*", mirror("b.y"))
+        store.subscribe("b.*", mirror("a.y"))
+        store.set("a.x", 0)
+        store.set("b.x", 0)
+        assert started.acquire(timeout=1.0) and started.acquire(timeout=1.0)
+        # Fill both queues, then let each worker write into the other's.
+        store.set("a.x", 1)
+        store.set("b.x", 1)
+        release.set()
+        paths = [received.get(timeout=1.0) for _ in range(8)]
+        assert sorted(paths) == sorted(["a.x", "a.y", "b.x", "b.y"] * 2)
+    finally:
+        store.shutdown()
+
+
+def test_invalid_queue_options_raise_value_error() -> None:
+    with pytest.raises(ValueError):
+        ReactiveStore(overflow="spill")
+    store = ReactiveStore()
+    try:
+        with pytest.raises(ValueError):
+            store.subscribe("a.b", lambda event: None, max_queue_size=0)
+    finally:
+        store.shutdown()
+
+
 def test_context_manager_shuts_down_worker() -> None:
     with ReactiveStore() as store:
         store.set("ctx.example", True)
     # Give the worker a moment to exit and ensure no lingering threads processing events
     time.sleep(0.05)
+
+
+def test_subscription_index_matches_linear_scan() -> None:
+    store = ReactiveStore()
+    try:
+        selectors = ["*", "a", "a.*", "a.b", "a.b.*", "a.b.c", "b.*", "a.c"]
+        ids = {
+            store.subscribe(selector, lambda event: None): selector
+            for selector in selectors
+        }
+        index = store._subscriptions
+        for path in ["a", "a.b", "a.b.c", "a.b.c.d", "a.c", "b", "b.x", "c"]:
+            expected = [
+                selector
+                for subscription_id, selector in ids.items()
+                if index._entries[subscription_id][1].matches(path)
+            ]
+            assert [sub.selector for _, sub in index.match(path)] == expected
+
+        for subscription_id in ids:
+            store.unsubscribe(subscription_id)
+        assert len(index) == 0
+        assert not index._root.children
+    finally:
+        store.shutdown()
+
+
+def test_set_many_delivers_one_batch_per_subscriber() -> None:
+    store = ReactiveStore()
+    events: "queue.Queue[Event]" = queue.Queue()
+    everything: "queue.Queue[Event]" = queue.Queue()
+    try:
+        store.subscribe("ingest.a.*", events.put)
+        store.subscribe("*", everything.put)
+        store.set_many({"ingest.a.x": 1, "ingest.a.y": 2, "ingest.b": 3})
+        batch = _drain_events(events, 1)[0]
+        assert batch.type == "batch"
+        assert batch.path == "ingest.a"
+        assert [(e.type, e.path, e.value) for e in batch.changes] == [
+            ("set", "ingest.a.x", 1),
+            ("set", "ingest.a.y", 2),
+        ]
+        assert len(_drain_events(everything, 1)[0].changes) == 3
+        assert {e.version for e in batch.changes} == {batch.version} == {1}
+
+        store.delete_many(["ingest.a.x", "ingest.missing"])
+        removed = _drain_events(events, 1)[0]
+        assert [(e.type, e.path) for e in removed.changes] == [("delete", "ingest.a.x")]
+        assert removed.version == 2
+        assert store.list("ingest") == ("ingest.a.y", "ingest.b")
+    finally:
+        store.shutdown()
+
+
+def test_batch_of_unrelated_paths_uses_batch_root() -> None:
+    store = ReactiveStore()
+    events: "queue.Queue[Event]" = queue.Queue()
+    try:
+        store.subscribe("*", events.put)
+        store.set_many({"a.x": 1, "b.y": 2})
+        batch = _drain_events(events, 1)[0]
+        assert batch.path == BATCH_ROOT == "*"
+        assert [e.path for e in batch.changes] == ["a.x", "b.y"]
+    finally:
+        store.shutdown()
+
+
+def test_transaction_commits_together_or_not_at_all() -> None:
+    store = ReactiveStore()
+    events: "queue.Queue[Event]" = queue.Queue()
+    try:
+        store.subscribe("tx.*", events.put)
+        store.set("tx.keep", 0)
+        _drain_events(events, 1)
+
+        with pytest.raises(RuntimeError):
+            with store.transaction() as tx:
+                tx.set("tx.first", 1)
+                raise RuntimeError("abort")
+        assert not store.exists("tx.first")
+
+        with store.transaction() as tx:
+            tx.set("tx.first", 1)
+            tx.set("tx.first", 2)
+            tx.delete("tx.keep")
+            assert tx.get("tx.first") == 2
+            assert tx.get("tx.keep") is None
+            assert store.get("tx.keep") == 0
+        batch = _drain_events(events, 1)[0]
+        assert [(e.type, e.path, e.value) for e in batch.changes] == [
+            ("set", "tx.first", 2),
+            ("delete", "tx.keep", None),
+        ]
+        assert store.get("tx.first") == 2
+        assert not store.exists("tx.keep")
+        with pytest.raises(queue.Empty):
+            events.get(timeout=0.05)
+    finally:
+        store.shutdown()
+
+
+def test_workers_dispatch_subscriptions_in_parallel_and_in_order() -> None:
+    store = ReactiveStore(workers=2)
+    release = threading.Event()
+    fast: "queue.Queue[Event]" = queue.Queue()
+    slow_values: List[int] = []
+    try:
+
+        def slow(event: Event) -> None:
+            release.wait(1.0)
+            slow_values.append(event.value)
+
+        store.subscribe("work.item", slow)
+        store.subscribe("work.item", fast.put)
+        for value in range(5):
+            store.set("work.item", value)
+        # The fast subscriber is not held up by the blocked one.
+        assert [event.value for event in _drain_events(fast, 5)] == list(range(5))
+        assert slow_values == []
+        release.set()
+    finally:
+        store.shutdown()
+    assert slow_values == list(range(5))
+
+
+def test_shutdown_drains_every_worker() -> None:
+    store = ReactiveStore(workers=3)
+    delivered: List[str] = []
+    lock = threading.Lock()
+
+    def callback(event: Event) -> None:
+        time.sleep(0.002)
+        with lock:
+            delivered.append(event.path)
+
+    for index in range(3):
+        store.subscribe(f"drain.s{index}", callback)
+    for round_ in range(10):
+        for index in range(3):
+            store.set(f"drain.s{index}", round_)
+    store.shutdown()
+    assert len(delivered) == 30
+
+
+def test_async_callbacks_share_one_loop_with_ordering_and_cap() -> None:
+    store = ReactiveStore(max_concurrent_callbacks=2)
+    loops = set()
+    order: "queue.Queue[int]" = queue.Queue()
+    running = 0
+    peak = 0
+
+    async def callback(event: Event) -> None:
+        nonlocal running, peak
+        loops.add(id(asyncio.get_running_loop()))
+        running += 1
+        peak = max(peak, running)
+        # Earlier events sleep longer, so ordering must come from the store.
+        await asyncio.sleep(0.01 * (5 - event.value % 5))
+        running -= 1
+        order.put(event.value)
+
+    try:
+        store.subscribe("loop.a", callback)
+        store.subscribe("loop.b", callback)
+        store.subscribe("loop.c", callback)
+        for value in range(5):
+            store.set("loop.a", value)
+        for value in range(10, 15):
+            store.set("loop.b", value)
+            store.set("loop.c", value + 10)
+        values = [order.get(timeout=2.0) for _ in range(15)]
+        assert [value for value in values if value < 10] == list(range(5))
+        assert [value for value in values if 10 <= value < 20] == list(range(10, 15))
+        assert len(loops) == 1
+        assert peak == 2
+    finally:
+        store.shutdown()
+
+
+def test_store_built_off_the_main_thread_caps_async_callbacks() -> None:
+    stores: "queue.Queue[ReactiveStore]" = queue.Queue()
+    thread = threading.Thread(
+        target=lambda: stores.put(ReactiveStore(max_concurrent_callbacks=1))
+    )
+    thread.start()
+    thread.join()
+    store = stores.get(timeout=1.0)
+    done: "queue.Queue[int]" = queue.Queue()
+
+    async def callback(event: Event) -> None:
+        await asyncio.sleep(0.01)
+        done.put(event.value)
+
+    try:
+        store.subscribe("off.a", callback)
+        store.subscribe("off.b", callback)
+        store.set("off.a", 1)
+        store.set("off.b", 2)
+        assert sorted(done.get(timeout=1.0) for _ in range(2)) == [1, 2]
+    finally:
+        store.shutdown()
+
+
+def test_queue_limits_bound_async_subscribers() -> None:
+    store = ReactiveStore(max_queue_size=2, overflow="drop_newest")
+    release = threading.Event()
+    received: "queue.Queue[int]" = queue.Queue()
+
+    async def callback(event: Event) -> None:
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+        received.put(event.value)
+
+    try:
+        sub_id = store.subscribe("slow.async", callback)
+        store.set("slow.async", 0)
+        while store.subscription_stats(sub_id).queued:
+            time.sleep(0.005)
+        for value in range(1, 10):
+            store.set("slow.async", value)
+        stats = store.subscription_stats(sub_id)
+        assert (stats.queued, stats.dropped) == (2, 7)
+        release.set()
+        assert [received.get(timeout=1.0) for _ in range(3)] == [0, 1, 2]
+    finally:
+        store.shutdown()
+
+
+def test_async_callback_may_write_to_its_own_full_queue() -> None:
+    store = ReactiveStore(max_queue_size=1)
+    received: "queue.Queue[int]" = queue.Queue()
+
+    async def callback(event: Event) -> None:
+        if event.value == 0:
+            for value in range(1, 4):
+                store.set("echo.value", value)
+        received.put(event.value)
+
+    try:
+        store.subscribe("echo.value", callback)
+        store.set("echo.value", 0)
+        assert [received.get(timeout=1.0) for _ in range(4)] == [0, 1, 2, 3]
+    finally:
+        store.shutdown()
+
+
+def test_async_callbacks_run_on_user_supplied_loop() -> None:
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    seen: "queue.Queue[object]" = queue.Queue()
+
+    async def callback(event: Event) -> None:
+        seen.put(asyncio.get_running_loop())
+
+    store = ReactiveStore(loop=loop)
+    try:
+        store.subscribe("user.loop", callback)
+        store.set("user.loop", 1)
+        assert seen.get(timeout=1.0) is loop
+    finally:
+        store.shutdown()
+        assert loop.is_running()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=1.0)
+        loop.close()
@@ -0,0 +1,35 @@
+"""Smoke tests for the reactive store benchmarks."""
+
+from __future__ import annotations
+
+from projects.reactive_store.benchmarks import main, run_fanout
+
+
+def test_fanout_benchmark_reports_each_worker_count() -> None:
+    results = run_fanout((1, 2), subscriptions=4, events=5, callback_delay=0.0)
+    assert set(results) == {1, 2}
+    assert all(rate > 0 for rate in results.values())
+
+
+def test_benchmark_cli_prints_table(capsys) -> None:
+    assert main(["--workers", "1", "--events", "2", "--subscriptions", "2"]) == 0
+    assert "events/s" in capsys.readouterr().out
+
+
+def test_wal_benchmark_covers_every_durability_mode(capsys) -> None:
+    assert main(["--suite", "wal", "--writers", "2", "--writes", "5"]) == 0
+    output = capsys.readouterr().out
+    for mode in ("memory", "always", "interval", "os"):
+        assert mode in output
+
+
+def test_snapshot_benchmark_reports_load_time(capsys) -> None:
+    assert main(["--suite", "snapshot", "--keys", "100"]) == 0
+    assert "load s" in capsys.readouterr().out
+
+
+def test_remote_benchmark_compares_transports(capsys) -> None:
+    assert main(["--suite", "remote", "--requests", "10", "--batch", "5"]) == 0
+    output = capsys.readouterr().out
+    for transport in ("in-process", "unix", "tcp"):
+        assert transport in output
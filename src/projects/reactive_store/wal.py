@@ -0,0 +1,268 @@
+"""Append-only write-ahead log for ``ReactiveStore``.
+
+Each record holds one committed change set::
+
+    <u64 version> <u32 payload length> <u32 crc32> <payload>
+
+The payload is a pickled list of ``(type, path, value)`` changes, and the
+checksum covers the version and the payload. The version sits outside the
+payload so that replay can skip records a snapshot already holds without
+unpickling them. Replay stops at the first torn or corrupt record and
+truncates the file there, so a crash mid-write loses only the change that
+was being written.
+
+:meth:`WriteAheadLog.compact` drops the records a snapshot holds. The
+compacted log starts with a checkpoint record, whose payload is ``None``,
+naming the snapshot version it continues from.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple
+
+__all__ = [
+    "DURABILITY_MODES",
+    "WriteAheadLog",
+    "encode_checkpoint",
+    "encode_record",
+    "read_log",
+]
+
+# ``always``: every write waits until its record is fsynced; concurrent writers
+# share one fsync. ``interval``: records are fsynced every ``fsync_interval``
+# seconds and writers do not wait. ``os``: records are written straight to the
+# file and the operating system decides when they reach the disk.
+DURABILITY_MODES = ("always", "interval", "os")
+
+_VERSION = struct.Struct("<Q")
+_HEADER = struct.Struct("<QII")
+
+Change = Tuple[str, str, Any]
+# ``(version, changes)``; ``changes`` is ``None`` for a checkpoint.
+Record = Tuple[int, Optional[List[Change]]]
+
+logger = logging.getLogger(__name__)
+
+
+def read_log(path: str, *, truncate: bool = True, after: int = 0) -> Iterator[Record]:
+    """Yield the valid records of the log at ``path`` in order.
+
+    Records at or below version ``after`` are checked but not decoded or
+    yielded. With ``truncate`` a torn or corrupt tail is cut off once
+    iteration reaches it, so new records are appended after the last good
+    one.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as handle:
+        data = handle.read()
+    offset = 0
+    for offset, version, payload in _scan(data):
+        if version > after:
+            yield version, pickle.loads(payload)
+    if offset < len(data):
+        logger.warning(
+            "Discarding %d bytes after the last valid record in %s",
+            len(data) - offset,
+            path,
+        )
+        if truncate:
+            with open(path, "r+b") as handle:
+                handle.truncate(offset)
+
+
+def _scan(data: bytes) -> Iterator[Tuple[int, int, memoryview]]:
+    """Yield ``(end offset, version, payload)`` up to the first bad record."""
+    view = memoryview(data)
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        version, length, checksum = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = view[start : start + length]
+        if len(payload) != length or _checksum(version, payload) != checksum:
+            break
+        offset = start + length
+        yield offset, version, payload
+
+
+def _checksum(version: int, payload: bytes | memoryview) -> int:
+    return zlib.crc32(payload, zlib.crc32(_VERSION.pack(version)))
+
+
+def _encode(version: int, changes: Optional[List[Change]]) -> bytes:
+    payload = pickle.dumps(changes, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(version, len(payload), _checksum(version, payload)) + payload
+
+
+def encode_record(version: int, changes: List[Change]) -> bytes:
+    return _encode(version, changes)
+
+
+def encode_checkpoint(version: int) -> bytes:
+    """Encode the record that starts a log compacted at snapshot ``version``."""
+    return _encode(version, None)
+
+
+class WriteAheadLog:
+    """Append records to ``path`` with group commit.
+
+    :meth:`append` only queues the encoded record and returns a ticket. A
+    flusher thread writes everything queued so far with one ``write`` and
+    one ``fsync``, so writers that arrive while a sync is in progress are
+    committed together by the next one. :meth:`wait` blocks until a ticket
+    is durable. After a failed write or sync the log accepts no more
+    records.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        durability: str = "always",
+        fsync_interval: float = 0.05,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"durability must be one of {', '.join(DURABILITY_MODES)}, "
+                f"got {durability!r}"
+            )
+        if fsync_interval <= 0:
+            raise ValueError("fsync_interval must be positive")
+        self.path = path
+        self.durability = durability
+        self.syncs = 0
+        self._interval = fsync_interval
+        self._file = open(path, "ab")
+        # Held while writing to ``_file`` so ``compact`` can swap the file.
+        self._write_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending: List[bytes] = []
+        self._appended = 0
+        self._durable = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._flusher: Optional[threading.Thread] = None
+        if durability != "os":
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="ReactiveStoreWAL", daemon=True
+            )
+            self._flusher.start()
+
+    def append(self, record: bytes) -> int:
+        """Queue ``record`` and return a ticket for :meth:`wait`.
+
+        Raises ``RuntimeError`` once a write or sync has failed, since no
+        record is written after that.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Write-ahead log is closed")
+            if self._error is not None:
+                raise RuntimeError("Write-ahead log flush failed") from self._error
+            if self._flusher is None:
+                try:
+                    with self._write_lock:
+                        self._file.write(record)
+                        self._file.flush()
+                except OSError as exc:
+                    self._error = exc
+                    raise RuntimeError("Write-ahead log flush failed") from exc
+                self._appended += 1
+                self._durable = self._appended
+            else:
+                self._appended += 1
+                self._pending.append(record)
+                self._cond.notify_all()
+            return self._appended
+
+    def wait(self, ticket: int) -> None:
+        """Block until ``ticket`` is durable; only ``always`` mode waits."""
+        if self.durability != "always":
+            return
+        with self._cond:
+            while self._durable < ticket and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise RuntimeError("Write-ahead log flush failed") from self._error
+
+    def close(self) -> None:
+        """Flush and sync everything appended so far, then close the file."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._write_lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def compact(self, version: int) -> None:
+        """Drop the records at or below ``version``, held by a snapshot.
+
+        The records above it are copied into a new file that starts with a
+        checkpoint for ``version`` and replaces the log. Appends carry on
+        meanwhile; the flusher waits only while the file is swapped.
+        """
+        with self._write_lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            with open(self.path, "rb") as handle:
+                data = handle.read()
+            start = 0
+            for end, record_version, _ in _scan(data):
+                if record_version > version:
+                    break
+                start = end
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "wb") as handle:
+                handle.write(encode_checkpoint(version))
+                handle.write(memoryview(data)[start:])
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self.path)
+            self._file.close()
+            self._file = open(self.path, "ab")
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self.durability == "interval":
+                    # Let records accumulate for one interval before syncing.
+                    deadline = time.monotonic() + self._interval
+                    while not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                target = self._appended
+            try:
+                with self._write_lock:
+                    self._file.write(b"".join(batch))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            except OSError as exc:  # pragma: no cover - disk failure
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                logger.exception("Write-ahead log flush failed")
+                return
+            with self._cond:
+                self.syncs += 1
+                self._durable = target
+                self._cond.notify_all()